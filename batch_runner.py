@@ -0,0 +1,169 @@
+import argparse
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
+from checkpoint import RecycleCheckpoint, atomic_write
+from job_server import init_worker, run_key, run_request
+from main import load_config
+
+logger = logging.getLogger(__name__)
+
+CONFIG_SUFFIXES = ('.yaml', '.yml')
+
+
+@dataclass
+class BatchCase:
+    name: str
+    config: Dict[str, Any]  # Fully resolved config.yaml style mapping
+    key: str = ''  # Hash of the mechanism and reactor inputs; a changed case is rerun
+
+
+def load_cases(source: str) -> List[BatchCase]:
+    """Cases from a directory of config files, or from a manifest file.
+
+    A manifest has an optional `base` config and a list of `cases`. Each case is a
+    config path or a mapping with optional `name`, `config` (path) and `overrides`,
+    applied in that order over the base. Paths are relative to the manifest.
+    """
+    if os.path.isdir(source):
+        files = sorted(name for name in os.listdir(source) if name.endswith(CONFIG_SUFFIXES))
+        cases = [BatchCase(os.path.splitext(name)[0], load_config(os.path.join(source, name))) for name in files]
+    else:
+        root = os.path.dirname(os.path.abspath(source))
+        manifest = load_config(source)
+        base = load_config(os.path.join(root, manifest['base'])) if manifest.get('base') else {}
+        cases = []
+        for i, entry in enumerate(manifest.get('cases') or []):
+            if isinstance(entry, str):
+                entry = {'config': entry}
+            config = dict(base)
+            if entry.get('config'):
+                config.update(load_config(os.path.join(root, entry['config'])))
+            config.update(entry.get('overrides') or {})
+            name = entry.get('name') or (os.path.splitext(os.path.basename(entry['config']))[0]
+                                         if entry.get('config') else f"case_{i:04d}")
+            cases.append(BatchCase(name, config))
+
+    names = [case.name for case in cases]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate case names: {duplicates}")
+    mechanism_hashes: Dict[tuple, str] = {}
+    for case in cases:
+        try:
+            case.key = run_key(case.config, mechanism_hashes)
+        except Exception as e:
+            # Left unkeyed, the case runs, fails and is recorded like any other failure
+            logger.warning(f"Case {case.name} has an invalid config: {type(e).__name__}: {e}")
+    return cases
+
+
+def _run_case(config: Dict[str, Any], checkpoint_path: str, key: str) -> Dict[str, Any]:
+    if config.get('recycle_mode', 'sequential') == 'network':
+        return run_request(config)
+    checkpoint = RecycleCheckpoint(checkpoint_path, key)
+    try:
+        result = run_request(config, checkpoint)
+    except Exception:
+        # A failed case reruns from scratch; only an interrupted one resumes
+        checkpoint.clear()
+        raise
+    checkpoint.clear()
+    return result
+
+
+class BatchRunner:
+    """Runs a campaign of cases across a process pool, checkpointing as it goes.
+
+    Every finished case is written to `<output>/cases/<name>.json`, and the recycle loop
+    of each running case saves its state to `<output>/checkpoints/<name>.pkl` after
+    every iteration. A restarted campaign skips the cases already done (unless their
+    inputs changed) and resumes interrupted ones from their last recycle iteration.
+    Network mode cases are not checkpointed and rerun from the start.
+    """
+
+    def __init__(self, cases: List[BatchCase], output_dir: str, workers: Optional[int] = None,
+                 retry_failed: bool = True):
+        self.cases = cases
+        self.output_dir = output_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.retry_failed = retry_failed
+        os.makedirs(os.path.join(output_dir, 'cases'), exist_ok=True)
+        os.makedirs(os.path.join(output_dir, 'checkpoints'), exist_ok=True)
+
+    def _record_path(self, case: BatchCase) -> str:
+        return os.path.join(self.output_dir, 'cases', f"{case.name}.json")
+
+    def _checkpoint_path(self, case: BatchCase) -> str:
+        return os.path.join(self.output_dir, 'checkpoints', f"{case.name}.pkl")
+
+    def record(self, case: BatchCase) -> Optional[Dict[str, Any]]:
+        """The stored outcome of a case, or None if it has not run with its current inputs."""
+        try:
+            with open(self._record_path(case)) as file:
+                record = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return record if record.get('key') == case.key else None
+
+    def _is_finished(self, case: BatchCase) -> bool:
+        record = self.record(case)
+        if record is None:
+            return False
+        return record['status'] == 'done' or not self.retry_failed
+
+    def run(self) -> List[Dict[str, Any]]:
+        """Run every unfinished case and return the records of all cases, in case order."""
+        pending = [case for case in self.cases if not self._is_finished(case)]
+        logger.info(f"{len(self.cases) - len(pending)} of {len(self.cases)} cases already finished, "
+                    f"running {len(pending)} with {min(self.workers, len(pending))} workers")
+        if pending:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(pending)), initializer=init_worker,
+                                     initargs=(pending[0].config,)) as executor:
+                futures = {
+                    executor.submit(_run_case, case.config, self._checkpoint_path(case), case.key): case
+                    for case in pending
+                }
+                for done, future in enumerate(as_completed(futures), start=1):
+                    case = futures[future]
+                    record = {'name': case.name, 'key': case.key}
+                    try:
+                        record.update(status='done', result=future.result())
+                    except BrokenProcessPool:
+                        logger.error("A worker process died; rerun the batch to resume from the checkpoints")
+                        raise
+                    except Exception as e:
+                        logger.warning(f"Case {case.name} failed: {e}")
+                        record.update(status='failed', error=f"{type(e).__name__}: {e}")
+                    record['config'] = case.config
+                    atomic_write(self._record_path(case), json.dumps(record, indent=1, default=str).encode())
+                    logger.info(f"Case {case.name} {record['status']} ({done}/{len(pending)})")
+
+        records = [self.record(case) or {'name': case.name, 'status': 'missing'} for case in self.cases]
+        summary = [{key: value for key, value in record.items() if key != 'config'} for record in records]
+        atomic_write(os.path.join(self.output_dir, 'summary.json'), json.dumps(summary, indent=1).encode())
+        return records
+
+
+def main() -> None:
+    from output_formatter import OutputFormatter
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Run a resumable campaign of simulation cases.")
+    parser.add_argument('cases', help="Directory of config files, or a manifest file")
+    parser.add_argument('--output', default='batch_results', help="Results and checkpoint directory")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: all cores)")
+    parser.add_argument('--skip-failed', action='store_true', help="Do not retry cases that failed before")
+    args = parser.parse_args()
+
+    runner = BatchRunner(load_cases(args.cases), args.output, workers=args.workers,
+                         retry_failed=not args.skip_failed)
+    OutputFormatter(sigma=0.0).print_batch_results(runner.run())
+
+
+if __name__ == "__main__":
+    main()
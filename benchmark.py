@@ -0,0 +1,252 @@
+import argparse
+import contextlib
+import io
+import json
+import logging
+import platform
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+import cantera as ct
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from typing import Dict, Any, Callable, List, Optional
+from economic_analysis import EconomicAnalysis
+from instrumentation import SOLVER_STAT_KEYS, solver_counts
+from main import load_config
+from mechanism_cache import load_mechanism
+from models import ReactorConfig
+from output_formatter import OutputFormatter
+from reactor_model import ReactorModel, RecycleReactor
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_MECHANISMS = ('PolyMech.yaml', 'aramco_full.yaml')
+BENCHMARKS = ('mechanism_load', 'mechanism_load_cached', 'simulate', 'recycle', 'recycle_network', 'economics',
+              'output')
+RECYCLE_MODES = ('sequential', 'network')
+
+
+def _peak_rss_mb() -> float:
+    """Process high-water resident set size (ru_maxrss is in kB on Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _measure(func: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """Time repeated calls, tracking Python-heap peak and growth of the process high-water mark."""
+    rss_before = _peak_rss_mb()
+    tracemalloc.start()
+    wall_times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        wall_times.append(time.perf_counter() - start)
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'wall_time': statistics.median(wall_times),
+        'wall_times': wall_times,
+        'python_peak_mb': python_peak / 1024 ** 2,
+        'rss_growth_mb': _peak_rss_mb() - rss_before,
+        '_result': result,
+    }
+
+
+def run_mechanism(mechanism: str, config: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    """Run every benchmark for one mechanism; executed in a fresh process so memory is isolated."""
+    config = dict(config, mechanism=mechanism)
+    reactor_config = ReactorConfig.from_dict(config)
+    results = {}
+
+    results['mechanism_load'] = _measure(lambda: ct.Solution(mechanism), repeat)
+    load_mechanism(mechanism)  # Populate the disk cache and in-process registry
+    results['mechanism_load_cached'] = _measure(lambda: load_mechanism(mechanism), repeat)
+
+    model = ReactorModel(mechanism, verbose=False)
+    results['simulate'] = _measure(lambda: model.simulate(reactor_config), repeat)
+    results['simulate'].update(solver_counts(results['simulate']['_result'].solver_stats))
+
+    def recycle():
+        return RecycleReactor(model, verbose=False).simulate_with_recycle(
+            replace(ReactorConfig.from_dict(config), recycle_mode='sequential'))
+
+    results['recycle'] = _measure(recycle, 1)
+    recycle_results = results['recycle']['_result']
+    results['recycle'].update({
+        key: sum(entry.get(key, 0) for entry in recycle_results.convergence_history)
+        for key in SOLVER_STAT_KEYS
+    })
+    results['recycle']['iterations'] = recycle_results.iterations
+
+    def recycle_network():
+        return RecycleReactor(model, verbose=False).simulate_with_recycle(
+            replace(ReactorConfig.from_dict(config), recycle_mode='network'))
+
+    results['recycle_network'] = _measure(recycle_network, 1)
+    network_results = results['recycle_network']['_result']
+    results['recycle_network']['iterations'] = network_results.iterations
+
+    econ = EconomicAnalysis(gas=model.gas)
+    # Steady state of the same flowsheet from both recycle modes, for check_recycle_modes
+    recycle_modes = {}
+    for mode, mode_results in zip(RECYCLE_MODES, (recycle_results, network_results)):
+        recycle_modes[mode] = {
+            'converged': mode_results.converged,
+            'recycle_to_feed_ratio': mode_results.recycle_to_feed_ratio,
+            'net_value': econ.calculate_economic_value(
+                reactor_results=mode_results.reactor_results,
+                fresh_feed_composition=config['initial_composition'],
+                recycle_ratios=reactor_config.recycle_ratios
+            ).net_value,
+        }
+
+    def economics():
+        return econ.calculate_economic_value(
+            reactor_results=recycle_results.reactor_results,
+            fresh_feed_composition=config['initial_composition'],
+            recycle_ratios=reactor_config.recycle_ratios
+        )
+
+    results['economics'] = _measure(economics, max(repeat, 100))
+    economic_results = results['economics']['_result']
+
+    formatter = OutputFormatter(sigma=config['sigma'])
+
+    def output():
+        with contextlib.redirect_stdout(io.StringIO()):
+            formatter.print_simulation_parameters(reactor_config)
+            formatter.print_recycle_info(recycle_results)
+            formatter.print_economic_results(
+                recycle_results=recycle_results,
+                econ=econ,
+                economic_results=economic_results,
+                fresh_feed_composition=config['initial_composition']
+            )
+
+    results['output'] = _measure(output, max(repeat, 100))
+
+    for entry in results.values():
+        entry.pop('_result')
+    results['recycle_modes'] = recycle_modes
+    results['peak_rss_mb'] = _peak_rss_mb()
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Return a message for every benchmark whose wall time regressed beyond the threshold."""
+    regressions = []
+    for mechanism, benchmarks in results['results'].items():
+        for name in BENCHMARKS:
+            reference = baseline.get('results', {}).get(mechanism, {}).get(name)
+            if reference is None or name not in benchmarks:
+                continue
+            ratio = benchmarks[name]['wall_time'] / reference['wall_time']
+            benchmarks[name]['baseline_ratio'] = ratio
+            if ratio > 1 + threshold:
+                regressions.append(f"{mechanism} {name}: {ratio:.2f}x baseline "
+                                   f"({benchmarks[name]['wall_time']:.4g} s vs {reference['wall_time']:.4g} s)")
+    return regressions
+
+
+def check_recycle_modes(results: Dict[str, Any], tolerance: float) -> List[str]:
+    """Return a message for every mechanism whose recycle modes disagree on the steady state.
+
+    The sequential mode integrates a batch reactor and the network mode a train of stirred
+    tanks, so their answers differ by the residence time distribution; the tolerance is
+    relative, on the recycle-to-feed ratio and the net value.
+    """
+    failures = []
+    for mechanism, benchmarks in results['results'].items():
+        modes = benchmarks['recycle_modes']
+        for mode, entry in modes.items():
+            if not entry['converged']:
+                failures.append(f"{mechanism}: the {mode} recycle loop did not converge")
+        sequential, network = (modes[mode] for mode in RECYCLE_MODES)
+        for key in ('recycle_to_feed_ratio', 'net_value'):
+            difference = abs(sequential[key] - network[key]) / max(abs(network[key]), 1e-12)
+            if difference > tolerance:
+                failures.append(f"{mechanism}: {key} {sequential[key]:.4g} (sequential) vs "
+                                f"{network[key]:.4g} (network), {difference:.1%} apart")
+    return failures
+
+
+def print_summary(results: Dict[str, Any]) -> None:
+    print(f"\n{'Mechanism':<20} {'Benchmark':<22} {'Wall (s)':>10} {'RHS':>8} {'Jac':>6} "
+          f"{'Py peak (MB)':>13} {'vs base':>8}")
+    print("-" * 92)
+    for mechanism, benchmarks in results['results'].items():
+        for name in BENCHMARKS:
+            entry = benchmarks[name]
+            ratio = entry.get('baseline_ratio')
+            print(f"{mechanism:<20} {name:<22} {entry['wall_time']:>10.4g} "
+                  f"{entry.get('rhs_evals', '-'):>8} {entry.get('jac_evals', '-'):>6} "
+                  f"{entry['python_peak_mb']:>13.2f} {f'{ratio:.2f}x' if ratio else '-':>8}")
+        print(f"{mechanism:<20} {'peak RSS (MB)':<22} {benchmarks['peak_rss_mb']:>10.1f}")
+        for mode, entry in benchmarks['recycle_modes'].items():
+            print(f"{mechanism:<20} {mode + ' steady state':<22} R/F {entry['recycle_to_feed_ratio']:.4g}, "
+                  f"net value {entry['net_value']:.2f}{'' if entry['converged'] else ' (not converged)'}")
+    print("-" * 92)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark mechanism loading, integration, recycle and economics.")
+    parser.add_argument('--config', default='config.yaml')
+    parser.add_argument('--mechanisms', nargs='+', default=list(DEFAULT_MECHANISMS))
+    parser.add_argument('--repeat', type=int, default=3, help="Repetitions for the timed benchmarks")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', help="Baseline JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Relative slowdown flagged as a regression (default 20%%)")
+    parser.add_argument('--save-baseline', help="Also write the results to this baseline file")
+    parser.add_argument('--mode-tolerance', type=float, default=0.2,
+                        help="Relative disagreement allowed between the sequential and network recycle "
+                             "modes (default 20%%)")
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    results = {
+        'metadata': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'cantera_version': ct.__version__,
+            'python_version': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+        },
+        'results': {},
+    }
+    # A fresh spawned process per mechanism keeps caches and peak memory independent
+    for mechanism in args.mechanisms:
+        logger.info(f"Benchmarking {mechanism}")
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+            results['results'][mechanism] = executor.submit(
+                run_mechanism, mechanism, config, args.repeat
+            ).result()
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+
+    print_summary(results)
+    with open(args.output, 'w') as file:
+        json.dump(results, file, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    for message in regressions:
+        logger.warning(f"Performance regression: {message}")
+    mismatches = check_recycle_modes(results, args.mode_tolerance)
+    for message in mismatches:
+        logger.warning(f"Recycle mode mismatch: {message}")
+    return 1 if regressions or mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+import logging
+import os
+import pickle
+from typing import Any, Optional
+from models import RecycleState
+
+logger = logging.getLogger(__name__)
+
+
+def atomic_write(path: str, data: bytes) -> None:
+    """Replace a file in one step, so a crash leaves either the old or the new contents."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+class RecycleCheckpoint:
+    """Recycle loop state of one run, pickled to a file after every iteration.
+
+    The state is stored with a key identifying the run's inputs, so a checkpoint left by a
+    different configuration is ignored rather than resumed.
+    """
+
+    def __init__(self, path: str, key: Any):
+        self.path = path
+        self.key = key
+
+    def load(self) -> Optional[RecycleState]:
+        try:
+            with open(self.path, 'rb') as file:
+                key, state = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return None
+        if key != self.key:
+            logger.info(f"Ignoring checkpoint {self.path} written for different inputs")
+            return None
+        logger.info(f"Resuming from {self.path} at iteration {state.iteration}")
+        return state
+
+    def save(self, state: RecycleState) -> None:
+        atomic_write(self.path, pickle.dumps((self.key, state), protocol=pickle.HIGHEST_PROTOCOL))
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -2,4 +2,11 @@
 class Constants:
     KELVIN_OFFSET = 273.15
     BASIS_MASS = 1000  # kg
-    PRESSURE_ATM = 101325  # Pa
\ No newline at end of file
+    PRESSURE_ATM = 101325  # Pa
+
+    # Integrator presets selectable as solver: {preset: ...} in config.yaml
+    SOLVER_PRESETS = {
+        'fast': {'rtol': 1e-6, 'atol': 1e-12, 'preconditioner': True},
+        'balanced': {'rtol': 1e-9, 'atol': 1e-15, 'preconditioner': True},
+        'accurate': {'rtol': 1e-10, 'atol': 1e-18, 'preconditioner': False},
+    }
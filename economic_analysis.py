@@ -1,8 +1,9 @@
 import numpy as np
 from dataclasses import dataclass
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Mapping, Optional, Union
 from constants import Constants
-from models import EconomicResults, ReactorResults
+from models import BatchEconomicResults, EconomicResults, ReactorResults
+from streams import species_vectors
 
 @dataclass
 class EconomicResults:
@@ -34,10 +35,16 @@ class MarketPrices:
             'NAPH': 0,     # Naphthalene
             'IND': 0       # Indene
         }
-        # Dynamically calculate C2H2 price based on C2H2 + H2 → C2H4
-        price_c2h4_mol = (self.prices.get('C2H4', 0) / 1000) * (28.054 / 1000)
-        price_h2_mol = (self.prices.get('H2', 0) / 1000) * (2.016 / 1000)
-        self.prices['C2H2'] = ((price_c2h4_mol - price_h2_mol) / (26.038 / 1000)) * 1000 * 0.5
+        self.prices['C2H2'] = self.derived_c2h2_price(self.prices.get('C2H4', 0), self.prices.get('H2', 0))
+
+    @staticmethod
+    def derived_c2h2_price(price_c2h4, price_h2):
+        """
+        C2H2 price implied by C2H2 + H2 → C2H4, at half the margin. Works elementwise on arrays.
+        """
+        price_c2h4_mol = (price_c2h4 / 1000) * (28.054 / 1000)
+        price_h2_mol = (price_h2 / 1000) * (2.016 / 1000)
+        return ((price_c2h4_mol - price_h2_mol) / (26.038 / 1000)) * 1000 * 0.5
 
     def get_price(self, species):
         """
@@ -45,6 +52,33 @@ class MarketPrices:
         """
         return self.prices.get(species, 0)
 
+    def price_vector(self, species_names):
+        """
+        Get the market prices for a sequence of species as an array.
+        """
+        return np.array([self.get_price(sp) for sp in species_names], dtype=float)
+
+    def scenario_matrix(self, species_names, scenarios: Mapping[str, Any]) -> np.ndarray:
+        """
+        Build an (M, n_species) price matrix from per-species price columns.
+
+        Each entry of `scenarios` maps a species to M prices (or a scalar applied to
+        every scenario); other species keep their base price. Unless given explicitly,
+        the C2H2 price of each scenario is derived from its C2H4 and H2 prices.
+        """
+        columns = {sp: np.atleast_1d(np.asarray(values, dtype=float)) for sp, values in scenarios.items()}
+        n_scenarios = max((len(values) for values in columns.values()), default=1)
+        species_names = list(species_names)
+        matrix = np.tile(self.price_vector(species_names), (n_scenarios, 1))
+        index = {sp: i for i, sp in enumerate(species_names)}
+        if 'C2H2' not in columns:
+            columns['C2H2'] = self.derived_c2h2_price(columns.get('C2H4', self.get_price('C2H4')),
+                                                      columns.get('H2', self.get_price('H2')))
+        for species, values in columns.items():
+            if species in index:
+                matrix[:, index[species]] = values
+        return matrix
+
 class EconomicAnalysis:
     def __init__(self, gas):
         """
@@ -55,6 +89,8 @@ class EconomicAnalysis:
         """
         self.gas = gas
         self.market_prices = MarketPrices()
+        self.vectors = species_vectors(gas)
+        self.prices = self.market_prices.price_vector(self.vectors.species_names)
 
     def calculate_economic_value(
         self, 
@@ -64,79 +100,119 @@ class EconomicAnalysis:
         basis_mass: float = Constants.BASIS_MASS
     ) -> EconomicResults:
         """Calculate economic value of products per ton of mixed feed"""
+        vectors = self.vectors
+        mol_weights = vectors.molecular_weights
+
         # Get all unique species from both feed and products
-        all_species = set(fresh_feed_composition.keys()) | set(reactor_results.concentrations.keys())
-        
-        # Initialize concentrations dict with zeros for all species
-        final_concentrations = {sp: reactor_results.concentrations.get(sp, 0.0) for sp in all_species}
-        
-        # Adjust concentrations for recycled species
-        adjusted_concentrations = {}
-        total_conc = sum(final_concentrations.values())
-        
-        for sp, conc in final_concentrations.items():
-            # Use the passed recycle_ratios instead of accessing from reactor_results
-            recycle_ratio = recycle_ratios.get(sp, 0.0)
-            adjusted_conc = conc * (1 - recycle_ratio)
-            if adjusted_conc > 0:
-                adjusted_concentrations[sp] = adjusted_conc
-        
-        # Normalize adjusted concentrations
-        total_adj_conc = sum(adjusted_concentrations.values())
-        normalized_concentrations = {
-            sp: conc/total_adj_conc 
-            for sp, conc in adjusted_concentrations.items()
-        }
-        
-        # Rest of the calculations remain the same but use normalized_concentrations
-        total_molecular_weight = sum(
-            conc * self.gas.molecular_weights[self.gas.species_index(sp)]
-            for sp, conc in normalized_concentrations.items()
-        )
-        
-        mass_flows = {
-            sp: (conc * self.gas.molecular_weights[self.gas.species_index(sp)] * basis_mass) / total_molecular_weight
-            for sp, conc in normalized_concentrations.items()
-        }
-        
+        all_species = list(dict.fromkeys(list(fresh_feed_composition) + list(reactor_results.concentrations)))
+        index = vectors.indices(all_species)
+        concentrations = np.array([reactor_results.concentrations.get(sp, 0.0) for sp in all_species])
+        feed_fractions = np.array([fresh_feed_composition.get(sp, 0.0) for sp in all_species])
+        is_feed = np.array([sp in fresh_feed_composition for sp in all_species])
+        recycle_ratio = np.array([recycle_ratios.get(sp, 0.0) for sp in all_species])
+        weights = mol_weights[index]
+        prices = self.prices[index]
+
+        # Adjust concentrations for recycled species and normalize the species that leave
+        adjusted_concentrations = concentrations * (1 - recycle_ratio)
+        leaves = adjusted_concentrations > 0
+        normalized_concentrations = adjusted_concentrations / adjusted_concentrations[leaves].sum()
+
+        total_molecular_weight = normalized_concentrations[leaves] @ weights[leaves]
+        mass_flows = normalized_concentrations * weights * basis_mass / total_molecular_weight
+
         # Calculate product values only for non-recycled products
-        product_values = {}
-        total_value = 0
-        
-        for sp in adjusted_concentrations.keys():
-            if sp not in fresh_feed_composition:  # Only calculate values for products
-                value = mass_flows[sp] * self.market_prices.get_price(sp) / 1000
-                product_values[sp] = value
-                total_value += value
-            else:
-                product_values[sp] = 0.0
-        
+        values = np.where(is_feed, 0.0, mass_flows * prices / 1000)
+        product_values = {sp: float(values[i]) for i, sp in enumerate(all_species) if leaves[i]}
+        total_value = float(values[leaves & ~is_feed].sum())
+
         # Calculate feed cost using fresh feed composition
-        feed_mol_weight = sum(
-            frac * self.gas.molecular_weights[self.gas.species_index(sp)]
-            for sp, frac in fresh_feed_composition.items()
-        )
-        
-        feed_cost = sum(
-            basis_mass * (frac * self.gas.molecular_weights[self.gas.species_index(sp)] / feed_mol_weight) * 
-            self.market_prices.get_price(sp) / 1000
-            for sp, frac in fresh_feed_composition.items()
-        )
+        feed_index = vectors.indices(fresh_feed_composition)
+        feed_fraction_values = np.array(list(fresh_feed_composition.values()), dtype=float)
+        feed_mol_weight = feed_fraction_values @ mol_weights[feed_index]
+        feed_cost = float(np.sum(
+            basis_mass * (feed_fraction_values * mol_weights[feed_index] / feed_mol_weight) *
+            self.prices[feed_index] / 1000
+        ))
         
         net_value = total_value - feed_cost
         
         # Calculate weighted feed values using fresh feed composition
-        weighted_feed_values = {}
-        for sp in final_concentrations.keys():
-            if sp in fresh_feed_composition:
-                feed_mass = basis_mass * (fresh_feed_composition[sp] * self.gas.molecular_weights[self.gas.species_index(sp)] / feed_mol_weight)
-                weighted_feed_values[sp] = feed_mass * self.market_prices.get_price(sp) / 1000
-            else:
-                weighted_feed_values[sp] = 0.0
+        feed_values = basis_mass * (feed_fractions * weights / feed_mol_weight) * prices / 1000
+        weighted_feed_values = {
+            sp: float(feed_values[i]) if is_feed[i] else 0.0
+            for i, sp in enumerate(all_species)
+        }
                 
         return EconomicResults(
             product_values=product_values,
             total_value=total_value,
             net_value=net_value,
             weighted_feed_values=weighted_feed_values
-        )
\ No newline at end of file
+        )
+
+    def concentration_matrix(self, concentrations: Iterable[Dict[str, float]]) -> np.ndarray:
+        """Stack stored outlet concentration dictionaries into an (N, n_species) array."""
+        return np.array([self.vectors.vector(c) for c in concentrations]).reshape(-1, self.vectors.n_species)
+
+    def batch_economic_value(
+        self,
+        concentrations: np.ndarray,
+        fresh_feed_composition: Union[Dict[str, float], np.ndarray],
+        recycle_ratios: Dict[str, float],
+        price_matrix: Optional[np.ndarray] = None,
+        basis_mass: float = Constants.BASIS_MASS,
+        product_values: bool = False
+    ) -> BatchEconomicResults:
+        """
+        Value N outlet compositions under M price scenarios in one vectorized pass.
+
+        Args:
+            concentrations: (N, n_species) outlet concentrations, e.g. from concentration_matrix
+            fresh_feed_composition: feed mole fractions shared by all results, or an (N, n_species) array
+            recycle_ratios: recycled fraction of each species
+            price_matrix: (M, n_species) prices, e.g. from MarketPrices.scenario_matrix (default: base prices)
+            basis_mass: mixed feed basis [kg]
+            product_values: also return the (N, M, n_species) value of each product
+
+        Row i, column j reproduces calculate_economic_value for result i under scenario j.
+        """
+        vectors = self.vectors
+        mol_weights = vectors.molecular_weights
+        concentrations = np.atleast_2d(np.asarray(concentrations, dtype=float))
+        prices = self.prices[None, :] if price_matrix is None else np.atleast_2d(price_matrix)
+
+        if isinstance(fresh_feed_composition, dict):
+            feed = vectors.vector(fresh_feed_composition)[None, :]
+            is_feed = np.zeros(vectors.n_species, dtype=bool)
+            is_feed[vectors.indices(fresh_feed_composition)] = True
+        else:
+            feed = np.atleast_2d(np.asarray(fresh_feed_composition, dtype=float))
+            is_feed = feed > 0
+
+        # Product mass flows of the species that leave, per ton of mixed feed
+        adjusted = np.clip(concentrations * (1 - self._ratio_vector(recycle_ratios)), 0.0, None)
+        totals = adjusted.sum(axis=1, keepdims=True)
+        normalized = np.divide(adjusted, totals, out=np.zeros_like(adjusted), where=totals > 0)
+        total_molecular_weight = normalized @ mol_weights
+        mass_flows = normalized * mol_weights * basis_mass / total_molecular_weight[:, None]
+        sold = np.where(is_feed, 0.0, mass_flows)
+
+        # Feed cost per scenario from the fresh feed mass fractions
+        feed_mass = feed * mol_weights
+        feed_mass_fractions = feed_mass / feed_mass.sum(axis=1, keepdims=True)
+        feed_cost = basis_mass * (feed_mass_fractions @ prices.T) / 1000
+
+        total_value = sold @ prices.T / 1000
+        feed_cost = np.broadcast_to(feed_cost, total_value.shape)
+        return BatchEconomicResults(
+            species_names=list(vectors.species_names),
+            mass_flows=sold,
+            total_value=total_value,
+            feed_cost=feed_cost,
+            net_value=total_value - feed_cost,
+            product_values=sold[:, None, :] * prices[None, :, :] / 1000 if product_values else None
+        )
+
+    def _ratio_vector(self, recycle_ratios: Dict[str, float]) -> np.ndarray:
+        return self.vectors.vector({sp: r for sp, r in recycle_ratios.items() if sp in self.vectors.index})
@@ -0,0 +1,151 @@
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Any, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SOLVER_STAT_KEYS = ('steps', 'rhs_evals', 'jac_evals')
+
+
+class _Phase:
+    """Context manager timing one phase; fields set on the yielded record are exported with it."""
+
+    __slots__ = ('profiler', 'record', 'start')
+
+    def __init__(self, profiler: 'Profiler', record: Dict[str, Any]):
+        self.profiler = profiler
+        self.record = record
+
+    def __enter__(self) -> Dict[str, Any]:
+        self.profiler._stack().append(self.record['phase'])
+        self.start = time.perf_counter()
+        return self.record
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        end = time.perf_counter()
+        stack = self.profiler._stack()
+        stack.pop()
+        self.record['start'] = self.start - self.profiler.origin
+        self.record['duration'] = end - self.start
+        if stack:
+            self.record['parent'] = stack[-1]
+        if exc_type is not None:
+            self.record['error'] = exc_type.__name__
+        self.profiler.emit(self.record)
+
+
+class Profiler:
+    """Times named phases and exports one structured record per phase.
+
+    Records are dictionaries with at least 'phase', 'start' (seconds since the
+    profiler was created) and 'duration'; they are appended as JSON lines to
+    `output` and/or passed to `callback`.
+    """
+
+    enabled = True
+
+    def __init__(self, output: Optional[str] = None,
+                 callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 keep_records: bool = True):
+        self.output = output
+        self.callback = callback
+        self.keep_records = keep_records
+        self.records: List[Dict[str, Any]] = []
+        self.origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._file = open(output, 'a') if output else None
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'Profiler':
+        """Build the profiler from the profiling section of config.yaml, or the no-op profiler if disabled."""
+        settings = config.get('profiling') or {}
+        if not settings.get('enabled', False):
+            return NULL_PROFILER
+        return cls(output=settings.get('output'))
+
+    def phase(self, name: str, **fields) -> _Phase:
+        return _Phase(self, dict(fields, phase=name))
+
+    def emit(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            if self.keep_records:
+                self.records.append(record)
+            if self._file is not None:
+                self._file.write(json.dumps(record, default=float) + '\n')
+        if self.callback is not None:
+            self.callback(record)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Total time, call count and solver work per phase over the kept records."""
+        totals = defaultdict(lambda: defaultdict(float))
+        with self._lock:
+            records = list(self.records)
+        for record in records:
+            entry = totals[record['phase']]
+            entry['calls'] += 1
+            entry['duration'] += record['duration']
+            for key in SOLVER_STAT_KEYS:
+                if key in record:
+                    entry[key] += record[key]
+        return {phase: dict(entry) for phase, entry in totals.items()}
+
+    def log_summary(self) -> None:
+        for phase, entry in self.summary().items():
+            solver = ', '.join(f"{key}={int(entry[key])}" for key in SOLVER_STAT_KEYS if key in entry)
+            logger.info(f"{phase}: {entry['duration']:.4f} s over {int(entry['calls'])} calls"
+                        + (f" ({solver})" if solver else ""))
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self) -> Dict[str, Any]:
+        return {}
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+class _NullProfiler:
+    """Stand-in used when profiling is disabled; every phase is a shared no-op context manager."""
+
+    enabled = False
+    _phase = _NullPhase()
+
+    def phase(self, name: str, **fields) -> _NullPhase:
+        return self._phase
+
+    def emit(self, record: Dict[str, Any]) -> None:
+        pass
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {}
+
+    def log_summary(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+NULL_PROFILER = _NullProfiler()
+
+
+def solver_counts(stats: Dict[str, Any]) -> Dict[str, int]:
+    """Pick the integrator work counters out of ReactorNet.solver_stats."""
+    return {key: int(stats[key]) for key in SOLVER_STAT_KEYS if key in stats}
@@ -0,0 +1,352 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import signal
+import socket
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Iterator, List, Optional
+from economic_analysis import EconomicAnalysis
+from mechanism_cache import mechanism_hash
+from checkpoint import RecycleCheckpoint
+from models import ReactorConfig
+from reactor_model import ReactorModel, RecycleReactor
+from result_cache import SimulationCache
+from tabulation import ReactionTable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = '/tmp/reactor_jobs.sock'
+MAX_MESSAGE_BYTES = 64 * 1024 ** 2  # Largest newline-delimited JSON message accepted
+THROUGHPUT_WINDOW = 60.0  # [s] over which runs per second are reported
+
+# Per-process reactor models by mechanism, loaded once and kept for the worker's lifetime
+_worker_models: Dict[str, ReactorModel] = {}
+_worker_cache: Optional[SimulationCache] = None
+_worker_table: Optional[ReactionTable] = None  # Shared by the worker's models; records are keyed by mechanism
+
+
+def init_worker(config: Dict[str, Any]) -> None:
+    """Create the worker's reactor cache and table, and preload the server's default mechanism."""
+    global _worker_cache, _worker_table
+    _worker_cache = SimulationCache.from_config(config)
+    _worker_table = ReactionTable.from_config(config)
+    _worker_model(config['mechanism'])
+
+
+def _worker_model(mechanism: str) -> ReactorModel:
+    model = _worker_models.get(mechanism)
+    if model is None:
+        model = _worker_models[mechanism] = ReactorModel(mechanism, verbose=False, cache=_worker_cache,
+                                                         table=_worker_table)
+    return model
+
+
+def run_request(config: Dict[str, Any], checkpoint: Optional[RecycleCheckpoint] = None) -> Dict[str, Any]:
+    """Run the recycle and economics pipeline for one request; the result is plain JSON data."""
+    started = time.perf_counter()
+    model = _worker_model(config['mechanism'])
+    reactor_config = ReactorConfig.from_dict(config)
+    recycle_results = RecycleReactor(model, verbose=False).simulate_with_recycle(reactor_config,
+                                                                                  checkpoint=checkpoint)
+    economic_results = EconomicAnalysis(gas=model.gas).calculate_economic_value(
+        reactor_results=recycle_results.reactor_results,
+        fresh_feed_composition=config['initial_composition'],
+        recycle_ratios=reactor_config.recycle_ratios
+    )
+    state = recycle_results.reactor_results.state
+    return {
+        'temperature': state.T,
+        'pressure': state.P,
+        'concentrations': recycle_results.reactor_results.concentrations,
+        'mole_fractions': state.vectors.to_dict(state.X),
+        'final_feed': recycle_results.final_feed,
+        'iterations': recycle_results.iterations,
+        'converged': recycle_results.converged,
+        'recycle_to_feed_ratio': recycle_results.recycle_to_feed_ratio,
+        'economics': {
+            'net_value': economic_results.net_value,
+            'total_value': economic_results.total_value,
+            'product_values': economic_results.product_values,
+        },
+        'run_time': time.perf_counter() - started,
+    }
+
+
+def run_key(config: Dict[str, Any], mechanism_hashes: Optional[Dict[tuple, str]] = None) -> str:
+    """Hash of the mechanism contents and the reactor configuration a run resolves to.
+
+    `mechanism_hashes` memoizes file hashes by (path, modification time) across calls.
+    """
+    mechanism_hashes = {} if mechanism_hashes is None else mechanism_hashes
+    mechanism = config['mechanism']
+    stamp = (mechanism, os.path.getmtime(mechanism)) if os.path.exists(mechanism) else (mechanism, None)
+    if stamp not in mechanism_hashes:
+        mechanism_hashes[stamp] = mechanism_hash(mechanism) if stamp[1] is not None else mechanism
+    inputs = {'mechanism': mechanism_hashes[stamp], 'config': asdict(ReactorConfig.from_dict(config))}
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+
+@dataclass
+class ServerMetrics:
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    cache_hits: int = 0  # Answered from the result cache without running
+    deduplicated: int = 0  # Joined an identical run already queued or in flight
+    busy_time: float = 0.0  # [s] summed worker run time
+
+
+class JobServer:
+    """Local simulation service: newline-delimited JSON requests over a Unix socket.
+
+    Each run is a config.yaml style mapping merged over the server's base config. Runs
+    are queued and dispatched to long-lived worker processes that keep their mechanisms
+    loaded. Identical runs are answered from an LRU result cache, or share the pending
+    run if one is already queued. Results stream back to the client as each run finishes.
+
+    Requests: {"op": "submit", "runs": [...]}, {"op": "metrics"} and {"op": "ping"}.
+    """
+
+    def __init__(self, config: Dict[str, Any], socket_path: str = DEFAULT_SOCKET,
+                 workers: Optional[int] = None, cache_entries: int = 1024):
+        self.base_config = {key: value for key, value in config.items()
+                            if key not in ('sweep', 'job_server')}
+        self.socket_path = socket_path
+        self.workers = workers or os.cpu_count() or 1
+        self.cache_entries = cache_entries
+        self.metrics = ServerMetrics()
+        self._results: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._completions: deque = deque()
+        self._mechanism_hashes: Dict[tuple, str] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._in_flight = 0
+        self._started = time.monotonic()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'JobServer':
+        """Build the server from the job_server section of config.yaml."""
+        settings = config.get('job_server') or {}
+        return cls(
+            config,
+            socket_path=settings.get('socket') or DEFAULT_SOCKET,
+            workers=settings.get('workers'),
+            cache_entries=settings.get('cache_entries', 1024)
+        )
+
+    def run_key(self, config: Dict[str, Any]) -> str:
+        return run_key(config, self._mechanism_hashes)
+
+    async def serve(self) -> None:
+        self._queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker,
+                                 initargs=(self.base_config,)) as executor:
+            dispatchers = [asyncio.create_task(self._dispatch(executor)) for _ in range(self.workers)]
+            server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path,
+                                                     limit=MAX_MESSAGE_BYTES)
+            stop = asyncio.Event()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, stop.set)
+            logger.info(f"Job server listening on {self.socket_path} with {self.workers} workers")
+            try:
+                async with server:
+                    await stop.wait()
+            finally:
+                for task in dispatchers:
+                    task.cancel()
+                if os.path.exists(self.socket_path):
+                    os.unlink(self.socket_path)
+                logger.info("Job server stopped")
+
+    async def _dispatch(self, executor: ProcessPoolExecutor) -> None:
+        """Feed queued runs to the pool, keeping at most one run per worker in flight."""
+        loop = asyncio.get_running_loop()
+        while True:
+            key, config, future = await self._queue.get()
+            self._in_flight += 1
+            try:
+                result = await loop.run_in_executor(executor, run_request, config)
+            except Exception as e:
+                self.metrics.failed += 1
+                future.set_result({'status': 'error', 'error': f"{type(e).__name__}: {e}"})
+            else:
+                self.metrics.completed += 1
+                self.metrics.busy_time += result['run_time']
+                self._completions.append(time.monotonic())
+                self._store(key, result)
+                future.set_result({'status': 'done', 'result': result})
+            finally:
+                self._in_flight -= 1
+                self._pending.pop(key, None)
+
+    def _store(self, key: str, result: Dict[str, Any]) -> None:
+        self._results[key] = result
+        self._results.move_to_end(key)
+        while len(self._results) > self.cache_entries:
+            self._results.popitem(last=False)
+
+    def submit(self, run: Dict[str, Any]) -> 'asyncio.Future':
+        """Queue one run, or return the cached or pending outcome of an identical one."""
+        loop = asyncio.get_running_loop()
+        self.metrics.submitted += 1
+        future = loop.create_future()
+        try:
+            config = {**self.base_config, **run}
+            key = self.run_key(config)
+        except Exception as e:
+            self.metrics.failed += 1
+            future.set_result({'status': 'error', 'error': f"Invalid run: {type(e).__name__}: {e}"})
+            return future
+        if key in self._results:
+            self.metrics.cache_hits += 1
+            self._results.move_to_end(key)
+            future.set_result({'status': 'done', 'result': self._results[key], 'cached': True})
+            return future
+        if key in self._pending:
+            self.metrics.deduplicated += 1
+            return self._pending[key]
+        self._pending[key] = future
+        self._queue.put_nowait((key, config, future))
+        return future
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Queue depth, throughput and cache counters."""
+        now = time.monotonic()
+        while self._completions and now - self._completions[0] > THROUGHPUT_WINDOW:
+            self._completions.popleft()
+        window = min(THROUGHPUT_WINDOW, now - self._started)
+        completed = self.metrics.completed
+        return {
+            **asdict(self.metrics),
+            'queue_depth': self._queue.qsize() if self._queue else 0,
+            'in_flight': self._in_flight,
+            'workers': self.workers,
+            'cached_results': len(self._results),
+            'throughput': len(self._completions) / window if window > 0 else 0.0,  # [runs/s]
+            'mean_run_time': self.metrics.busy_time / completed if completed else None,
+            'uptime': now - self._started,
+        }
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    op = request.get('op')
+                except (json.JSONDecodeError, AttributeError) as e:
+                    await self._send(writer, {'status': 'error', 'error': f"Malformed request: {e}"})
+                    continue
+                if op == 'submit':
+                    await self._stream_batch(writer, request.get('runs') or [])
+                elif op == 'metrics':
+                    await self._send(writer, {'status': 'ok', 'metrics': self.snapshot()})
+                elif op == 'ping':
+                    await self._send(writer, {'status': 'ok'})
+                else:
+                    await self._send(writer, {'status': 'error', 'error': f"Unknown op '{op}'"})
+        except (ConnectionResetError, BrokenPipeError):
+            logger.info("Client disconnected")
+        finally:
+            writer.close()
+
+    async def _stream_batch(self, writer: asyncio.StreamWriter, runs: List[Dict[str, Any]]) -> None:
+        """Queue a batch and send each outcome, tagged with its index, as soon as it is ready."""
+        async def tagged(index: int, future: asyncio.Future) -> Dict[str, Any]:
+            # Shielded, so a client leaving early does not cancel runs other clients share
+            return {'index': index, **await asyncio.shield(future)}
+
+        futures = [tagged(i, self.submit(run)) for i, run in enumerate(runs)]
+        for outcome in asyncio.as_completed(futures):
+            await self._send(writer, await outcome)
+        await self._send(writer, {'status': 'complete', 'runs': len(runs)})
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, message: Dict[str, Any]) -> None:
+        writer.write(json.dumps(message).encode() + b'\n')
+        await writer.drain()
+
+
+class JobClient:
+    """Blocking client for a running JobServer."""
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET, timeout: Optional[float] = None):
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def _request(self, request: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            sock.sendall(json.dumps(request).encode() + b'\n')
+            with sock.makefile('r') as stream:
+                for line in stream:
+                    yield json.loads(line)
+
+    def submit(self, runs: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Submit a batch of runs, yielding {'index', 'status', 'result' | 'error'} as each finishes."""
+        for message in self._request({'op': 'submit', 'runs': runs}):
+            if message.get('status') == 'complete':
+                return
+            yield message
+
+    def run(self, run: Dict[str, Any]) -> Dict[str, Any]:
+        """Submit one run and wait for its result."""
+        outcome = next(self.submit([run]))
+        if outcome['status'] != 'done':
+            raise RuntimeError(outcome['error'])
+        return outcome['result']
+
+    def metrics(self) -> Dict[str, Any]:
+        return next(self._request({'op': 'metrics'}))['metrics']
+
+
+def main() -> None:
+    from main import load_config
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Local simulation job server and client.")
+    parser.add_argument('--config', default='config.yaml')
+    parser.add_argument('--socket', help=f"Unix socket path (default: job_server.socket or {DEFAULT_SOCKET})")
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve = commands.add_parser('serve', help="Run the server")
+    serve.add_argument('--workers', type=int, help="Worker processes (default: all cores)")
+    submit = commands.add_parser('submit', help="Submit runs and print results as they finish")
+    submit.add_argument('runs', nargs='+', help="YAML or JSON files, each a run or a list of runs")
+    commands.add_parser('metrics', help="Print the server's queue and throughput metrics")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    socket_path = args.socket or (config.get('job_server') or {}).get('socket') or DEFAULT_SOCKET
+    if args.command == 'serve':
+        server = JobServer.from_config(config)
+        server.socket_path = socket_path
+        server.workers = args.workers or server.workers
+        asyncio.run(server.serve())
+        return
+
+    client = JobClient(socket_path)
+    if args.command == 'metrics':
+        print(json.dumps(client.metrics(), indent=2))
+        return
+    runs = []
+    for path in args.runs:
+        data = load_config(path)
+        runs.extend(data if isinstance(data, list) else [data])
+    for outcome in client.submit(runs):
+        print(json.dumps(outcome))
+
+
+if __name__ == "__main__":
+    main()
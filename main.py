@@ -1,11 +1,20 @@
 import yaml
 import logging
+from dataclasses import replace
 from typing import Dict, Any
-from constants import Constants
 from output_formatter import OutputFormatter
 from economic_analysis import EconomicAnalysis
 from reactor_model import ReactorModel, RecycleReactor
-from models import ReactorConfig, EconomicResults, RecycleResults
+from sweep import iter_sweep, sweep_result
+from result_cache import SimulationCache
+from tabulation import ReactionTable
+from instrumentation import Profiler
+from mechanism_cache import load_mechanism
+from results_store import ResultWriter
+from reaction_flux import reaction_path_summary, write_reaction_paths
+from plug_flow import write_axial_profile
+from streams import species_vectors
+from models import ReactorConfig, EconomicResults, RecycleResults, SweepPoint
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -27,43 +36,106 @@ def main() -> None:
     
     # Load and validate configuration
     config = load_config('config.yaml')
+
+    # Sweep mode: spread the operating grid across a process pool
+    if config.get('sweep'):
+        vectors = species_vectors(load_mechanism(config['mechanism']))
+        store = ResultWriter.from_config(config, vectors.species_names)
+        sweep_results = []
+        for result in iter_sweep(config):
+            if store is not None:
+                store.write_sweep_result(result, vectors)
+                # The store keeps the histories; only the summary is held for printing
+                result.mass_balance_history = []
+                result.trajectory = None
+            sweep_results.append(result)
+        if store is not None:
+            store.close()
+        OutputFormatter(sigma=config['sigma']).print_sweep_results(sweep_results)
+        return
     
     # Create reactor configuration
-    reactor_config = ReactorConfig(
-        temperature=config['temperature_C'] + Constants.KELVIN_OFFSET,
-        pressure=config['pressure'],
-        initial_composition=config['initial_composition'],
-        residence_time=config['time_total'],
-        sigma=config['sigma'],
-        recycle_ratios=config['recycle_ratios'],
-        max_iterations=config['max_iterations'],
-        convergence_tol=config['convergence_tol']
-    )
+    reactor_config = ReactorConfig.from_dict(config)
     
     # Create reactor model and run simulation
-    base_model = ReactorModel(mechanism=config['mechanism'])
+    profiler = Profiler.from_config(config)
+    base_model = ReactorModel(mechanism=config['mechanism'], cache=SimulationCache.from_config(config),
+                              profiler=profiler, table=ReactionTable.from_config(config))
     model = RecycleReactor(base_model)
     
-    recycle_results: RecycleResults = model.simulate_with_recycle(reactor_config)
+    with profiler.phase('recycle'):
+        recycle_results: RecycleResults = model.simulate_with_recycle(reactor_config)
+    solver_stats = recycle_results.reactor_results.solver_stats
+    if solver_stats:
+        logger.info(
+            f"Final reactor solve: {solver_stats['steps']} steps, "
+            f"{solver_stats['rhs_evals']} RHS evaluations, {solver_stats['jac_evals']} Jacobian evaluations"
+        )
+    if reactor_config.plug_flow is not None:
+        outlet = recycle_results.reactor_results
+        logger.info(f"Plug-flow tube: residence time {outlet.time:.4g} s, outlet {outlet.state.T:.1f} K "
+                    f"and {outlet.state.P:.0f} Pa")
+    if base_model.table is not None:
+        stats = base_model.table.stats
+        logger.info(f"Tabulation: {stats.retrieves} retrieves, {stats.grows} grows, {stats.adds} adds, "
+                    f"{len(base_model.table)} records")
     
     # Calculate economics
-    econ = EconomicAnalysis(gas=base_model.gas)
-    economic_results: EconomicResults = econ.calculate_economic_value(
-        reactor_results=recycle_results.reactor_results,
-        fresh_feed_composition=config['initial_composition'],
-        recycle_ratios=reactor_config.recycle_ratios
-    )
+    with profiler.phase('economics'):
+        econ = EconomicAnalysis(gas=base_model.gas)
+        economic_results: EconomicResults = econ.calculate_economic_value(
+            reactor_results=recycle_results.reactor_results,
+            fresh_feed_composition=config['initial_composition'],
+            recycle_ratios=reactor_config.recycle_ratios
+        )
 
     # Format output
-    formatter = OutputFormatter(sigma=config['sigma'])
-    formatter.print_simulation_parameters(reactor_config)
-    formatter.print_recycle_info(recycle_results)
-    formatter.print_economic_results(
-        recycle_results=recycle_results,
-        econ=econ,
-        economic_results=economic_results,
-        fresh_feed_composition=config['initial_composition']
-    )
+    with profiler.phase('output'):
+        formatter = OutputFormatter(sigma=config['sigma'])
+        formatter.print_simulation_parameters(reactor_config)
+        formatter.print_recycle_info(recycle_results)
+        formatter.print_economic_results(
+            recycle_results=recycle_results,
+            econ=econ,
+            economic_results=economic_results,
+            fresh_feed_composition=config['initial_composition']
+        )
+
+    flux = recycle_results.reactor_results.flux
+    if flux is not None:
+        paths = config.get('reaction_paths') or {}
+        summary = reaction_path_summary(
+            base_model.gas, flux,
+            elements=paths.get('elements', ('C', 'H')),
+            top=paths.get('top', 30),
+            threshold=paths.get('threshold', 0.01)
+        )
+        output = paths.get('output') or 'reaction_paths.json'
+        write_reaction_paths(output, summary, dot=paths.get('dot'))
+        logger.info(f"Reaction paths written to {output} (flux closure error {flux.closure_error:.2e})")
+
+    tube = config.get('plug_flow') or {}
+    if reactor_config.plug_flow is not None and tube.get('profile_output'):
+        # Rerun the final pass, streaming its axial profile instead of holding it in memory
+        final_pass = replace(reactor_config, initial_composition=recycle_results.final_feed)
+        n_points = write_axial_profile(tube['profile_output'], base_model.axial_profile(final_pass),
+                                       species_vectors(base_model.gas), tube.get('profile_species'))
+        logger.info(f"Axial profile ({n_points} points) written to {tube['profile_output']}")
+
+    store = ResultWriter.from_config(config, base_model.gas.species_names)
+    if store is not None:
+        point = SweepPoint(
+            temperature_C=config['temperature_C'],
+            pressure=config['pressure'],
+            time_total=config['time_total'],
+            initial_composition=config['initial_composition']
+        )
+        with store:
+            store.write_sweep_result(sweep_result(point, recycle_results, economic_results),
+                                     species_vectors(base_model.gas))
+
+    profiler.log_summary()
+    profiler.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,170 @@
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import cantera as ct
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'CANTERA_MODEL_CACHE',
+    os.path.join(os.path.expanduser('~'), '.cache', 'canteraModel')
+)
+
+# In-process registry: cache key -> (phase definition, species objects, reaction objects)
+_registry: Dict[str, Tuple[Dict[str, Any], list, list]] = {}
+_registry_lock = threading.Lock()
+
+
+def mechanism_hash(mechanism: str) -> str:
+    """Return the SHA-256 hash of a mechanism file's contents."""
+    digest = hashlib.sha256()
+    with open(mechanism, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _to_plain(data: Any) -> Any:
+    """Convert Cantera AnyMap input data into plain, picklable Python containers."""
+    if hasattr(data, 'items'):
+        return {key: _to_plain(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [_to_plain(value) for value in data]
+    return data
+
+
+class MechanismCache:
+    """Two-tier cache of parsed mechanisms: an in-process registry and pickled input data on disk."""
+
+    def __init__(self, cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def load(self, mechanism: str) -> ct.Solution:
+        """Return a new Solution for the mechanism, parsing the YAML file only on a cache miss."""
+        if not os.path.isfile(mechanism):
+            # Cantera data-directory mechanisms cannot be hashed, so load them directly
+            return ct.Solution(mechanism)
+
+        key = f"{mechanism_hash(mechanism)[:16]}-ct{ct.__version__}"
+        with _registry_lock:
+            entry = _registry.get(key)
+        if entry is None:
+            entry = self._load_from_disk(mechanism, key) or self._parse(mechanism, key)
+            with _registry_lock:
+                entry = _registry.setdefault(key, entry)
+        return self._build_solution(*entry)
+
+    def _cache_path(self, mechanism: str, key: str) -> str:
+        name = os.path.splitext(os.path.basename(mechanism))[0]
+        return os.path.join(self.cache_dir, f"{name}-{key}.pkl")
+
+    def _load_from_disk(self, mechanism: str, key: str) -> Optional[Tuple[Dict[str, Any], list, list]]:
+        """Rebuild species and reaction objects from the pickled input data, if present."""
+        if not self.cache_dir:
+            return None
+        path = self._cache_path(mechanism, key)
+        try:
+            with open(path, 'rb') as file:
+                data = pickle.load(file)
+            species = [ct.Species.from_dict(sp) for sp in data['species']]
+            # Reactions need a kinetics object that already knows the species
+            species_only = self._build_solution(data['phase'], species, [])
+            reactions = [ct.Reaction.from_dict(rxn, species_only) for rxn in data['reactions']]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable mechanism cache {path}: {e}")
+            return None
+        return data['phase'], species, reactions
+
+    def _parse(self, mechanism: str, key: str) -> Tuple[Dict[str, Any], list, list]:
+        """Parse the YAML mechanism and write its input data to the disk cache."""
+        gas = ct.Solution(mechanism)
+        phase = {
+            'name': gas.name,
+            'thermo': gas.thermo_model,
+            'kinetics': gas.kinetics_model,
+        }
+        species = gas.species()
+        reactions = gas.reactions()
+
+        if self.cache_dir:
+            data = {
+                'phase': phase,
+                'species': [_to_plain(sp.input_data) for sp in species],
+                'reactions': [_to_plain(rxn.input_data) for rxn in reactions],
+            }
+            path = self._cache_path(mechanism, key)
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                # Write to a temporary file first so concurrent workers never read a partial cache
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'wb') as file:
+                    pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning(f"Could not write mechanism cache {path}: {e}")
+
+        return phase, species, reactions
+
+    @staticmethod
+    def _build_solution(phase: Dict[str, Any], species: list, reactions: list) -> ct.Solution:
+        return ct.Solution(
+            thermo=phase['thermo'],
+            kinetics=phase['kinetics'],
+            species=species,
+            reactions=reactions,
+            name=phase['name']
+        )
+
+
+def clone_solution(gas: ct.Solution) -> ct.Solution:
+    """A new Solution with its own state, sharing the species and reaction objects of `gas`."""
+    return ct.Solution(
+        thermo=gas.thermo_model,
+        kinetics=gas.kinetics_model,
+        transport_model=gas.transport_model,
+        species=gas.species(),
+        reactions=gas.reactions(),
+        name=gas.name
+    )
+
+
+class SolutionPool:
+    """One Solution per thread, so threads can set states concurrently without interfering.
+
+    The thread that creates the pool uses the prototype itself; any other thread gets a
+    clone on its first request and keeps it for its lifetime. Clones share the prototype's
+    species and reaction objects, so each extra thread only adds its own state and work arrays.
+    """
+
+    def __init__(self, prototype: ct.Solution):
+        self.prototype = prototype
+        self._local = threading.local()
+        self._local.gas = prototype
+        self._lock = threading.Lock()
+
+    def get(self) -> ct.Solution:
+        gas = getattr(self._local, 'gas', None)
+        if gas is None:
+            # Read the mechanism definition from one thread at a time
+            with self._lock:
+                gas = self._local.gas = clone_solution(self.prototype)
+        return gas
+
+
+_default_cache = MechanismCache()
+
+
+def load_mechanism(mechanism: str) -> ct.Solution:
+    """Load a mechanism through the default cache."""
+    return _default_cache.load(mechanism)
+
+
+def clear_registry() -> None:
+    """Drop all in-process mechanism entries."""
+    with _registry_lock:
+        _registry.clear()
@@ -0,0 +1,220 @@
+import hashlib
+import json
+import logging
+import time
+import cantera as ct
+import numpy as np
+from dataclasses import dataclass, asdict, replace
+from typing import Dict, Any, List, Optional, Sequence
+from economic_analysis import MarketPrices
+from models import ReactorConfig
+from reactor_model import ReactorModel
+from sweep import build_sweep_points
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLDS = (1e-4, 3e-4, 1e-3, 3e-3, 1e-2, 3e-2, 0.1, 0.2, 0.3)
+YIELD_FLOOR = 1e-4  # Target mole fractions below this are compared on an absolute basis
+
+
+@dataclass
+class ReductionCandidate:
+    threshold: float
+    n_species: int
+    n_reactions: int
+    max_error: float
+    simulation_time: float  # [s] summed over the validation conditions
+    speedup: float
+
+
+def filter_species_by_elements(gas: ct.Solution, elements: Sequence[str] = ('C', 'H', 'N')) -> List[str]:
+    """Return the species made only of the given elements."""
+    return [sp.name for sp in gas.species() if all(elem in elements for elem in sp.composition)]
+
+
+def reduction_targets(gas: ct.Solution, feed_species: Sequence[str]) -> List[str]:
+    """Targets are the priced species present in the mechanism plus the feed species."""
+    priced = [sp for sp in MarketPrices().prices if sp in gas.species_names]
+    return list(dict.fromkeys(priced + [sp for sp in feed_species if sp in gas.species_names]))
+
+
+class DRGEPReducer:
+    """Directed relation graph with error propagation (DRGEP) skeletal reduction."""
+
+    def __init__(self, gas: ct.Solution, targets: Sequence[str]):
+        self.gas = gas
+        self.targets = list(targets)
+        self.target_index = np.array([gas.species_index(sp) for sp in self.targets])
+        self.nu = gas.product_stoich_coeffs - gas.reactant_stoich_coeffs
+        participates = (gas.product_stoich_coeffs + gas.reactant_stoich_coeffs) > 0
+        # Explicit collision partners also couple their species to the reaction
+        for i, reaction in enumerate(gas.reactions()):
+            third_body = reaction.third_body
+            if third_body is not None and third_body.name != 'M':
+                participates[gas.species_index(third_body.name), i] = True
+        self.participates = participates.astype(float)
+
+    def interaction_coefficients(self, T: float, P: float, Y: np.ndarray) -> np.ndarray:
+        """Direct interaction coefficients r_AB for one thermochemical state."""
+        self.gas.TPY = T, P, Y
+        contributions = self.nu * self.gas.net_rates_of_progress
+        production = np.clip(contributions, 0, None).sum(axis=1)
+        consumption = -np.clip(contributions, None, 0).sum(axis=1)
+        numerator = np.abs(contributions @ self.participates.T)
+        denominator = np.maximum(production, consumption)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r = np.where(denominator[:, None] > 0, numerator / denominator[:, None], 0.0)
+        np.fill_diagonal(r, 0.0)
+        return np.clip(r, 0.0, 1.0)
+
+    def path_coefficients(self, r: np.ndarray) -> np.ndarray:
+        """Maximum path products from every target to every species (max-product graph search)."""
+        R = np.zeros((len(self.target_index), r.shape[0]))
+        R[np.arange(len(self.target_index)), self.target_index] = 1.0
+        for _ in range(r.shape[0]):
+            R_new = np.maximum(R, np.max(R[:, :, None] * r[None, :, :], axis=1))
+            if np.array_equal(R_new, R):
+                break
+            R = R_new
+        return R.max(axis=0)
+
+    def importance(self, states: np.ndarray) -> np.ndarray:
+        """Overall importance of each species over the sampled (T, P, Y...) states."""
+        overall = np.zeros(self.gas.n_species)
+        for state in states:
+            r = self.interaction_coefficients(state[0], state[1], state[2:])
+            overall = np.maximum(overall, self.path_coefficients(r))
+        overall[self.target_index] = 1.0
+        return overall
+
+    def build(self, species: Sequence[str]) -> ct.Solution:
+        """Build a skeletal Solution with the given species and every reaction among them."""
+        kept = set(species)
+        kept_species = [sp for sp in self.gas.species() if sp.name in kept]
+        species_only = ct.Solution(thermo='ideal-gas', kinetics='gas', species=kept_species, reactions=[])
+        reactions = []
+        for reaction in self.gas.reactions():
+            names = set(reaction.reactants) | set(reaction.products)
+            third_body = reaction.third_body
+            if third_body is not None and third_body.name != 'M':
+                names.add(third_body.name)
+            if not names <= kept:
+                continue
+            data = dict(reaction.input_data)
+            if 'efficiencies' in data:
+                data['efficiencies'] = {sp: eff for sp, eff in data['efficiencies'].items() if sp in kept}
+            reactions.append(ct.Reaction.from_dict(data, species_only))
+        # Results are cached by phase name, so each distinct skeletal mechanism needs its own
+        content = repr(([sp.name for sp in kept_species], [r.input_data for r in reactions]))
+        digest = hashlib.sha256(content.encode()).hexdigest()[:12]
+        return ct.Solution(thermo='ideal-gas', kinetics='gas', species=kept_species,
+                           reactions=reactions, name=f"{self.gas.name}-skeletal-{digest}")
+
+
+class MechanismReduction:
+    """Samples the operating envelope, reduces with DRGEP and validates candidate skeletal mechanisms."""
+
+    def __init__(self, config: Dict[str, Any], mechanism: Optional[str] = None,
+                 max_error: float = 0.05, thresholds: Sequence[float] = DEFAULT_THRESHOLDS,
+                 samples_per_run: int = 40):
+        self.config = config
+        self.mechanism = mechanism or config['mechanism']
+        self.max_error = max_error
+        self.thresholds = sorted(thresholds)
+        self.samples_per_run = samples_per_run
+        self.model = ReactorModel(self.mechanism, verbose=False)
+        self.conditions = self._operating_conditions()
+        feed_species = {sp for condition in self.conditions for sp in condition.initial_composition}
+        self.targets = reduction_targets(self.model.gas, sorted(feed_species))
+        self.reducer = DRGEPReducer(self.model.gas, self.targets)
+
+    def _operating_conditions(self) -> List[ReactorConfig]:
+        """One single-pass reactor configuration per point of the configured sweep envelope."""
+        conditions = []
+        for point in build_sweep_points(self.config):
+            config = dict(self.config,
+                          temperature_C=point.temperature_C,
+                          pressure=point.pressure,
+                          time_total=point.time_total,
+                          initial_composition=point.initial_composition)
+            conditions.append(ReactorConfig.from_dict(config))
+        return conditions
+
+    def sample_states(self) -> np.ndarray:
+        """Integrate the full mechanism over the envelope and subsample the trajectories."""
+        samples = []
+        for condition in self.conditions:
+            condition = replace(condition, integration_mode='steps', record_trajectory=True)
+            trajectory = self.model.simulate(condition).trajectory
+            picks = np.unique(np.linspace(0, len(trajectory.time) - 1, self.samples_per_run).astype(int))
+            samples.append(np.column_stack([
+                trajectory.temperature[picks], trajectory.pressure[picks], trajectory.Y[picks]
+            ]))
+        return np.vstack(samples)
+
+    def _simulate(self, model: ReactorModel) -> tuple:
+        """Outlet target mole fractions for every condition, and the total integration time."""
+        yields = []
+        start = time.perf_counter()
+        # Targets are never removed, so they exist in every candidate mechanism
+        target_index = [model.gas.species_index(sp) for sp in self.targets]
+        for condition in self.conditions:
+            yields.append(model.simulate(condition).state.X[target_index])
+        return np.array(yields), time.perf_counter() - start
+
+    def _yield_error(self, reference: np.ndarray, reduced: np.ndarray) -> float:
+        scale = np.maximum(np.abs(reference), YIELD_FLOOR)
+        return float(np.max(np.abs(reduced - reference) / scale))
+
+    def run(self, output: str, report: Optional[str] = None) -> List[ReductionCandidate]:
+        """Reduce, validate each threshold and write the most reduced mechanism within max_error."""
+        states = self.sample_states()
+        logger.info(f"Sampled {len(states)} states over {len(self.conditions)} conditions")
+        importance = self.reducer.importance(states)
+
+        reference, reference_time = self._simulate(self.model)
+        candidates = []
+        accepted = None
+        for threshold in self.thresholds:
+            species = [sp for sp, value in zip(self.model.gas.species_names, importance) if value >= threshold]
+            reduced_gas = self.reducer.build(species)
+            reduced, reduced_time = self._simulate(ReactorModel.from_solution(reduced_gas, verbose=False))
+            candidate = ReductionCandidate(
+                threshold=threshold,
+                n_species=reduced_gas.n_species,
+                n_reactions=reduced_gas.n_reactions,
+                max_error=self._yield_error(reference, reduced),
+                simulation_time=reduced_time,
+                speedup=reference_time / reduced_time
+            )
+            candidates.append(candidate)
+            logger.info(f"Threshold {threshold:g}: {candidate.n_species} species, "
+                        f"{candidate.n_reactions} reactions, error {candidate.max_error:.2%}, "
+                        f"speedup {candidate.speedup:.1f}x")
+            if candidate.max_error > self.max_error:
+                # Larger thresholds only remove more species
+                break
+            accepted = (candidate, reduced_gas)
+
+        if accepted is None:
+            raise ValueError(f"No skeletal mechanism meets the {self.max_error:.1%} yield error limit")
+        candidate, reduced_gas = accepted
+        reduced_gas.write_yaml(output)
+        logger.info(f"Wrote {output}: {candidate.n_species} species, {candidate.n_reactions} reactions")
+
+        if report:
+            with open(report, 'w') as file:
+                json.dump({
+                    'mechanism': self.mechanism,
+                    'output': output,
+                    'targets': self.targets,
+                    'max_error': self.max_error,
+                    'full': {
+                        'n_species': self.model.gas.n_species,
+                        'n_reactions': self.model.gas.n_reactions,
+                        'simulation_time': reference_time
+                    },
+                    'selected': asdict(candidate),
+                    'candidates': [asdict(c) for c in candidates]
+                }, file, indent=2)
+        return candidates
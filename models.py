@@ -1,5 +1,9 @@
-from dataclasses import dataclass
-from typing import Dict, Any, List
+import cantera as ct
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
+from constants import Constants
+from streams import SpeciesVectors, StateSnapshot, Stream
 
 @dataclass
 class SimulationResults:
@@ -10,11 +14,53 @@ class SimulationResults:
     residence_time: float
     state: Any  # Cantera state object
 
+@dataclass
+class Trajectory:
+    time: np.ndarray  # [s], shape (n_points,)
+    temperature: np.ndarray  # [K], shape (n_points,)
+    pressure: np.ndarray  # [Pa], shape (n_points,)
+    Y: np.ndarray  # Mass fractions, shape (n_points, n_species)
+    species_names: List[str]
+
+    def to_solution_array(self, gas: ct.Solution) -> ct.SolutionArray:
+        """Rebuild the recorded states as a SolutionArray on the given mechanism."""
+        states = ct.SolutionArray(gas, shape=len(self.time), extra={'t': self.time})
+        states.TPY = self.temperature, self.pressure, self.Y
+        return states
+
+@dataclass
+class AxialPoint:
+    """Gas state at one position along the plug-flow tube."""
+    z: float  # Distance from the inlet [m]
+    time: float  # Residence time from the inlet [s]
+    temperature: float  # [K]
+    pressure: float  # [Pa]
+    velocity: float  # [m/s]
+    heat_flux: float  # From the wall into the gas [W/m²]
+    Y: np.ndarray  # Mass fractions, shape (n_species,)
+
+@dataclass
+class FluxSummary:
+    """Time-integrated reaction progress of one run; species and element fluxes follow from it."""
+    time: float  # Integrated span [s]
+    forward_extent: np.ndarray  # (n_reactions,) [kmol] reacted in the forward direction
+    reverse_extent: np.ndarray  # (n_reactions,) [kmol] reacted in the reverse direction
+    production: np.ndarray  # (n_species,) [kmol] created
+    consumption: np.ndarray  # (n_species,) [kmol] destroyed
+    closure_error: float  # Relative mismatch between integrated net production and the change in moles
+
+    @property
+    def net_extent(self) -> np.ndarray:
+        return self.forward_extent - self.reverse_extent
+
 @dataclass
 class ReactorResults:
     time: float
     concentrations: Dict[str, float]
-    state: Any  # Cantera state object
+    state: StateSnapshot  # Outlet state
+    trajectory: Optional[Trajectory] = None
+    solver_stats: Dict[str, Any] = field(default_factory=dict)
+    flux: Optional[FluxSummary] = None  # Only if integration.accumulate_fluxes is enabled
 
 @dataclass
 class EconomicResults:
@@ -23,6 +69,78 @@ class EconomicResults:
     net_value: float
     weighted_feed_values: Dict[str, float]
 
+@dataclass
+class BatchEconomicResults:
+    """Economics of N stored results under M price scenarios, per ton of mixed feed."""
+    species_names: List[str]
+    mass_flows: np.ndarray  # (N, n_species) [kg] of each sold product leaving the process
+    total_value: np.ndarray  # (N, M) product value
+    feed_cost: np.ndarray  # (N, M) fresh feed cost
+    net_value: np.ndarray  # (N, M)
+    product_values: Optional[np.ndarray] = None  # (N, M, n_species), only if requested
+
+@dataclass
+class SolverSettings:
+    rtol: float = 1e-9  # Cantera's ReactorNet defaults
+    atol: float = 1e-15
+    max_steps: Optional[int] = None
+    max_time_step: Optional[float] = None  # [s]
+    preconditioner: bool = False  # Sparse AdaptivePreconditioner with a GMRES linear solver
+
+    @classmethod
+    def from_dict(cls, settings: Optional[Dict[str, Any]]) -> 'SolverSettings':
+        """Build settings from a named preset, overridden by any explicit values."""
+        settings = dict(settings or {})
+        preset = settings.pop('preset', None)
+        if preset is not None and preset not in Constants.SOLVER_PRESETS:
+            raise ValueError(f"Unknown solver preset '{preset}', "
+                             f"expected one of {tuple(Constants.SOLVER_PRESETS)}")
+        values = dict(Constants.SOLVER_PRESETS[preset]) if preset else {}
+        values.update({key: value for key, value in settings.items() if value is not None})
+        return cls(**values)
+
+@dataclass
+class PlugFlowSettings:
+    """Tube geometry and wall conditions of the axial plug-flow mode."""
+    length: float  # [m]
+    diameter: float  # Inner diameter [m]
+    mass_flow: float  # Through one tube [kg/s]
+    segments: int = 100  # Axial cells; the profile is reported at their ends
+    wall_temperature: Optional[List[List[float]]] = None  # [z (m), T (K)] points, interpolated; None is adiabatic
+    heat_transfer_coefficient: float = 0.0  # Inside the tube [W/m²/K]
+    friction_factor: Optional[float] = None  # Darcy factor; None uses a smooth-tube correlation in Re
+    viscosity: float = 4.0e-5  # [Pa s] for the correlation when the mechanism has no transport data
+
+    @classmethod
+    def from_dict(cls, settings: Optional[Dict[str, Any]]) -> Optional['PlugFlowSettings']:
+        """Build settings from the plug_flow section of config.yaml, or None if disabled."""
+        settings = settings or {}
+        if not settings.get('enabled', False):
+            return None
+        wall = settings.get('wall_temperature_C')
+        if isinstance(wall, (int, float)):
+            wall = [[0.0, wall]]
+        return cls(
+            length=settings['length'],
+            diameter=settings['diameter'],
+            mass_flow=settings['mass_flow'],
+            segments=settings.get('segments', 100),
+            wall_temperature=[[float(z), float(T) + Constants.KELVIN_OFFSET] for z, T in wall] if wall else None,
+            heat_transfer_coefficient=settings.get('heat_transfer_coefficient', 0.0),
+            friction_factor=settings.get('friction_factor'),
+            viscosity=settings.get('viscosity', 4.0e-5)
+        )
+
+    @property
+    def cross_section(self) -> float:
+        return np.pi * self.diameter ** 2 / 4
+
+    def wall_temperature_at(self, z: float) -> Optional[float]:
+        if self.wall_temperature is None:
+            return None
+        positions, temperatures = zip(*self.wall_temperature)
+        return float(np.interp(z, positions, temperatures))
+
 @dataclass
 class ReactorConfig:
     temperature: float
@@ -34,17 +152,98 @@ class ReactorConfig:
     max_iterations: int
     convergence_tol: float
     mass_balance_tol: float = 1e-6
+    integration_mode: str = 'fixed'  # 'fixed' output grid or 'steps' (solver internal steps)
+    output_times: Optional[List[float]] = None  # Overrides the default 100-point grid
+    record_trajectory: bool = False
+    steady_state_tol: Optional[float] = None  # Early exit once projected change in Y is below this
+    accumulate_fluxes: bool = False  # Integrate rates of progress into ReactorResults.flux
+    recycle_method: str = 'anderson'  # 'damped', 'wegstein', 'anderson' or 'broyden'
+    damping: float = 0.7  # Relaxation factor applied to the new tear-stream estimate
+    acceleration_memory: int = 5  # Residual history kept by Anderson mixing
+    solver: SolverSettings = field(default_factory=SolverSettings)
+    recycle_mode: str = 'sequential'  # 'sequential' batch re-integration or 'network' steady-flow solve
+    network_stages: int = 1  # Stirred tanks in series used by the network mode
+    network_solver: str = 'steady'  # 'steady' (Newton, with time-march fallback) or 'march'
+    network_recycle_method: str = 'anderson'  # Tear update for the recycled mass flows
+    network_max_iterations: int = 200  # Recycle updates allowed in network mode
+    plug_flow: Optional[PlugFlowSettings] = None  # Axial tube model; residence_time then follows from the flow
+
+    @classmethod
+    def from_dict(cls, config: Dict[str, Any]) -> 'ReactorConfig':
+        """Build a reactor configuration from a config.yaml style dictionary."""
+        integration = config.get('integration') or {}
+        network = config.get('network') or {}
+        return cls(
+            temperature=config['temperature_C'] + Constants.KELVIN_OFFSET,
+            pressure=config['pressure'],
+            initial_composition=config['initial_composition'],
+            residence_time=config['time_total'],
+            sigma=config['sigma'],
+            recycle_ratios=config['recycle_ratios'],
+            max_iterations=config['max_iterations'],
+            convergence_tol=config['convergence_tol'],
+            integration_mode=integration.get('mode', 'fixed'),
+            output_times=integration.get('output_times'),
+            record_trajectory=integration.get('record_trajectory', False),
+            steady_state_tol=integration.get('steady_state_tol'),
+            accumulate_fluxes=integration.get('accumulate_fluxes', False),
+            recycle_method=config.get('recycle_method', 'anderson'),
+            damping=config.get('damping', 0.7),
+            acceleration_memory=config.get('acceleration_memory', 5),
+            solver=SolverSettings.from_dict(config.get('solver')),
+            recycle_mode=config.get('recycle_mode', 'sequential'),
+            network_stages=network.get('stages', 1),
+            network_solver=network.get('solver', 'steady'),
+            network_recycle_method=network.get('recycle_method', 'anderson'),
+            network_max_iterations=network.get('max_iterations', 200),
+            plug_flow=PlugFlowSettings.from_dict(config.get('plug_flow'))
+        )
 
 @dataclass
 class RecycleResults:
     reactor_results: ReactorResults
-    recycle_streams: List[Dict[str, float]]
+    recycle_streams: List[Stream]
     final_feed: Dict[str, float]
     iterations: int
     converged: bool
-    gas: Any  
+    vectors: SpeciesVectors  # Species order of the mechanism
     recycle_to_feed_ratio: float
     initial_moles: float
     final_recycle_moles: float
     mass_balance_history: List[Dict[str, float]]
-    recycle_ratios: Dict[str, float]  
\ No newline at end of file
+    recycle_ratios: Dict[str, float]
+    convergence_history: List[Dict[str, Any]] = field(default_factory=list)
+    accelerator: Any = None  # Tear-stream accelerator with its secant history, to warm-start a neighbour
+
+@dataclass
+class RecycleState:
+    """Sequential recycle loop state at the start of an iteration, as saved by a checkpoint."""
+    iteration: int
+    recycle: Stream  # Current tear-stream iterate
+    accelerator: Any  # RecycleAccelerator with its update history
+    recycle_streams: List[Stream]
+    mass_balance_history: List[Dict[str, Any]]
+    convergence_history: List[Dict[str, Any]]
+    best_residual: float
+    stagnation_counter: int
+
+@dataclass
+class SweepPoint:
+    temperature_C: float
+    pressure: float
+    time_total: float
+    initial_composition: Dict[str, float]
+
+@dataclass
+class SweepResult:
+    point: SweepPoint
+    temperature: float  # Final reactor temperature [K]
+    pressure: float
+    concentrations: Dict[str, float]
+    iterations: int
+    converged: bool
+    recycle_to_feed_ratio: float
+    economic_results: EconomicResults
+    mole_fractions: Optional[np.ndarray] = None  # Final reactor mole fractions, mechanism order
+    mass_balance_history: List[Dict[str, Any]] = field(default_factory=list)
+    trajectory: Optional[Trajectory] = None  # Final recycle iteration, if recorded
@@ -0,0 +1,432 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from economic_analysis import EconomicAnalysis
+from reactor_model import ReactorModel, RecycleReactor
+from result_cache import SimulationCache
+from tabulation import ReactionTable
+from prescreen import Prescreen, ScreenResult, log_screen
+from models import ReactorConfig, RecycleResults
+
+logger = logging.getLogger(__name__)
+
+OPTIMIZABLE = ('temperature_C', 'pressure', 'time_total')  # Plus 'recycle_ratios.<species>'
+WEIGHT_CYCLE = (0.3, 0.5, 0.8, 0.95)  # Surrogate vs. distance weights cycled through each batch
+MIN_DISTANCE = 1e-3  # Candidates closer than this (unit cube) to an evaluated point are skipped
+
+# Per-process reactor model, created once by the pool initializer
+_worker_model: Optional[ReactorModel] = None
+
+
+@dataclass
+class OptimizationVariable:
+    name: str
+    lower: float
+    upper: float
+
+    def to_unit(self, value: float) -> float:
+        return (value - self.lower) / (self.upper - self.lower)
+
+    def from_unit(self, u: float) -> float:
+        return self.lower + u * (self.upper - self.lower)
+
+
+@dataclass
+class Constraints:
+    min_conversion: Optional[float] = None  # Per-pass conversion of the recycled reactants
+    max_recycle_to_feed_ratio: Optional[float] = None
+    require_converged: bool = True
+
+    def violation(self, evaluation: 'Evaluation') -> float:
+        """Relative constraint violation of an evaluation, zero if feasible."""
+        if evaluation.error is not None or (self.require_converged and not evaluation.converged):
+            return 1.0
+        violation = 0.0
+        if self.min_conversion is not None:
+            violation += max(0.0, self.min_conversion - evaluation.conversion) / max(self.min_conversion, 1e-12)
+        if self.max_recycle_to_feed_ratio is not None:
+            violation += (max(0.0, evaluation.recycle_to_feed_ratio - self.max_recycle_to_feed_ratio)
+                          / max(self.max_recycle_to_feed_ratio, 1e-12))
+        return violation
+
+
+@dataclass
+class Evaluation:
+    values: Dict[str, float]
+    net_value: float = float('nan')  # [USD/ton feed]
+    conversion: float = float('nan')
+    recycle_to_feed_ratio: float = float('nan')
+    iterations: int = 0
+    converged: bool = False
+    error: Optional[str] = None
+    feasible: bool = False
+
+
+@dataclass
+class OptimizationResult:
+    variables: List[OptimizationVariable]
+    best: Optional[Evaluation]  # Best feasible evaluation, if any
+    evaluations: List[Evaluation]  # In evaluation order, including reused history
+    n_solves: int  # Recycle solves run by this optimization (excludes reused history)
+    converged: bool  # Search radius shrank below its minimum before the budget ran out
+
+
+def parse_variables(settings: Dict[str, Any]) -> List[OptimizationVariable]:
+    """Build the decision variables from a {name: [lower, upper]} mapping."""
+    variables = []
+    for name, bounds in settings.items():
+        if name not in OPTIMIZABLE and not name.startswith('recycle_ratios.'):
+            raise ValueError(f"Cannot optimize '{name}', expected one of {OPTIMIZABLE} or 'recycle_ratios.<species>'")
+        lower, upper = (float(bound) for bound in bounds)
+        if not upper > lower:
+            raise ValueError(f"Variable '{name}' needs lower < upper, got [{lower}, {upper}]")
+        variables.append(OptimizationVariable(name, lower, upper))
+    if not variables:
+        raise ValueError("No optimization variables given")
+    return variables
+
+
+def apply_values(base_config: Dict[str, Any], values: Dict[str, float]) -> Dict[str, Any]:
+    """Return a copy of the config with the decision variables substituted."""
+    config = dict(base_config)
+    config['recycle_ratios'] = dict(base_config['recycle_ratios'])
+    for name, value in values.items():
+        if name.startswith('recycle_ratios.'):
+            config['recycle_ratios'][name.split('.', 1)[1]] = value
+        else:
+            config[name] = value
+    return config
+
+
+def current_values(config: Dict[str, Any], variables: Sequence[OptimizationVariable]) -> Dict[str, float]:
+    """The configured value of each decision variable (an unlisted recycle ratio is 0)."""
+    values = {}
+    for v in variables:
+        if v.name.startswith('recycle_ratios.'):
+            values[v.name] = float(config['recycle_ratios'].get(v.name.split('.', 1)[1], 0.0))
+        else:
+            values[v.name] = float(config[v.name])
+    return values
+
+
+def per_pass_conversion(recycle_results: RecycleResults, species: Sequence[str]) -> float:
+    """Mass fraction of the given reactants in the reactor inlet consumed in one pass."""
+    vectors = recycle_results.vectors
+    index = vectors.indices(species)
+    feed_mass = vectors.vector(recycle_results.final_feed) * vectors.molecular_weights
+    outlet_Y = recycle_results.reactor_results.state.Y
+    return 1.0 - outlet_Y[index].sum() / (feed_mass[index].sum() / feed_mass.sum())
+
+
+def _init_worker(config: Dict[str, Any]) -> None:
+    """Load the mechanism once per worker process."""
+    global _worker_model
+    _worker_model = ReactorModel(
+        mechanism=config['mechanism'],
+        verbose=False,
+        cache=SimulationCache.from_config(config),
+        table=ReactionTable.from_config(config)
+    )
+
+
+def _evaluate(base_config: Dict[str, Any], values: Dict[str, float]) -> Evaluation:
+    """Run the recycle and economics pipeline at one candidate operating point."""
+    config = apply_values(base_config, values)
+    try:
+        reactor_config = ReactorConfig.from_dict(config)
+        recycle_results = RecycleReactor(_worker_model, verbose=False).simulate_with_recycle(reactor_config)
+        economic_results = EconomicAnalysis(gas=_worker_model.gas).calculate_economic_value(
+            reactor_results=recycle_results.reactor_results,
+            fresh_feed_composition=config['initial_composition'],
+            recycle_ratios=reactor_config.recycle_ratios
+        )
+    except Exception as e:
+        # A failed solve is an infeasible point, not the end of the search
+        logger.warning(f"Evaluation at {values} failed: {e}")
+        return Evaluation(values=values, error=str(e))
+    conversion_species = (config.get('optimization') or {}).get('conversion_species') or list(config['recycle_ratios'])
+    return Evaluation(
+        values=values,
+        net_value=economic_results.net_value,
+        conversion=per_pass_conversion(recycle_results, conversion_species),
+        recycle_to_feed_ratio=recycle_results.recycle_to_feed_ratio,
+        iterations=recycle_results.iterations,
+        converged=recycle_results.converged
+    )
+
+
+def _screen(base_config: Dict[str, Any], configs: List[Dict[str, Any]]) -> List[ScreenResult]:
+    return Prescreen.from_config(base_config, _worker_model).screen(configs)
+
+
+def _rbf_fit(points: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Cubic radial basis interpolant with a linear tail; returns (rbf, polynomial) weights."""
+    n, d = points.shape
+    phi = np.linalg.norm(points[:, None] - points[None], axis=-1) ** 3
+    tail = np.hstack([np.ones((n, 1)), points])
+    system = np.block([[phi, tail], [tail.T, np.zeros((d + 1, d + 1))]])
+    system[:n, :n] += 1e-8 * np.eye(n)  # Guards against nearly coincident points
+    rhs = np.concatenate([values, np.zeros(d + 1)])
+    weights = np.linalg.lstsq(system, rhs, rcond=None)[0]
+    return weights[:n], weights[n:]
+
+
+def _rbf_eval(points: np.ndarray, weights: Tuple[np.ndarray, np.ndarray], x: np.ndarray) -> np.ndarray:
+    lam, c = weights
+    phi = np.linalg.norm(x[:, None] - points[None], axis=-1) ** 3
+    return phi @ lam + c[0] + x @ c[1:]
+
+
+class Optimizer:
+    """Maximizes net value over operating conditions with a radial basis function surrogate.
+
+    Each round fits a cubic RBF to every evaluation so far, perturbs the best feasible
+    point to generate candidates, and picks a batch that trades the predicted net value
+    against distance from evaluated points (a batch DYCORS-style search). The batch is
+    evaluated across a process pool. The perturbation radius halves after repeated rounds
+    without improvement, and the search stops once it falls below `min_radius`.
+    Evaluations are memoized, and with a history file they carry over between runs.
+    With the pre-screen enabled, candidates it rules out are recorded as infeasible without
+    a recycle solve and do not count against the budget.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        settings = config.get('optimization') or {}
+        self.base_config = {key: value for key, value in config.items() if key != 'sweep'}
+        self.variables = parse_variables(settings.get('variables') or {})
+        self.constraints = Constraints(**(settings.get('constraints') or {}))
+        self.max_evaluations = settings.get('max_evaluations', 60)
+        self.workers = settings.get('workers') or os.cpu_count() or 1
+        self.batch_size = settings.get('batch_size') or self.workers
+        self.initial_points = settings.get('initial_points') or 2 * (len(self.variables) + 1)
+        self.radius = settings.get('initial_radius', 0.2)
+        self.min_radius = settings.get('min_radius', 0.005)
+        self.failure_tolerance = settings.get('failure_tolerance', 3)
+        self.rng = np.random.default_rng(settings.get('seed', 0))
+        self.history_path = settings.get('history')
+        self.prescreen = (config.get('prescreen') or {}).get('enabled', False)
+        self.n_screened = 0
+        self.context = self._context_key()
+        self.evaluations: Dict[Tuple[float, ...], Evaluation] = {}
+        if self.history_path:
+            self._load_history()
+
+    def _context_key(self) -> str:
+        """Hash of everything but the optimization settings, so stale history is never reused."""
+        context = {key: value for key, value in self.base_config.items() if key != 'optimization'}
+        context['variables'] = [v.name for v in self.variables]
+        return hashlib.sha1(json.dumps(context, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+    def _key(self, values: Dict[str, float]) -> Tuple[float, ...]:
+        return tuple(round(values[v.name], 10) for v in self.variables)
+
+    def _values(self, u: np.ndarray) -> Dict[str, float]:
+        return {v.name: float(v.from_unit(ui)) for v, ui in zip(self.variables, u)}
+
+    def _unit(self, evaluation: Evaluation) -> np.ndarray:
+        return np.array([v.to_unit(evaluation.values[v.name]) for v in self.variables])
+
+    def _load_history(self) -> None:
+        if not os.path.exists(self.history_path):
+            return
+        with open(self.history_path) as file:
+            for line in file:
+                record = json.loads(line)
+                if record.pop('context') != self.context:
+                    continue
+                evaluation = Evaluation(**record)
+                if np.all((self._unit(evaluation) >= 0) & (self._unit(evaluation) <= 1)):
+                    self._record(evaluation)
+        logger.info(f"Reusing {len(self.evaluations)} evaluations from {self.history_path}")
+
+    def _record(self, evaluation: Evaluation) -> None:
+        evaluation.feasible = self.constraints.violation(evaluation) == 0
+        self.evaluations[self._key(evaluation.values)] = evaluation
+
+    def _evaluate_batch(self, executor: Optional[ProcessPoolExecutor], batch: List[Dict[str, float]]) -> None:
+        batch = [values for values in batch if self._key(values) not in self.evaluations]
+        if batch and self.prescreen:
+            batch = self._screen_batch(executor, batch)
+        if not batch:
+            return
+        if executor is None:
+            results = [_evaluate(self.base_config, values) for values in batch]
+        else:
+            results = list(executor.map(_evaluate, [self.base_config] * len(batch), batch))
+        for evaluation in results:
+            self._record(evaluation)
+            logger.info(f"{evaluation.values}: net value {evaluation.net_value:.2f}, "
+                        f"{'feasible' if evaluation.feasible else 'infeasible'}")
+        self._append_history(results)
+
+    def _screen_batch(self, executor: Optional[ProcessPoolExecutor],
+                      batch: List[Dict[str, float]]) -> List[Dict[str, float]]:
+        """Record the candidates the pre-screen rules out as infeasible, returning the rest."""
+        configs = [apply_values(self.base_config, values) for values in batch]
+        if executor is None:
+            results = _screen(self.base_config, configs)
+        else:
+            chunks = [chunk for chunk in np.array_split(np.arange(len(batch)), min(self.workers, len(batch)))
+                      if len(chunk)]
+            results = [result for chunk_results in executor.map(
+                _screen, repeat(self.base_config), [[configs[i] for i in chunk] for chunk in chunks]
+            ) for result in chunk_results]
+        log_screen(configs, results)
+        screened = [Evaluation(values=values, error=f"Pre-screen: {result.reason}")
+                    for values, result in zip(batch, results) if not result.passed]
+        for evaluation in screened:
+            self._record(evaluation)
+        self.n_screened += len(screened)
+        self._append_history(screened)
+        return [values for values, result in zip(batch, results) if result.passed]
+
+    def _append_history(self, evaluations: List[Evaluation]) -> None:
+        if self.history_path and evaluations:
+            with open(self.history_path, 'a') as file:
+                for evaluation in evaluations:
+                    file.write(json.dumps({'context': self.context, **asdict(evaluation)}) + '\n')
+
+    def _initial_design(self) -> List[Dict[str, float]]:
+        """Latin hypercube, plus the configured operating point if it lies within the bounds."""
+        n, d = self.initial_points, len(self.variables)
+        u = (self.rng.permuted(np.tile(np.arange(n), (d, 1)), axis=1).T + self.rng.random((n, d))) / n
+        design = [self._values(row) for row in u]
+        base = current_values(self.base_config, self.variables)
+        if all(v.lower <= base[v.name] <= v.upper for v in self.variables):
+            design.insert(0, base)
+        return design
+
+    def _surrogate_targets(self, evaluations: List[Evaluation]) -> np.ndarray:
+        """Values to minimize: -net value, with infeasible points ranked behind every feasible one."""
+        objective = np.array([-e.net_value if e.feasible else np.nan for e in evaluations])
+        feasible = objective[~np.isnan(objective)]
+        worst = feasible.max() if len(feasible) else 0.0
+        spread = np.ptp(feasible) if len(feasible) > 1 else 1.0
+        for i, evaluation in enumerate(evaluations):
+            if not evaluation.feasible:
+                objective[i] = worst + spread * (1.0 + self.constraints.violation(evaluation))
+        # Clipping large values at the median keeps poor regions from dominating the fit
+        return np.minimum(objective, np.median(objective))
+
+    def _best(self) -> Optional[Evaluation]:
+        feasible = [e for e in self.evaluations.values() if e.feasible]
+        return max(feasible, key=lambda e: e.net_value) if feasible else None
+
+    def _propose(self, n: int) -> List[Dict[str, float]]:
+        evaluations = list(self.evaluations.values())
+        points = np.array([self._unit(e) for e in evaluations])
+        targets = self._surrogate_targets(evaluations)
+        weights = _rbf_fit(points, targets)
+
+        d = len(self.variables)
+        best = self._best()
+        centre = self._unit(best) if best is not None else points[np.argmin(targets)]
+        n_candidates = min(100 * d, 2000)
+        # Perturb only a few coordinates at a time when there are many variables
+        mask = self.rng.random((n_candidates, d)) < min(1.0, 20.0 / d)
+        mask[np.arange(n_candidates), self.rng.integers(d, size=n_candidates)] = True
+        candidates = np.clip(centre + mask * self.rng.normal(0.0, self.radius, (n_candidates, d)), 0.0, 1.0)
+        predicted = _rbf_eval(points, weights, candidates)
+        scaled = (predicted - predicted.min()) / max(np.ptp(predicted), 1e-12)
+
+        selected: List[np.ndarray] = []
+        for i in range(n):
+            reference = np.vstack([points] + selected) if selected else points
+            distance = np.linalg.norm(candidates[:, None] - reference[None], axis=-1).min(axis=1)
+            if distance.max() < MIN_DISTANCE:
+                break
+            spread = (distance.max() - distance) / max(np.ptp(distance), 1e-12)
+            weight = WEIGHT_CYCLE[i % len(WEIGHT_CYCLE)]
+            score = weight * scaled + (1.0 - weight) * spread
+            score[distance < MIN_DISTANCE] = np.inf
+            selected.append(candidates[np.argmin(score)][None])
+        return [self._values(u[0]) for u in selected]
+
+    def run(self) -> OptimizationResult:
+        reused = len(self.evaluations)
+        workers = min(self.workers, self.batch_size)
+        executor = None
+        if workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                           initargs=(self.base_config,))
+        else:
+            _init_worker(self.base_config)
+        try:
+            budget = self.max_evaluations + reused
+            design = self._initial_design()[:self.max_evaluations]
+            for i in range(0, len(design), self.batch_size):
+                self._evaluate_batch(executor, design[i:i + self.batch_size])
+
+            failures = successes = 0
+            while len(self.evaluations) - self.n_screened < budget and self.radius >= self.min_radius:
+                previous = self._best()
+                batch = self._propose(min(self.batch_size, budget - len(self.evaluations) + self.n_screened))
+                if not batch:
+                    self.radius /= 2
+                    continue
+                self._evaluate_batch(executor, batch)
+                best = self._best()
+                improved = best is not None and (
+                    previous is None or best.net_value - previous.net_value > 1e-3 * max(abs(previous.net_value), 1.0))
+                failures = 0 if improved else failures + 1
+                successes = successes + 1 if improved else 0
+                if failures >= self.failure_tolerance:
+                    self.radius /= 2
+                    failures = 0
+                    logger.info(f"No improvement, search radius reduced to {self.radius:.4g}")
+                elif successes >= self.failure_tolerance:
+                    self.radius = min(2 * self.radius, 0.5)
+                    successes = 0
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        return OptimizationResult(
+            variables=self.variables,
+            best=self._best(),
+            evaluations=list(self.evaluations.values()),
+            n_solves=len(self.evaluations) - reused - self.n_screened,
+            converged=self.radius < self.min_radius
+        )
+
+
+def main() -> None:
+    from main import load_config
+    from output_formatter import OutputFormatter
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Optimize the operating point for net value.")
+    parser.add_argument('--config', default='config.yaml')
+    parser.add_argument('--max-evaluations', type=int, help="Reactor solve budget")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: all cores)")
+    parser.add_argument('--output', help="JSON file for the best point and every evaluation")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    config['optimization'] = dict(config.get('optimization') or {})
+    if args.max_evaluations:
+        config['optimization']['max_evaluations'] = args.max_evaluations
+    if args.workers:
+        config['optimization']['workers'] = args.workers
+
+    result = Optimizer(config).run()
+    OutputFormatter(sigma=config['sigma']).print_optimization_results(result)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({
+                'best': asdict(result.best) if result.best else None,
+                'n_solves': result.n_solves,
+                'converged': result.converged,
+                'evaluations': [asdict(e) for e in result.evaluations]
+            }, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
 import numpy as np
+from typing import Dict, Any, List
 from constants import Constants
 from economic_analysis import EconomicAnalysis
 from reactor_model import RecycleResults
-from models import ReactorConfig, RecycleResults, EconomicResults
+from models import ReactorConfig, RecycleResults, EconomicResults, SweepResult
 
 class OutputFormatter:
     def __init__(self, sigma: float):
@@ -46,73 +47,52 @@ class OutputFormatter:
         print("-" * 115)
         
         # Get all unique species from both feed and products
-        all_species = set(fresh_feed_composition.keys()) | set(recycle_results.reactor_results.concentrations.keys())
+        all_species = list(dict.fromkeys(
+            list(fresh_feed_composition) + list(recycle_results.reactor_results.concentrations)
+        ))
         
         # Get molecular weights for all species
-        gas = recycle_results.reactor_results.state
-        molecular_weights = {
-            sp: gas.molecular_weights[gas.species_index(sp)] 
-            for sp in all_species
-        }
+        vectors = recycle_results.reactor_results.state.vectors
+        molecular_weights = vectors.molecular_weights[vectors.indices(all_species)]
+        in_conc = np.array([fresh_feed_composition.get(sp, 0.0) for sp in all_species])
+        reactor_concentrations = np.array([
+            recycle_results.reactor_results.concentrations.get(sp, 0.0) for sp in all_species
+        ])
+        recycle_ratios = np.array([recycle_results.recycle_ratios.get(sp, 0.0) for sp in all_species])
         
         # Calculate initial mass percentages using fresh feed
-        initial_total_mass = sum(conc * molecular_weights[sp] 
-                         for sp, conc in fresh_feed_composition.items())
+        initial_total_mass = in_conc @ molecular_weights
+        in_mass_perc = in_conc * molecular_weights / initial_total_mass * 100
         
-        # Initialize reactor concentrations with zeros for missing species
-        reactor_concentrations = {
-            sp: recycle_results.reactor_results.concentrations.get(sp, 0.0)
-            for sp in all_species
-        }
-        
-        # Rest of the adjustments for outlet concentrations...
-        adjusted_concentrations = {}
-        total_conc = sum(reactor_concentrations.values())
-        
-        for sp, conc in reactor_concentrations.items():
-            recycle_ratio = recycle_results.recycle_ratios.get(sp, 0.0)
-            adjusted_conc = conc * (1 - recycle_ratio)
-            adjusted_concentrations[sp] = adjusted_conc  # Keep all species, even with zero concentration
-        
-        # Normalize adjusted concentrations
-        total_adj_conc = sum(adjusted_concentrations.values())
-        normalized_concentrations = {
-            sp: conc/total_adj_conc 
-            for sp, conc in adjusted_concentrations.items()
-        }
+        # Adjust outlet concentrations for recycled species, keeping zero concentrations
+        adjusted_concentrations = reactor_concentrations * (1 - recycle_ratios)
+        normalized_concentrations = adjusted_concentrations / adjusted_concentrations.sum()
         
         # Calculate mass percentages based on adjusted concentrations
-        total_mass = sum(conc * molecular_weights[sp] 
-                        for sp, conc in normalized_concentrations.items())
+        total_mass = normalized_concentrations @ molecular_weights
+        out_mass_perc = np.where(normalized_concentrations > 0,
+                                 normalized_concentrations * molecular_weights / total_mass * 100, 0.0)
         
         total_conc = 0.0
         total_mass_perc = 0.0
-        total_in_conc = 0.0
-        total_in_mass = 0.0
+        total_in_conc = float(in_conc.sum() * 100)
+        total_in_mass = float(in_mass_perc.sum())
         
         # Sort species by molecular weight
-        sorted_species = sorted(all_species, key=lambda sp: molecular_weights[sp])
-        
-        for species in sorted_species:
-            conc = normalized_concentrations.get(species, 0.0)
-            in_conc = fresh_feed_composition.get(species, 0.0)
-            in_mass_perc = (in_conc * molecular_weights[species] / initial_total_mass) * 100 if in_conc > 0 else 0.0
-            out_mass_perc = (conc * molecular_weights[species] / total_mass) * 100 if conc > 0 else 0.0
+        for i in np.argsort(molecular_weights, kind='stable'):
+            species = all_species[i]
+            conc = normalized_concentrations[i]
             value = product_values.get(species, 0.0)
             feed_value = weighted_feed_values.get(species, 0.0)
             market_price = econ.market_prices.get_price(species)
             
-            # Add to totals for both input and output
-            total_in_conc += in_conc * 100
-            total_in_mass += in_mass_perc
-            
-            if conc > self.sigma or in_conc > 0:
-                print(f"{species:<8} {market_price:>10.2f} {in_conc*100:>10.2f} {in_mass_perc:>10.2f} "
-                      f"{conc*100:>10.2f} {out_mass_perc:>10.2f} {feed_value:>12.2f} {value:>12.2f}")
+            if conc > self.sigma or in_conc[i] > 0:
+                print(f"{species:<8} {market_price:>10.2f} {in_conc[i]*100:>10.2f} {in_mass_perc[i]:>10.2f} "
+                      f"{conc*100:>10.2f} {out_mass_perc[i]:>10.2f} {feed_value:>12.2f} {value:>12.2f}")
                 total_conc += conc * 100
-                total_mass_perc += out_mass_perc
+                total_mass_perc += out_mass_perc[i]
             else:
-                print(f"{species:<8} {market_price:>10.2f} {in_conc*100:>10.2f} {in_mass_perc:>10.2f} "
+                print(f"{species:<8} {market_price:>10.2f} {in_conc[i]*100:>10.2f} {in_mass_perc[i]:>10.2f} "
                       f"{'< σ':>10} {'< σ':>10} {feed_value:>12.2f} {value:>12.2f}")
         
         print("-" * 115)
@@ -123,4 +103,83 @@ class OutputFormatter:
         print(f"{'Net Value':<52} {net_value:>12.2f} {'USD/ton feed':<12}")
         print(f"{'Recycle/Feed Ratio':<52} {recycle_results.recycle_to_feed_ratio:>12.2f} {'ton/ton':<12}")
         print("-" * 115)
-   
\ No newline at end of file
+
+    def print_sweep_results(self, sweep_results: List[SweepResult],
+                            species: tuple = ('H2', 'C2H2', 'C2H4', 'C6H6')) -> None:
+        print(f"\nSweep results ({len(sweep_results)} operating points):")
+        print("-" * 115)
+        header = f"{'T (°C)':>8} {'P (atm)':>8} {'τ (s)':>8} {'T out (K)':>10} {'Iter':>5} {'Conv':>5} {'R/F':>7}"
+        header += "".join(f" {sp + ' (mol%)':>12}" for sp in species)
+        header += f" {'Net Value':>12}"
+        print(header)
+        print("-" * 115)
+        for result in sweep_results:
+            point = result.point
+            total_conc = sum(result.concentrations.values())
+            row = (f"{point.temperature_C:>8.1f} {point.pressure/Constants.PRESSURE_ATM:>8.2f} "
+                   f"{point.time_total:>8.3g} {result.temperature:>10.1f} {result.iterations:>5d} "
+                   f"{str(result.converged):>5} {result.recycle_to_feed_ratio:>7.2f}")
+            row += "".join(f" {result.concentrations.get(sp, 0.0) / total_conc * 100:>12.2f}" for sp in species)
+            row += f" {result.economic_results.net_value:>12.2f}"
+            print(row)
+        print("-" * 115)
+
+    def print_sensitivity_results(self, results: 'SensitivityResults', top: int = 20) -> None:
+        print(f"\nRate constant sensitivities ({len(results.reactions)} reactions), "
+              f"net value {results.net_value:.2f} USD/ton feed:")
+        for target in ['net_value'] + results.targets:
+            unit = "d(net value)/d ln k [USD/ton]" if target == 'net_value' else f"d ln X({target})/d ln k"
+            print("-" * 115)
+            print(f"{'Rank':>4} {'Reaction':>8}  {'Equation':<70} {unit:>29}")
+            print("-" * 115)
+            for rank, (index, equation, value) in enumerate(results.ranked(target, top), start=1):
+                print(f"{rank:>4} {index:>8}  {equation:<70} {value:>29.4g}")
+        print("-" * 115)
+
+    def print_optimization_results(self, result: 'OptimizationResult') -> None:
+        print(f"\nOperating point optimization: {result.n_solves} reactor solves, "
+              f"{len(result.evaluations)} evaluations in total "
+              f"({'converged' if result.converged else 'budget exhausted'})")
+        best = result.best
+        if best is None:
+            print("No feasible operating point found")
+            return
+        print("-" * 60)
+        print(f"{'Variable':<30} {'Lower':>9} {'Best':>9} {'Upper':>9}")
+        print("-" * 60)
+        for v in result.variables:
+            print(f"{v.name:<30} {v.lower:>9.4g} {best.values[v.name]:>9.4g} {v.upper:>9.4g}")
+        print("-" * 60)
+        print(f"Net value:              {best.net_value:.2f} USD/ton feed")
+        print(f"Per-pass conversion:    {best.conversion:.4f}")
+        print(f"Recycle to feed ratio:  {best.recycle_to_feed_ratio:.4f}")
+        print(f"Recycle iterations:     {best.iterations}")
+
+    def print_batch_results(self, records: List[Dict[str, Any]]) -> None:
+        done = sum(record['status'] == 'done' for record in records)
+        print(f"\nBatch results ({done} of {len(records)} cases done):")
+        print("-" * 80)
+        print(f"{'Case':<30} {'Status':>8} {'Iter':>5} {'Conv':>5} {'R/F':>8} {'Net Value':>12} {'Time (s)':>8}")
+        print("-" * 80)
+        for record in records:
+            result = record.get('result')
+            if result is None:
+                print(f"{record['name']:<30} {record['status']:>8}  {record.get('error', '')}")
+                continue
+            print(f"{record['name']:<30} {record['status']:>8} {result['iterations']:>5d} "
+                  f"{str(result['converged']):>5} {result['recycle_to_feed_ratio']:>8.2f} "
+                  f"{result['economics']['net_value']:>12.2f} {result['run_time']:>8.1f}")
+        print("-" * 80)
+
+    def print_uncertainty_results(self, results: 'UncertaintyResults') -> None:
+        print(f"\nKinetic uncertainty propagation: {results.n_samples} samples "
+              f"({results.n_failed} failed, {results.converged_fraction * 100:.1f}% converged)")
+        print("-" * 115)
+        print(f"{'Output':<25} {'Nominal':>11} {'Mean':>11} {'Std':>11} {'Min':>11} "
+              f"{'P05':>11} {'P50':>11} {'P95':>11} {'Max':>11}")
+        print("-" * 115)
+        for name, stats in results.statistics.items():
+            print(f"{name:<25} {results.nominal[name]:>11.4g} {stats['mean']:>11.4g} {stats['std']:>11.4g} "
+                  f"{stats['min']:>11.4g} {stats['p05']:>11.4g} {stats['p50']:>11.4g} "
+                  f"{stats['p95']:>11.4g} {stats['max']:>11.4g}")
+        print("-" * 115)
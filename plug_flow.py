@@ -0,0 +1,36 @@
+import csv
+from typing import Iterable, Optional, Sequence
+from models import AxialPoint
+from streams import SpeciesVectors
+
+LAMINAR_REYNOLDS = 2300.0
+
+
+def darcy_friction_factor(reynolds: float) -> float:
+    """Darcy friction factor of a smooth tube: 64/Re when laminar, Blasius when turbulent."""
+    if reynolds < LAMINAR_REYNOLDS:
+        return 64.0 / reynolds
+    return 0.316 * reynolds ** -0.25
+
+
+def write_axial_profile(path: str, points: Iterable[AxialPoint], vectors: SpeciesVectors,
+                        species: Optional[Sequence[str]] = None) -> int:
+    """Stream an axial profile to CSV as it is produced; returns the number of points written.
+
+    Mole fractions are written for `species`, or for every species if None.
+    """
+    columns = list(species) if species is not None else list(vectors.species_names)
+    index = vectors.indices(columns)
+    count = 0
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['z_m', 'time_s', 'T_K', 'P_Pa', 'velocity_m_s', 'heat_flux_W_m2']
+                        + [f"X_{sp}" for sp in columns])
+        for point in points:
+            moles = point.Y / vectors.molecular_weights
+            X = moles[index] / moles.sum()
+            writer.writerow([f"{point.z:.6g}", f"{point.time:.6g}", f"{point.temperature:.6g}",
+                             f"{point.pressure:.8g}", f"{point.velocity:.6g}", f"{point.heat_flux:.6g}"]
+                            + [f"{x:.6e}" for x in X])
+            count += 1
+    return count
@@ -0,0 +1,131 @@
+import logging
+import cantera as ct
+import numpy as np
+from dataclasses import dataclass, replace
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from reactor_model import ReactorModel
+from models import ReactorConfig, SolverSettings
+from streams import species_vectors
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScreenResult:
+    equilibrium_conversion: float  # Conversion of the reactants if the fresh feed reached equilibrium
+    conversion: float  # Single-pass conversion at the delay, or at the end of the pass its initial state shared
+    conversion_time: Optional[float]  # [s] conversion delay to min_conversion, None if not reached in time
+    passed: bool
+    reason: Optional[str] = None  # Why the point was dropped
+
+
+class Prescreen:
+    """Batched thermodynamic and kinetic screen of operating points ahead of the recycle solve.
+
+    The fresh feeds of a batch are set in one SolutionArray and equilibrated together at
+    constant enthalpy and pressure, like the adiabatic reactor, which gives each point's
+    equilibrium conversion of the recycled reactants. The kinetic check then measures the
+    conversion delay, the time a loosely integrated pass on the fresh feed takes to convert
+    `min_conversion` of them; points sharing an initial state share one pass, run to the
+    longest of their residence times.
+
+    A point is dropped when its conversion delay exceeds its residence time. The check runs
+    the same reactor and kinetics as the recycle solve, so the criterion holds up to the
+    integration tolerance: such a point's loop carries a large recycle and converges slowly
+    if at all. Equilibrium is reported only, and names a point thermodynamically limited
+    when it is below `min_conversion` as well; a kinetic trajectory can overshoot it, so it
+    does not drop points by itself. No net value bound is used: prices do not depend on the
+    operating point, so any bound from the feed alone is the same for every point.
+    """
+
+    def __init__(self, model: ReactorModel, min_conversion: float = 0.05,
+                 conversion_species: Optional[Sequence[str]] = None, solver: Optional[SolverSettings] = None):
+        self.model = model
+        self.min_conversion = min_conversion
+        self.conversion_species = list(conversion_species) if conversion_species else None
+        self.solver = solver if solver is not None else SolverSettings.from_dict({'preset': 'fast'})
+        self.vectors = species_vectors(model.gas)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], model: ReactorModel) -> Optional['Prescreen']:
+        """Build the screen from the prescreen section of config.yaml, or None if disabled."""
+        settings = config.get('prescreen') or {}
+        if not settings.get('enabled', False):
+            return None
+        if (config.get('plug_flow') or {}).get('enabled', False):
+            raise ValueError("The pre-screen checks a batch reactor pass and cannot be used with plug_flow")
+        return cls(
+            model,
+            min_conversion=settings.get('min_conversion', 0.05),
+            conversion_species=settings.get('conversion_species'),
+            solver=SolverSettings.from_dict(settings.get('solver') or {'preset': 'fast'})
+        )
+
+    def screen(self, configs: Sequence[Dict[str, Any]]) -> List[ScreenResult]:
+        """Screen a batch of config.yaml style operating points."""
+        if not configs:
+            return []
+        reactor_configs = [ReactorConfig.from_dict(config) for config in configs]
+        species = [self._species(config) for config in reactor_configs]
+        equilibrium = self.equilibrium_conversions(reactor_configs, species)
+        delays = self.conversion_delays(reactor_configs, species)
+        results = []
+        for config, equilibrium_conversion, (conversion, delay) in zip(reactor_configs, equilibrium, delays):
+            reason = None
+            if delay is None or delay > config.residence_time:
+                limit = 'thermodynamically' if equilibrium_conversion < self.min_conversion else 'kinetically'
+                reason = (f"conversion {self.min_conversion:.3g} not reached in {config.residence_time:.3g} s "
+                          f"({limit} limited, equilibrium {equilibrium_conversion:.3g})")
+            results.append(ScreenResult(
+                equilibrium_conversion=float(equilibrium_conversion),
+                conversion=conversion,
+                conversion_time=delay,
+                passed=reason is None,
+                reason=reason
+            ))
+        return results
+
+    def equilibrium_conversions(self, configs: Sequence[ReactorConfig],
+                                species: Sequence[Tuple[str, ...]]) -> np.ndarray:
+        """Conversion of each point's reactants (mass basis) with its fresh feed at HP equilibrium."""
+        vectors = self.vectors
+        states = ct.SolutionArray(self.model.gas, len(configs))
+        states.TPX = ([config.temperature for config in configs], [config.pressure for config in configs],
+                      np.array([vectors.vector(config.initial_composition) for config in configs]))
+        reactants = np.zeros((len(configs), vectors.n_species), dtype=bool)
+        for i, names in enumerate(species):
+            reactants[i, vectors.indices(names)] = True
+        initial = np.where(reactants, states.Y, 0.0).sum(axis=1)
+        states.equilibrate('HP')
+        final = np.where(reactants, states.Y, 0.0).sum(axis=1)
+        return np.divide(initial - final, initial, out=np.zeros(len(configs)), where=initial > 0)
+
+    def conversion_delays(self, configs: Sequence[ReactorConfig],
+                          species: Sequence[Tuple[str, ...]]) -> List[Tuple[float, Optional[float]]]:
+        """Conversion reached and the delay to min_conversion of each point, one pass per initial state."""
+        groups: Dict[tuple, List[int]] = {}
+        for i, config in enumerate(configs):
+            key = (config.temperature, config.pressure, tuple(sorted(config.initial_composition.items())),
+                   species[i])
+            groups.setdefault(key, []).append(i)
+        delays: List[Tuple[float, Optional[float]]] = [(0.0, None)] * len(configs)
+        for key, index in groups.items():
+            longest = max(index, key=lambda i: configs[i].residence_time)
+            config = replace(configs[longest], solver=self.solver)
+            conversion, delay = self.model.time_to_conversion(config, key[-1], self.min_conversion)
+            for i in index:
+                delays[i] = float(conversion), delay
+        return delays
+
+    def _species(self, config: ReactorConfig) -> Tuple[str, ...]:
+        return tuple(self.conversion_species or config.recycle_ratios)
+
+
+def log_screen(configs: Sequence[Dict[str, Any]], results: Sequence[ScreenResult]) -> None:
+    """Log the dropped points of a screened batch."""
+    dropped = [(config, result) for config, result in zip(configs, results) if not result.passed]
+    for config, result in dropped:
+        logger.info(f"Pre-screen dropped T={config['temperature_C']:.1f} C, P={config['pressure']:.0f} Pa, "
+                    f"tau={config['time_total']:.3g} s: {result.reason}")
+    if dropped:
+        logger.info(f"Pre-screen dropped {len(dropped)} of {len(results)} points")
@@ -1,236 +1,752 @@
+import os
+from dataclasses import replace
 import cantera as ct
 import numpy as np
 from tqdm import tqdm
-from models import ReactorConfig, ReactorResults, RecycleResults
+from typing import Generator, Optional, Sequence, Tuple
+from models import (AxialPoint, FluxSummary, PlugFlowSettings, ReactorConfig, ReactorResults, RecycleResults,
+                    RecycleState, SolverSettings, Trajectory)
+from mechanism_cache import SolutionPool, load_mechanism, mechanism_hash
+from result_cache import CachedState, SimulationCache
+from tabulation import ReactionTable
+from recycle_acceleration import RecycleAccelerator, create_accelerator
+from instrumentation import NULL_PROFILER, Profiler, solver_counts
+from streams import StateSnapshot, Stream, SpeciesVectors, species_vectors
+from reaction_flux import FluxAccumulator
+from checkpoint import RecycleCheckpoint
+from plug_flow import darcy_friction_factor
 import warnings
 
+INTEGRATION_MODES = ('fixed', 'steps')
+RECYCLE_MODES = ('sequential', 'network')
+NETWORK_SOLVERS = ('steady', 'march')
+STEADY_STATE_CHECKS = 3  # Consecutive outputs that must satisfy the steady-state test
+MAX_STEP_GROWTH = 10.0  # CVODES limits step growth to this factor per step
+# Recycle iterations without a new best residual before the loop gives up. Accelerated residuals
+# rise whenever a secant step overshoots and the scheme restarts, so a short window cuts off
+# solves that are still converging.
+STAGNATION_WINDOW = 10
+
+
+class _TrajectoryBuffer:
+    """Preallocated trajectory storage that doubles its capacity when full."""
+
+    def __init__(self, n_species: int, capacity: int = 128):
+        self.size = 0
+        self.time = np.empty(capacity)
+        self.temperature = np.empty(capacity)
+        self.pressure = np.empty(capacity)
+        self.Y = np.empty((capacity, n_species))
+
+    def append(self, t: float, reactor: ct.IdealGasConstPressureReactor) -> None:
+        self.append_state(t, reactor.T, reactor.thermo.P, reactor.Y)
+
+    def append_state(self, t: float, temperature: float, pressure: float, Y: np.ndarray) -> None:
+        if self.size == len(self.time):
+            self._grow()
+        i = self.size
+        self.time[i] = t
+        self.temperature[i] = temperature
+        self.pressure[i] = pressure
+        self.Y[i] = Y
+        self.size += 1
+
+    def _grow(self) -> None:
+        capacity = 2 * len(self.time)
+        for name in ('time', 'temperature', 'pressure', 'Y'):
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:])
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def to_trajectory(self, species_names: list) -> Trajectory:
+        n = self.size
+        return Trajectory(
+            time=self.time[:n].copy(),
+            temperature=self.temperature[:n].copy(),
+            pressure=self.pressure[:n].copy(),
+            Y=self.Y[:n].copy(),
+            species_names=list(species_names)
+        )
+
+
+class _SteadyStateDetector:
+    """Flags steady state once the current rate of change could not move Y by more than tol before t_end."""
+
+    def __init__(self, tol: float, t_end: float):
+        self.tol = tol
+        self.t_end = t_end
+        self.t_prev = None
+        self.Y_prev = None
+        self.hits = 0
+
+    def update(self, t: float, Y: np.ndarray) -> bool:
+        if self.t_prev is not None and t > self.t_prev:
+            rate = np.max(np.abs(Y - self.Y_prev)) / (t - self.t_prev)
+            projected_change = rate * (self.t_end - t)
+            self.hits = self.hits + 1 if projected_change < self.tol else 0
+        self.t_prev = t
+        self.Y_prev = Y.copy()
+        return self.hits >= STEADY_STATE_CHECKS
+
+
 class ReactorModel:
-    def __init__(self, mechanism='aramco.yaml'):
-        self.gas = ct.Solution(mechanism)
+    """Runs single reactor passes; safe to share between threads.
+
+    Each thread integrates on its own Solution from a pool, so `gas` refers to the calling
+    thread's Solution, holding the outlet state of that thread's last run. Calls leave the
+    configuration they are given unchanged.
+    """
+
+    def __init__(self, mechanism='aramco.yaml', verbose=True, cache: Optional[SimulationCache] = None,
+                 gas: Optional[ct.Solution] = None, profiler: Optional[Profiler] = None,
+                 table: Optional[ReactionTable] = None):
+        self.mechanism = mechanism
+        self.verbose = verbose
+        self.cache = cache
+        self.table = table
+        self.profiler = profiler or NULL_PROFILER
+        loaded = gas is None
+        if loaded:
+            with self.profiler.phase('mechanism_load', mechanism=mechanism):
+                gas = load_mechanism(mechanism)
+        self._solutions = SolutionPool(gas)
+        if loaded and os.path.isfile(mechanism):
+            self.mechanism_hash = mechanism_hash(mechanism)
+        else:
+            self.mechanism_hash = mechanism
+
+    @property
+    def gas(self) -> ct.Solution:
+        """The calling thread's Solution."""
+        return self._solutions.get()
+
+    @classmethod
+    def from_solution(cls, gas: ct.Solution, verbose=True, cache: Optional[SimulationCache] = None,
+                      profiler: Optional[Profiler] = None, table: Optional[ReactionTable] = None) -> 'ReactorModel':
+        """Wrap an in-memory Solution; cached and tabulated results are keyed by the phase name."""
+        return cls(mechanism=gas.name, verbose=verbose, cache=cache, gas=gas, profiler=profiler, table=table)
 
     def simulate(self, config: ReactorConfig) -> ReactorResults:
-        """Run a PFR simulation with given parameters using Lagrangian particle approach."""
+        """Run a PFR simulation with given parameters using Lagrangian particle approach.
+
+        Without plug_flow settings the parcel is one adiabatic constant-pressure batch reactor
+        run for the residence time; with them it marches down a tube (see axial_profile).
+        """
+        if config.plug_flow is not None:
+            # Cache keys and table inputs do not cover the tube settings
+            return self._simulate_plug_flow(config)
+        # Trajectories and fluxes are not cached, so runs that record them always integrate
+        cache_key = None
+        if self.cache is not None and not (config.record_trajectory or config.accumulate_fluxes):
+            with self.profiler.phase('cache_lookup') as record:
+                cache_key = self.cache.key(self.mechanism_hash, config)
+                cached = self.cache.get(cache_key)
+                record['hit'] = cached is not None
+            if cached is not None:
+                self.gas.TPY = cached.temperature, cached.pressure, cached.Y
+                return ReactorResults(
+                    time=cached.time,
+                    concentrations=self._get_significant_species(self.gas, config.sigma),
+                    state=StateSnapshot.from_phase(self.gas)
+                )
+
+        # The table maps the inlet state to the final state only, so runs with an explicit
+        # output grid are not tabulated either
+        table_query = None
+        if self.table is not None and not (config.record_trajectory or config.accumulate_fluxes
+                                           or config.output_times):
+            with self.profiler.phase('table_lookup') as record:
+                table_query = self.table.query(self.mechanism_hash, config)
+                retrieved = self.table.retrieve(table_query)
+                record['hit'] = retrieved is not None
+            if retrieved is not None:
+                temperature, X, end_time = retrieved
+                self.gas.TPX = temperature, config.pressure, X
+                return ReactorResults(
+                    time=end_time,
+                    concentrations=self._get_significant_species(self.gas, config.sigma),
+                    state=StateSnapshot.from_phase(self.gas)
+                )
+
+        with self.profiler.phase('initialize_reactor'):
+            reactor = self._initialize_reactor(config)
+            sim = ct.ReactorNet([reactor])
+            self._configure_solver(sim, config.solver)
+        with self.profiler.phase('integrate', mode=config.integration_mode) as record:
+            end_time, trajectory, flux = self._run_simulation(sim, reactor, config)
+            if self.profiler.enabled:
+                record.update(solver_counts(sim.solver_stats), end_time=end_time)
+        if cache_key is not None:
+            self.cache.put(cache_key, CachedState(
+                time=end_time,
+                temperature=reactor.T,
+                pressure=reactor.thermo.P,
+                Y=reactor.Y.copy()
+            ))
+        results = ReactorResults(
+            time=end_time,
+            concentrations=self._get_significant_species(reactor.thermo, config.sigma),
+            state=StateSnapshot.from_phase(reactor.thermo),
+            trajectory=trajectory,
+            solver_stats=dict(sim.solver_stats),
+            flux=flux
+        )
+        if table_query is not None:
+            state = results.state
+            with self.profiler.phase('table_update') as record:
+                self.table.update(table_query, config, self.table.outputs(state.T, state.X), end_time,
+                                  lambda perturbed: self.table.outputs(*self._integrate_outlet(perturbed)))
+                record.update(records=len(self.table))
+            # Finite-difference runs for a new record move the gas away from this run's outlet
+            self.gas.TPY = state.T, state.P, state.Y
+        return results
+
+    def axial_profile(self, config: ReactorConfig) -> Generator[AxialPoint, None, Optional[FluxSummary]]:
+        """March a gas parcel down the tube, yielding its state at the inlet and at every segment end.
+
+        The parcel is a constant-pressure reactor that exchanges heat through a Wall with a
+        Reservoir held at the local wall temperature. Each segment is integrated for its
+        length over the current velocity, and the distance actually travelled follows from
+        the trapezoidal rule on the velocity, so positions drift from the nominal grid only
+        by the step error. The Darcy-Weisbach pressure drop of a segment is applied after it.
+        Points are generated lazily, so memory use does not grow with the number of segments.
+        The generator returns the flux summary if integration.accumulate_fluxes is on.
+        """
+        tube = config.plug_flow
+        area = tube.cross_section
         reactor = self._initialize_reactor(config)
+        wall = surroundings = None
+        if tube.wall_temperature is not None and tube.heat_transfer_coefficient > 0:
+            # Only the temperature of the surroundings matters, so a one-species phase suffices
+            wall_phase = ct.Solution(thermo='ideal-gas', species=[self.gas.species(0)])
+            wall_phase.TP = tube.wall_temperature_at(0.0), config.pressure
+            surroundings = ct.Reservoir(wall_phase)
+            wall = ct.Wall(surroundings, reactor, A=4 * reactor.volume / tube.diameter,
+                           U=tube.heat_transfer_coefficient)
         sim = ct.ReactorNet([reactor])
-        self._run_simulation(sim, config.residence_time)
+        self._configure_solver(sim, config.solver)
+        flux = FluxAccumulator(reactor) if config.accumulate_fluxes else None
+        if flux is not None:
+            flux.sample(sim.time, reactor)
+
+        def point(z: float, velocity: float) -> AxialPoint:
+            T_wall = tube.wall_temperature_at(z)
+            heat_flux = tube.heat_transfer_coefficient * (T_wall - reactor.T) if wall is not None else 0.0
+            return AxialPoint(z=z, time=sim.time, temperature=reactor.T, pressure=reactor.thermo.P,
+                              velocity=velocity, heat_flux=heat_flux, Y=reactor.Y.copy())
+
+        z = 0.0
+        velocity = tube.mass_flow / (area * reactor.thermo.density)
+        momentum_flux = tube.mass_flow * velocity / area  # rho u^2
+        yield point(z, velocity)
+        segment = tube.length / tube.segments
+        dt = 0.0
+        for k in range(1, tube.segments + 1):
+            z_end = k * segment
+            if wall is not None:
+                # Wall conditions are held at their segment-midpoint values
+                wall.area = 4 * reactor.volume / tube.diameter
+                surroundings.thermo.TP = tube.wall_temperature_at(0.5 * (z + z_end)), reactor.thermo.P
+                surroundings.syncState()
+            t_end = sim.time + (z_end - z) / velocity
+            if flux is not None:
+                dt = self._step_to(sim, reactor, t_end, dt, flux)
+            sim.advance(t_end)
+            if flux is not None:
+                flux.sample(sim.time, reactor)
+            new_velocity = tube.mass_flow / (area * reactor.thermo.density)
+            step = 0.5 * (velocity + new_velocity) * (z_end - z) / velocity
+            new_momentum_flux = tube.mass_flow * new_velocity / area
+            friction = tube.friction_factor
+            if friction is None:
+                reynolds = 4 * tube.mass_flow / (np.pi * tube.diameter * self._viscosity(tube))
+                friction = darcy_friction_factor(reynolds)
+            pressure_drop = friction * step / tube.diameter * 0.25 * (momentum_flux + new_momentum_flux)
+            z += step
+            if pressure_drop > 0:
+                pressure = reactor.thermo.P - pressure_drop
+                if pressure <= 0:
+                    raise ValueError(f"Pressure drop exceeds the inlet pressure at z = {z:.4g} m")
+                T, Y = reactor.T, reactor.Y
+                # Expand the parcel with the pressure drop, so syncState keeps its mass
+                reactor.volume *= reactor.thermo.P / pressure
+                reactor.thermo.TPY = T, pressure, Y
+                reactor.syncState()
+                sim.reinitialize()
+            velocity = tube.mass_flow / (area * reactor.thermo.density)
+            momentum_flux = tube.mass_flow * velocity / area
+            yield point(z, velocity)
+        return flux.summary(reactor) if flux is not None else None
+
+    def _viscosity(self, tube: PlugFlowSettings) -> float:
+        """Gas viscosity from the mechanism's transport model, or the configured fallback."""
+        if self.gas.transport_model == 'none':
+            return tube.viscosity
+        return self.gas.viscosity
+
+    def _simulate_plug_flow(self, config: ReactorConfig) -> ReactorResults:
+        """Run the axial tube model, keeping only the outlet unless a trajectory is recorded."""
+        buffer = None
+        if config.record_trajectory:
+            buffer = _TrajectoryBuffer(self.gas.n_species, capacity=config.plug_flow.segments + 1)
+        profile = self.axial_profile(config)
+        with self.profiler.phase('integrate_plug_flow', segments=config.plug_flow.segments), \
+                tqdm(total=config.plug_flow.length, desc="Plug-flow reactor", unit="m",
+                     disable=not self.verbose) as progress:
+            while True:
+                try:
+                    outlet = next(profile)
+                except StopIteration as stop:
+                    flux = stop.value
+                    break
+                progress.update(min(outlet.z, config.plug_flow.length) - progress.n)
+                if buffer is not None:
+                    buffer.append_state(outlet.time, outlet.temperature, outlet.pressure, outlet.Y)
+        self.gas.TPY = outlet.temperature, outlet.pressure, outlet.Y
         return ReactorResults(
-            time=config.residence_time,
-            concentrations=self._get_significant_species(reactor, config.sigma),
-            state=reactor.thermo
+            time=outlet.time,
+            concentrations=self._get_significant_species(self.gas, config.sigma),
+            state=StateSnapshot.from_phase(self.gas),
+            trajectory=buffer.to_trajectory(self.gas.species_names) if buffer is not None else None,
+            flux=flux
         )
 
+    def _integrate_outlet(self, config: ReactorConfig) -> Tuple[float, np.ndarray]:
+        """Outlet temperature and mole fractions of a quiet run, used to build table records."""
+        reactor = self._initialize_reactor(config)
+        sim = ct.ReactorNet([reactor])
+        self._configure_solver(sim, config.solver)
+        self._run_simulation(sim, reactor, config, quiet=True)
+        return reactor.T, reactor.thermo.X
+
+    def time_to_conversion(self, config: ReactorConfig, species: Sequence[str],
+                           target: float) -> Tuple[float, Optional[float]]:
+        """Single-pass conversion of the given reactants (mass basis), stopping once it reaches target.
+
+        Returns the conversion reached and the time it first reached the target, or None if
+        it stayed below the target for the whole residence time.
+        """
+        reactor = self._initialize_reactor(config)
+        sim = ct.ReactorNet([reactor])
+        self._configure_solver(sim, config.solver)
+        index = [self.gas.species_index(sp) for sp in species]
+        initial = reactor.Y[index].sum()
+        if initial <= 0:
+            return 0.0, None
+        residence_time = config.residence_time
+        sim.max_time_step = min(residence_time / MAX_STEP_GROWTH, config.solver.max_time_step or np.inf)
+        conversion = dt = 0.0
+        while sim.time < residence_time:
+            t_prev = sim.time
+            if t_prev + MAX_STEP_GROWTH * dt >= residence_time:
+                t = sim.advance(residence_time)
+            else:
+                t = sim.step()
+            dt = t - t_prev
+            conversion = 1.0 - reactor.Y[index].sum() / initial
+            if conversion >= target:
+                return conversion, t
+        return conversion, None
+
+    def simulate_sensitivity(self, config: ReactorConfig, reactions: Sequence[int],
+                             rtol: Optional[float] = None,
+                             atol: Optional[float] = None) -> Tuple[ReactorResults, np.ndarray]:
+        """Integrate with forward sensitivities to the rate constants of the given reactions.
+
+        Returns the results and the normalized outlet mole fraction sensitivities
+        d ln(X_k) / d ln(k_i), shape (n_species, len(reactions)).
+        """
+        # Sensitivities are taken on the mass-fraction reactor, which the preconditioner does not support
+        config = replace(config, solver=replace(config.solver, preconditioner=False))
+        reactor = self._initialize_reactor(config)
+        sim = ct.ReactorNet([reactor])
+        for i in reactions:
+            reactor.add_sensitivity_reaction(i)
+        self._configure_solver(sim, config.solver)
+        if rtol is not None:
+            sim.rtol_sensitivity = rtol
+        if atol is not None:
+            sim.atol_sensitivity = atol
+        with self.profiler.phase('integrate_sensitivity', n_parameters=len(reactions)) as record:
+            end_time, trajectory, flux = self._run_simulation(sim, reactor, config)
+            if self.profiler.enabled:
+                record.update(solver_counts(sim.solver_stats))
+
+        start = reactor.component_index(self.gas.species_name(0))
+        mass_fraction_sens = sim.sensitivities()[start:start + self.gas.n_species]
+        X = reactor.thermo.X
+        # d ln X_k = d ln Y_k + d ln(mean molecular weight), and d ln(mean MW) = -sum_j X_j d ln Y_j
+        mole_fraction_sens = mass_fraction_sens - X @ mass_fraction_sens
+        return ReactorResults(
+            time=end_time,
+            concentrations=self._get_significant_species(reactor.thermo, config.sigma),
+            state=StateSnapshot.from_phase(reactor.thermo),
+            trajectory=trajectory,
+            solver_stats=dict(sim.solver_stats),
+            flux=flux
+        ), mole_fraction_sens
+
     def _initialize_reactor(self, config: ReactorConfig) -> ct.IdealGasConstPressureReactor:
         """Initialize reactor with given configuration."""
         self.gas.TPX = config.temperature, config.pressure, config.initial_composition
         desired_mass = 1.0  # kg
         required_volume = desired_mass / self.gas.density  # m³
-        reactor = ct.IdealGasConstPressureReactor(self.gas)
+        # The sparse preconditioner needs the mole-based reactor formulation
+        if config.solver.preconditioner:
+            reactor = ct.IdealGasConstPressureMoleReactor(self.gas)
+        else:
+            reactor = ct.IdealGasConstPressureReactor(self.gas)
         reactor.volume = required_volume
         return reactor
 
-    def _run_simulation(self, sim: ct.ReactorNet, residence_time: float) -> None:
-        """Run the reactor simulation for given time points."""
-        time_points = np.linspace(0, residence_time, 100)
-        for t in tqdm(time_points, desc="Reactor simulation", unit="s"):
-            sim.advance(t)
+    @staticmethod
+    def _configure_solver(sim: ct.ReactorNet, settings: SolverSettings) -> None:
+        """Apply tolerances, step limits and the optional sparse preconditioner."""
+        sim.rtol = settings.rtol
+        sim.atol = settings.atol
+        if settings.max_steps is not None:
+            sim.max_steps = settings.max_steps
+        if settings.max_time_step is not None:
+            sim.max_time_step = settings.max_time_step
+        if settings.preconditioner:
+            sim.preconditioner = ct.AdaptivePreconditioner()
+            # Approximate the Jacobian without third-body and falloff terms to keep it sparse
+            sim.derivative_settings = {'skip-third-bodies': True, 'skip-falloff': True}
+
+    def _run_simulation(self, sim: ct.ReactorNet, reactor: ct.IdealGasConstPressureReactor,
+                        config: ReactorConfig,
+                        quiet: bool = False) -> Tuple[float, Optional[Trajectory], Optional[FluxSummary]]:
+        """Run the reactor simulation, returning the end time and the trajectory and fluxes if requested."""
+        if config.integration_mode not in INTEGRATION_MODES:
+            raise ValueError(f"Unknown integration mode '{config.integration_mode}', "
+                             f"expected one of {INTEGRATION_MODES}")
+        residence_time = config.residence_time
+        buffer = None
+        if config.record_trajectory:
+            buffer = _TrajectoryBuffer(
+                self.gas.n_species,
+                capacity=len(config.output_times) if config.output_times else 128
+            )
+        detector = None
+        if config.steady_state_tol is not None:
+            detector = _SteadyStateDetector(config.steady_state_tol, residence_time)
+        flux = FluxAccumulator(reactor) if config.accumulate_fluxes else None
+
+        with tqdm(total=residence_time, desc="Reactor simulation", unit="s",
+                  disable=quiet or not self.verbose) as progress:
+            if config.integration_mode == 'steps':
+                self._advance_by_steps(sim, reactor, residence_time, config.solver.max_time_step,
+                                       buffer, detector, progress, flux)
+            else:
+                time_points = config.output_times
+                if time_points is None:
+                    time_points = np.linspace(0, residence_time, 100)
+                if flux is not None:
+                    flux.sample(sim.time, reactor)
+                dt = 0.0
+                for t in time_points:
+                    if flux is not None:
+                        # The output grid is too coarse for the fast initial chemistry, so fluxes
+                        # are sampled at the solver's internal steps in between
+                        dt = self._step_to(sim, reactor, t, dt, flux)
+                    sim.advance(t)
+                    progress.update(t - progress.n)
+                    if buffer is not None:
+                        buffer.append(t, reactor)
+                    if flux is not None:
+                        flux.sample(t, reactor)
+                    if detector is not None and detector.update(t, reactor.Y):
+                        break
+
+        trajectory = buffer.to_trajectory(self.gas.species_names) if buffer is not None else None
+        return sim.time, trajectory, flux.summary(reactor) if flux is not None else None
+
+    @staticmethod
+    def _advance_by_steps(sim: ct.ReactorNet, reactor: ct.IdealGasConstPressureReactor,
+                          residence_time: float, max_time_step: Optional[float],
+                          buffer: Optional[_TrajectoryBuffer],
+                          detector: Optional[_SteadyStateDetector], progress: tqdm,
+                          flux: Optional[FluxAccumulator] = None) -> None:
+        """Advance with the solver's internal steps, landing exactly on the residence time."""
+        # Bound the first step; later steps can grow at most MAX_STEP_GROWTH-fold
+        sim.max_time_step = min(residence_time / MAX_STEP_GROWTH, max_time_step or np.inf)
+        if buffer is not None:
+            buffer.append(sim.time, reactor)
+        if flux is not None:
+            flux.sample(sim.time, reactor)
+        dt = 0.0
+        while sim.time < residence_time:
+            t_prev = sim.time
+            if t_prev + MAX_STEP_GROWTH * dt >= residence_time:
+                # The next internal step could overshoot, so let the solver interpolate the end point
+                t = sim.advance(residence_time)
+            else:
+                t = sim.step()
+            dt = t - t_prev
+            progress.update(t - progress.n)
+            if buffer is not None:
+                buffer.append(t, reactor)
+            if flux is not None:
+                flux.sample(t, reactor)
+            if detector is not None and detector.update(t, reactor.Y):
+                break
 
-    def _get_significant_species(self, reactor: ct.IdealGasConstPressureReactor, sigma: float) -> dict:
+    @staticmethod
+    def _step_to(sim: ct.ReactorNet, reactor: ct.IdealGasConstPressureReactor, t_end: float,
+                 dt: float, flux: FluxAccumulator) -> float:
+        """Take internal steps towards t_end while one cannot overshoot it; returns the last step size."""
+        while sim.time + MAX_STEP_GROWTH * dt < t_end:
+            t_prev = sim.time
+            flux.sample(sim.step(), reactor)
+            dt = sim.time - t_prev
+        return dt
+
+    def _get_significant_species(self, thermo: ct.Solution, sigma: float) -> dict:
         """Filter and return species above concentration threshold."""
         return {
-            species: conc for species, conc in zip(self.gas.species_names, reactor.thermo.concentrations)
+            species: conc for species, conc in zip(self.gas.species_names, thermo.concentrations)
             if conc > sigma
         }
 
 
 class RecycleReactor:
-    def __init__(self, base_reactor=None):
+    def __init__(self, base_reactor=None, verbose=True):
         self.reactor = base_reactor if base_reactor else ReactorModel()
+        self.verbose = verbose
 
-    def simulate_with_recycle(self, config: ReactorConfig) -> RecycleResults:
-        """Simulate reactor with recycle streams until convergence."""
+    def simulate_with_recycle(self, config: ReactorConfig, initial_recycle: Optional[Stream] = None,
+                              checkpoint: Optional[RecycleCheckpoint] = None,
+                              initial_accelerator: Optional[RecycleAccelerator] = None) -> RecycleResults:
+        """Simulate reactor with recycle streams until convergence.
+
+        `initial_recycle` warm-starts the tear stream, e.g. from the last recycle stream
+        of a converged neighbouring operating point, and `initial_accelerator` (that
+        point's RecycleResults.accelerator) hands over what secant information its
+        method keeps between points (see RecycleAccelerator.warm_start).
+        With a `checkpoint`, the sequential loop saves its state after every iteration
+        and resumes from the last saved iteration instead of starting over. Network mode
+        does not checkpoint.
+        """
+        if config.recycle_mode == 'network':
+            if config.plug_flow is not None:
+                raise ValueError("The plug-flow tube model needs recycle_mode 'sequential'")
+            if checkpoint is not None:
+                raise ValueError("Recycle checkpoints need recycle_mode 'sequential'")
+            return NetworkRecycleReactor(self.reactor, self.verbose).simulate_with_recycle(
+                config, initial_recycle, initial_accelerator)
+        if config.recycle_mode not in RECYCLE_MODES:
+            raise ValueError(f"Unknown recycle mode '{config.recycle_mode}', expected one of {RECYCLE_MODES}")
         initial_state = self._initialize_simulation(config)
-        previous_compositions = {}
+        vectors = species_vectors(self.reactor.gas)
+        fresh_moles = initial_state.moles
+        fresh_feed = vectors.vector(config.initial_composition) * fresh_moles
+        # Tear stream: the recycled molar amounts per mole of fresh feed, so the size of the
+        # recycle converges along with its composition, as the recycled mass flows do in network mode
+        recycle_index = np.flatnonzero(self._recycle_ratio_vector(vectors, config) > 0)
+        accelerator = self._create_accelerator(config.recycle_method, config, initial_accelerator)
+        x = np.zeros(len(recycle_index))
+        if initial_recycle is not None:
+            x = initial_recycle.moles[recycle_index] / fresh_moles
         recycle_streams = []
         mass_balance_history = []
-        best_error = float('inf')
+        convergence_history = []
+        best_residual = float('inf')
         stagnation_counter = 0
+        converged = False
+        start = 0
+        state = checkpoint.load() if checkpoint is not None else None
+        if state is not None and state.iteration >= config.max_iterations:
+            warnings.warn(f"Ignoring checkpoint {checkpoint.path}: it has no iterations left to run")
+            state = None
+        if state is not None:
+            start = state.iteration
+            x = state.recycle.moles[recycle_index] / fresh_moles
+            accelerator = state.accelerator
+            recycle_streams = state.recycle_streams
+            mass_balance_history = state.mass_balance_history
+            convergence_history = state.convergence_history
+            best_residual = state.best_residual
+            stagnation_counter = state.stagnation_counter
         
-        for iteration in range(config.max_iterations):
-            result = self.reactor.simulate(config)
-            recycle_stream = self._calculate_recycle_stream(result, config, initial_state)
-            recycle_streams.append(recycle_stream)
-            
-            mass_balance = self._verify_mass_balance(
-                initial_state, 
-                ct.Quantity(result.state), 
-                recycle_stream, 
-                config
-            )
-            mass_balance_history.append(mass_balance)
-            
-            current_error = mass_balance['relative_error']
-            if current_error < best_error:
-                best_error = current_error
-                stagnation_counter = 0
-            else:
-                stagnation_counter += 1
-                
-            if stagnation_counter >= 3:
-                warnings.warn("Terminating early due to stagnation in solution")
-                break
-                
-            if not mass_balance['is_balanced']:
-                warnings.warn(
-                    f"Mass balance error at iteration {iteration}. "
-                    f"Relative Error: {mass_balance['relative_error']:.2%}"
-                )
-            
-            new_feed = self._calculate_new_feed(config, initial_state, recycle_stream)
-            
-            if self._check_convergence(new_feed, previous_compositions, config):
-                break
-                
-            # Apply damping
-            for species in new_feed:
-                if species in previous_compositions:
-                    new_feed[species] = 0.7 * new_feed[species] + 0.3 * previous_compositions[species]
-                    
-            previous_compositions = new_feed.copy()
-            config.initial_composition = new_feed
+        profiler = self.reactor.profiler
+        for iteration in range(start, config.max_iterations):
+            with profiler.phase('recycle_iteration', iteration=iteration) as record:
+                inlet_recycle = self._tear_stream(vectors, recycle_index, x * fresh_moles)
+                # Each pass runs on a copy of the caller's config fed the fresh feed plus the recycle
+                inlet = fresh_feed + inlet_recycle.moles
+                pass_config = replace(config, initial_composition=vectors.to_dict(inlet / inlet.sum()))
+                result = self.reactor.simulate(pass_config)
+                with profiler.phase('recycle_stream'):
+                    recycle_stream = self._calculate_recycle_stream(result, config, initial_state, inlet_recycle)
+                    recycle_streams.append(recycle_stream)
+
+                with profiler.phase('mass_balance'):
+                    mass_balance = self._verify_mass_balance(
+                        initial_state,
+                        result.state,
+                        recycle_stream,
+                        config
+                    )
+                mass_balance_history.append(mass_balance)
+
+                if not mass_balance['is_balanced']:
+                    warnings.warn(
+                        f"Mass balance error at iteration {iteration}. "
+                        f"Relative Error: {mass_balance['relative_error']:.2%}"
+                    )
+
+                g = recycle_stream.moles[recycle_index] / fresh_moles
+                residual = float(np.max(np.abs(g - x), initial=0.0))
+                converged = residual <= config.convergence_tol
+                convergence_history.append({
+                    'iteration': iteration,
+                    'method': accelerator.name,
+                    'residual': residual,
+                    'mass_balance_error': mass_balance['relative_error'],
+                    **{key: result.solver_stats.get(key, 0) for key in ('steps', 'rhs_evals', 'jac_evals')}
+                })
+                record.update(convergence_history[-1])
+                if converged:
+                    break
+
+                # Stagnation is judged on the tear-stream residual the accelerators drive to zero
+                if residual < best_residual:
+                    best_residual = residual
+                    stagnation_counter = 0
+                else:
+                    stagnation_counter += 1
+
+                if stagnation_counter >= STAGNATION_WINDOW:
+                    warnings.warn("Terminating early due to stagnation in solution")
+                    break
+
+                with profiler.phase('recycle_update', method=accelerator.name):
+                    x_next = accelerator.update(x, g)
+                convergence_history[-1]['step'] = float(np.max(np.abs(x_next - x)))
+                x = x_next
+                # Only a state with an iteration left to run is saved, so a resumed loop always
+                # runs at least one pass to build its results from
+                if checkpoint is not None and iteration + 1 < config.max_iterations:
+                    checkpoint.save(RecycleState(
+                        iteration=iteration + 1,
+                        recycle=self._tear_stream(vectors, recycle_index, x * fresh_moles),
+                        accelerator=accelerator,
+                        recycle_streams=recycle_streams,
+                        mass_balance_history=mass_balance_history,
+                        convergence_history=convergence_history,
+                        best_residual=best_residual,
+                        stagnation_counter=stagnation_counter
+                    ))
 
         return self._create_recycle_results(
             result=result,
             recycle_streams=recycle_streams,
-            config=config,
+            config=pass_config,
             iteration=iteration,
+            converged=converged,
             initial_state=initial_state,
             final_recycle=recycle_stream,
-            mass_balance_history=mass_balance_history  # Add to results
+            mass_balance_history=mass_balance_history,
+            convergence_history=convergence_history,
+            accelerator=accelerator
         )
 
+    @staticmethod
+    def _create_accelerator(method: str, config: ReactorConfig,
+                            initial_accelerator: Optional[RecycleAccelerator]) -> RecycleAccelerator:
+        """A fresh tear-stream accelerator, or a warm-started copy of a neighbour's with the same method."""
+        if initial_accelerator is not None and initial_accelerator.name == method:
+            return initial_accelerator.warm_start()
+        return create_accelerator(method, config.damping, config.acceleration_memory, normalize=False)
+
+    @staticmethod
+    def _tear_stream(vectors: SpeciesVectors, recycle_index: np.ndarray, moles: np.ndarray) -> Stream:
+        """The recycle stream of a tear-stream iterate, given the molar amounts of the recycled species."""
+        stream = Stream(vectors)
+        stream.moles[recycle_index] = moles
+        return stream
+
     def _initialize_simulation(self, config: ReactorConfig) -> ct.Quantity:
         """Initialize simulation and return initial state."""
         self.reactor.gas.TPX = config.temperature, config.pressure, config.initial_composition
         return ct.Quantity(self.reactor.gas)
 
-    def _calculate_recycle_stream(self, result: ReactorResults, config: ReactorConfig, 
-                                initial_state: ct.Quantity) -> dict:
-        """Calculate recycle stream compositions."""
-        final_quantity = ct.Quantity(result.state)
+    def _calculate_recycle_stream(self, result: ReactorResults, config: ReactorConfig,
+                                  initial_state: ct.Quantity, previous_recycle: Optional[Stream]) -> Stream:
+        """Calculate recycle stream molar amounts; the reactor held the fresh feed and the previous recycle."""
+        vectors = result.state.vectors
         
         reactor_mass = initial_state.mass
-        if hasattr(self, '_previous_recycle'):
-            reactor_mass += sum(
-                moles * self.reactor.gas.molecular_weights[self.reactor.gas.species_index(species)]
-                for species, moles in self._previous_recycle.items()
-            )
-        
-        recycle_stream = {}
-        total_outlet_mass = 0
-        total_recycled_mass = 0
-        
-        for i, species in enumerate(result.state.species_names):
-            species_mass = reactor_mass * result.state.X[i]
-            species_moles = species_mass / self.reactor.gas.molecular_weights[i]
-            ratio = config.recycle_ratios.get(species, 0.0)
-            
-            total_outlet_mass += species_mass
-            if ratio > 0:
-                recycle_stream[species] = species_moles * ratio
-                recycled_mass = species_mass * ratio
-                total_recycled_mass += recycled_mass
+        if previous_recycle is not None:
+            reactor_mass += previous_recycle.mass
         
-        self._previous_recycle = recycle_stream.copy()
-        
-        return recycle_stream
-
-    def _calculate_new_feed(self, config: ReactorConfig, initial_state: ct.Quantity, 
-                          recycle_stream: dict) -> dict:
-        """Calculate new feed composition from fresh feed and recycle stream."""
-        new_feed = {
-            species: config.initial_composition[species] * initial_state.moles
-            for species in config.initial_composition
-        }
-        
-        for species, recycled_moles in recycle_stream.items():
-            new_feed[species] = new_feed.get(species, 0) + recycled_moles
-            
-        total_moles = sum(new_feed.values())
-        return {species: moles/total_moles for species, moles in new_feed.items()}
+        species_moles = reactor_mass * result.state.Y / vectors.molecular_weights
+        return Stream(vectors, species_moles * self._recycle_ratio_vector(vectors, config))
 
     @staticmethod
-    def _check_convergence(new_feed: dict, previous_compositions: dict, 
-                          config: ReactorConfig) -> bool:
-        """Check if recycle stream has converged."""
-        if not previous_compositions:
-            return False
-            
-        return all(
-            abs(new_feed.get(species, 0) - previous_compositions.get(species, 0)) 
-            <= config.convergence_tol
-            for species in config.recycle_ratios
-        )
+    def _recycle_ratio_vector(vectors: SpeciesVectors, config: ReactorConfig) -> np.ndarray:
+        """Recycle ratios aligned with the species order; species outside the mechanism are ignored."""
+        return vectors.vector({
+            sp: ratio for sp, ratio in config.recycle_ratios.items() if sp in vectors.index
+        })
 
     def _create_recycle_results(self, result: ReactorResults, recycle_streams: list,
-                              config: ReactorConfig, iteration: int, 
+                              config: ReactorConfig, iteration: int, converged: bool,
                               initial_state: ct.Quantity,
-                              final_recycle: dict,
-                              mass_balance_history: list) -> RecycleResults:
+                              final_recycle: Stream,
+                              mass_balance_history: list,
+                              convergence_history: list,
+                              accelerator: RecycleAccelerator) -> RecycleResults:
         """Create final results object."""
-        final_recycle_moles = sum(final_recycle.values())
+        final_recycle_moles = final_recycle.total_moles
         return RecycleResults(
             reactor_results=result,
             recycle_streams=recycle_streams,
             final_feed=config.initial_composition,
             iterations=iteration + 1,
-            converged=iteration < config.max_iterations - 1,
-            gas=self.reactor.gas,
+            converged=converged,
+            vectors=species_vectors(self.reactor.gas),
             recycle_to_feed_ratio=final_recycle_moles / initial_state.moles,
             initial_moles=initial_state.moles,
             final_recycle_moles=final_recycle_moles,
             mass_balance_history=mass_balance_history,
-            recycle_ratios=config.recycle_ratios
+            recycle_ratios=config.recycle_ratios,
+            convergence_history=convergence_history,
+            accelerator=accelerator
         )
 
-    def _verify_mass_balance(self, initial_state: ct.Quantity, final_state: ct.Quantity, 
-                           recycle_stream: dict, config: ReactorConfig) -> dict:
+    def _verify_mass_balance(self, initial_state: ct.Quantity, final_state: StateSnapshot,
+                           recycle_stream: Stream, config: ReactorConfig) -> dict:
         """Verify mass balance across the reactor system."""
-        mol_weights = {name: self.reactor.gas.molecular_weights[i] 
-                      for i, name in enumerate(self.reactor.gas.species_names)}
-        
         # Calculate stream properties
         fresh_feed_moles = initial_state.moles
         fresh_feed_mass = initial_state.mass
-        recycle_moles = sum(recycle_stream.values())
-        recycle_mass = sum(moles * mol_weights[species]
-                          for species, moles in recycle_stream.items()
-                          if species in mol_weights)
+        recycle_moles = recycle_stream.total_moles
+        recycle_mass = recycle_stream.mass
         
         reactor_inlet_moles = fresh_feed_moles + recycle_moles
         reactor_inlet_mass = fresh_feed_mass + recycle_mass
         reactor_outlet_mass = reactor_inlet_mass
         reactor_outlet_moles = reactor_outlet_mass / final_state.mean_molecular_weight
         
-        final_outlet_mass = reactor_outlet_mass
-        final_outlet_moles = reactor_outlet_moles
-        
-        for species, recycle_moles in recycle_stream.items():
-            final_outlet_mass -= recycle_moles * mol_weights[species]
-            final_outlet_moles -= recycle_moles
+        final_outlet_mass = reactor_outlet_mass - recycle_mass
+        final_outlet_moles = reactor_outlet_moles - recycle_moles
         
         relative_error = abs(fresh_feed_mass - final_outlet_mass) / fresh_feed_mass
         reactor_error = abs(reactor_inlet_mass - reactor_outlet_mass) / reactor_inlet_mass
         
-        print("\nMass Balance Summary:")
-        print("┌────────────────┬────────────┬────────────┬────────────┐")
-        print("│     Stream     │  Mass (kg) │ Moles (kmol)│ Error (%) │")
-        print("├────────────────┼────────────┼────────────┼────────────┤")
-        print(f"│ Fresh Feed     │ {fresh_feed_mass:10.4f} │ {fresh_feed_moles:10.4f} │     -      │")
-        print(f"│ Recycle        │ {recycle_mass:10.4f} │ {recycle_moles:10.4f} │     -      │")
-        print(f"│ Reactor Inlet  │ {reactor_inlet_mass:10.4f} │ {reactor_inlet_moles:10.4f} │     -      │")
-        print(f"│ Reactor Outlet │ {reactor_outlet_mass:10.4f} │ {reactor_outlet_moles:10.4f} │ {reactor_error*100:10.2f} │")
-        print(f"│ Final Outlet   │ {final_outlet_mass:10.4f} │ {final_outlet_moles:10.4f} │ {relative_error*100:10.2f} │")
-        print("└────────────────┴────────────┴────────────┴────────────┘")
+        if self.verbose:
+            print("\nMass Balance Summary:")
+            print("┌────────────────┬────────────┬────────────┬────────────┐")
+            print("│     Stream     │  Mass (kg) │ Moles (kmol)│ Error (%) │")
+            print("├────────────────┼────────────┼────────────┼────────────┤")
+            print(f"│ Fresh Feed     │ {fresh_feed_mass:10.4f} │ {fresh_feed_moles:10.4f} │     -      │")
+            print(f"│ Recycle        │ {recycle_mass:10.4f} │ {recycle_moles:10.4f} │     -      │")
+            print(f"│ Reactor Inlet  │ {reactor_inlet_mass:10.4f} │ {reactor_inlet_moles:10.4f} │     -      │")
+            print(f"│ Reactor Outlet │ {reactor_outlet_mass:10.4f} │ {reactor_outlet_moles:10.4f} │ {reactor_error*100:10.2f} │")
+            print(f"│ Final Outlet   │ {final_outlet_mass:10.4f} │ {final_outlet_moles:10.4f} │ {relative_error*100:10.2f} │")
+            print("└────────────────┴────────────┴────────────┴────────────┘")
 
         return {
             'streams': {
@@ -244,3 +760,201 @@ class RecycleReactor:
             'reactor_error': reactor_error,
             'is_balanced': relative_error <= config.mass_balance_tol and reactor_error <= config.mass_balance_tol
         }
+
+
+class _FlowNetwork:
+    """Reservoirs, stirred tanks and flow controllers of the steady-flow recycle flowsheet."""
+
+    def __init__(self, gas: ct.Solution, config: ReactorConfig, fresh_rate: float):
+        gas.TPX = config.temperature, config.pressure, config.initial_composition
+        self.fresh = ct.Reservoir(gas)
+        self.recycle = ct.Reservoir(gas)
+        self.outlet = ct.Reservoir(gas)
+        # The steady-state solver does not support the mole-based reactors the preconditioner needs
+        self.preconditioned = config.solver.preconditioner and config.network_solver == 'march'
+        reactor_type = (ct.IdealGasConstPressureMoleReactor if self.preconditioned
+                        else ct.IdealGasConstPressureReactor)
+        # Equal stage residence times add up to the configured residence time
+        self.stage_time = config.residence_time / config.network_stages
+        self.tanks = []
+        for _ in range(config.network_stages):
+            gas.TPX = config.temperature, config.pressure, config.initial_composition
+            tank = reactor_type(gas)
+            tank.volume = fresh_rate * self.stage_time / gas.density
+            self.tanks.append(tank)
+        self.fresh_inlet = ct.MassFlowController(self.fresh, self.tanks[0], mdot=fresh_rate)
+        self.recycle_inlet = ct.MassFlowController(self.recycle, self.tanks[0], mdot=0.0)
+        # Every tank passes on exactly what enters the train, so its mass and residence time stay fixed
+        downstream = self.tanks[1:] + [self.outlet]
+        self.transfers = [
+            ct.MassFlowController(tank, target, mdot=fresh_rate)
+            for tank, target in zip(self.tanks, downstream)
+        ]
+        self.sim = ct.ReactorNet(self.tanks)
+
+    def set_recycle(self, gas: ct.Solution, temperature: float, pressure: float,
+                    recycle_flows: np.ndarray, fresh_rate: float) -> None:
+        """Load a new recycle stream [kg/s per species] and rescale the tanks to the new throughput."""
+        recycle_rate = float(recycle_flows.sum())
+        if recycle_rate > 0:
+            gas.TPY = temperature, pressure, recycle_flows / recycle_rate
+            self.recycle.syncState()
+        self.recycle_inlet.mass_flow_rate = recycle_rate
+        total_rate = fresh_rate + recycle_rate
+        for tank, transfer in zip(self.tanks, self.transfers):
+            transfer.mass_flow_rate = total_rate
+            tank.volume = total_rate * self.stage_time / tank.thermo.density
+        self.sim.reinitialize()
+
+
+class NetworkRecycleReactor(RecycleReactor):
+    """Solves the recycle loop as one steady-flow Cantera reactor network.
+
+    The fresh feed and the recycle enter a train of stirred tanks from Reservoirs
+    through MassFlowControllers. Flow devices cannot split a stream by species, so
+    the separator is the recycle Reservoir itself. Between warm-started network
+    solves, it is reloaded from the outlet and the recycle ratios, and the recycled
+    mass flows are the tear variables of the usual accelerators.
+    """
+
+    FRESH_FEED_RATE = 1.0  # [kg/s], the same 1 kg basis as the sequential mode
+
+    def simulate_with_recycle(self, config: ReactorConfig, initial_recycle: Optional[Stream] = None,
+                              initial_accelerator: Optional[RecycleAccelerator] = None) -> RecycleResults:
+        if config.network_solver not in NETWORK_SOLVERS:
+            raise ValueError(f"Unknown network solver '{config.network_solver}', "
+                             f"expected one of {NETWORK_SOLVERS}")
+        gas = self.reactor.gas
+        profiler = self.reactor.profiler
+        vectors = species_vectors(gas)
+        initial_state = self._initialize_simulation(config)
+        recycled = [sp for sp, ratio in config.recycle_ratios.items() if ratio > 0 and sp in vectors.index]
+        recycle_index = vectors.indices(recycled)
+        ratios = np.array([config.recycle_ratios[sp] for sp in recycled])
+        fresh_rate = self.FRESH_FEED_RATE
+
+        with profiler.phase('network_build', stages=config.network_stages):
+            network = _FlowNetwork(gas, config, fresh_rate)
+            self.reactor._configure_solver(network.sim, replace(config.solver, preconditioner=network.preconditioned))
+        accelerator = self._create_accelerator(config.network_recycle_method, config, initial_accelerator)
+        x = np.zeros(len(recycled))
+        if initial_recycle is not None:
+            # Recycled mass flows of the seed, on the same per unit fresh feed basis
+            x = initial_recycle.moles[recycle_index] * vectors.molecular_weights[recycle_index]
+            network.set_recycle(gas, config.temperature, config.pressure,
+                                vectors.vector(dict(zip(recycled, x))), fresh_rate)
+        recycle_streams = []
+        mass_balance_history = []
+        convergence_history = []
+        converged = False
+
+        for iteration in range(config.network_max_iterations):
+            with profiler.phase('network_solve', iteration=iteration) as record:
+                self._solve(network, config, warm_up=iteration == 0)
+                outlet = network.tanks[-1].thermo
+                state = StateSnapshot.from_phase(outlet)
+                recycle_flows = vectors.vector(dict(zip(recycled, x)))
+                # Recycled mass flows implied by the current outlet
+                g = (fresh_rate + x.sum()) * state.Y[recycle_index] * ratios
+                residual = float(np.max(np.abs(g - x)) / fresh_rate)
+
+                recycle_stream = Stream(vectors, recycle_flows / vectors.molecular_weights)
+                recycle_streams.append(recycle_stream)
+                mass_balance = self._network_mass_balance(initial_state, state, recycle_stream,
+                                                          fresh_rate, g.sum(), config)
+                mass_balance_history.append(mass_balance)
+                stats = dict(network.sim.solver_stats)
+                convergence_history.append({
+                    'iteration': iteration,
+                    'method': accelerator.name,
+                    'residual': residual,
+                    'mass_balance_error': mass_balance['relative_error'],
+                    **{key: stats.get(key, 0) for key in ('steps', 'rhs_evals', 'jac_evals')}
+                })
+                record.update(convergence_history[-1])
+                if residual <= config.convergence_tol:
+                    converged = True
+                    break
+
+                x_next = accelerator.update(x, g)
+                convergence_history[-1]['step'] = float(np.max(np.abs(x_next - x)))
+                x = x_next
+                network.set_recycle(gas, config.temperature, config.pressure,
+                                    vectors.vector(dict(zip(recycled, x))), fresh_rate)
+
+        if not converged:
+            warnings.warn(f"Network recycle did not converge in {config.network_max_iterations} "
+                          f"iterations (residual {residual:.2e})")
+
+        result = ReactorResults(
+            time=network.sim.time,
+            concentrations=self._get_significant_species(state, config.sigma),
+            state=state,
+            solver_stats=stats
+        )
+        # Mixed reactor inlet: fresh feed plus the recycle, as mole fractions
+        inlet = vectors.vector(config.initial_composition) * initial_state.moles + recycle_stream.moles
+        final_feed = vectors.to_dict(inlet / inlet.sum())
+        return RecycleResults(
+            reactor_results=result,
+            recycle_streams=recycle_streams,
+            final_feed=final_feed,
+            iterations=iteration + 1,
+            converged=converged,
+            vectors=vectors,
+            recycle_to_feed_ratio=recycle_stream.total_moles / initial_state.moles,
+            initial_moles=initial_state.moles,
+            final_recycle_moles=recycle_stream.total_moles,
+            mass_balance_history=mass_balance_history,
+            recycle_ratios=config.recycle_ratios,
+            convergence_history=convergence_history,
+            accelerator=accelerator
+        )
+
+    @staticmethod
+    def _solve(network: _FlowNetwork, config: ReactorConfig, warm_up: bool) -> None:
+        """Bring the network to steady state for the current recycle stream."""
+        sim = network.sim
+        if config.network_solver == 'march':
+            sim.advance_to_steady_state()
+            return
+        if warm_up:
+            # From a cold start, march one residence time to seed the Newton solve
+            sim.advance(sim.time + config.residence_time)
+        try:
+            sim.solve_steady()
+        except ct.CanteraError:
+            # Newton failed from this starting point: march closer to steady state and retry
+            sim.reinitialize()
+            sim.advance(sim.time + config.residence_time)
+            sim.solve_steady()
+
+    @staticmethod
+    def _get_significant_species(state: StateSnapshot, sigma: float) -> dict:
+        return {
+            species: conc for species, conc in zip(state.species_names, state.concentrations)
+            if conc > sigma
+        }
+
+    def _network_mass_balance(self, initial_state: ct.Quantity, state: StateSnapshot, recycle_stream: Stream,
+                              fresh_rate: float, recycled_rate: float, config: ReactorConfig) -> dict:
+        """Mass balance over one second of operation at the current network solution."""
+        recycle_mass = recycle_stream.mass
+        inlet_mass = fresh_rate + recycle_mass
+        # The separator returns `recycled_rate` of the outlet; the rest leaves as product
+        final_outlet_mass = inlet_mass - recycled_rate
+        relative_error = abs(fresh_rate - final_outlet_mass) / fresh_rate
+        return {
+            'streams': {
+                'fresh_feed': {'moles': fresh_rate / initial_state.mean_molecular_weight, 'mass': fresh_rate},
+                'recycle': {'moles': recycle_stream.total_moles, 'mass': recycle_mass},
+                'reactor_inlet': {'moles': fresh_rate / initial_state.mean_molecular_weight
+                                  + recycle_stream.total_moles, 'mass': inlet_mass},
+                'reactor_outlet': {'moles': inlet_mass / state.mean_molecular_weight, 'mass': inlet_mass},
+                'final_outlet': {'moles': final_outlet_mass / state.mean_molecular_weight,
+                                 'mass': final_outlet_mass}
+            },
+            'relative_error': relative_error,
+            'reactor_error': 0.0,
+            'is_balanced': relative_error <= config.mass_balance_tol
+        }
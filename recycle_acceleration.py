@@ -0,0 +1,195 @@
+import copy
+import numpy as np
+from typing import List, Optional
+
+RECYCLE_METHODS = ('damped', 'wegstein', 'anderson', 'broyden')
+
+
+class RecycleAccelerator:
+    """Base class for tear-stream update schemes solving x = g(x) for the recycle stream."""
+
+    name = 'direct'
+
+    def __init__(self, damping: float = 0.7, normalize: bool = True):
+        self.damping = damping
+        self.normalize = normalize
+        self.x_prev: Optional[np.ndarray] = None
+        self.g_prev: Optional[np.ndarray] = None
+        self.residual_prev = float('inf')
+
+    def update(self, x: np.ndarray, g: np.ndarray) -> np.ndarray:
+        """Return the next tear-stream estimate from the current estimate x and its image g(x)."""
+        residual = np.max(np.abs(g - x))
+        if self.x_prev is None:
+            # First iteration: plain successive substitution, unless a warm start kept a secant estimate
+            x_next = self._first_step(x, g)
+        elif residual >= self.residual_prev:
+            # The last accelerated step made no progress: take a damped step and restart
+            self.reset()
+            x_next = self.damping * g + (1 - self.damping) * x
+        else:
+            x_next = self._accelerate(x, g)
+        self.x_prev = x.copy()
+        self.g_prev = g.copy()
+        self.residual_prev = residual
+        return self._project(x_next)
+
+    def _accelerate(self, x: np.ndarray, g: np.ndarray) -> np.ndarray:
+        return g.copy()
+
+    def _first_step(self, x: np.ndarray, g: np.ndarray) -> np.ndarray:
+        return g.copy()
+
+    def reset(self) -> None:
+        """Discard any accumulated secant information."""
+
+    def warm_start(self) -> 'RecycleAccelerator':
+        """A fresh copy for a neighbouring operating point.
+
+        Secant history is dropped by default: with slopes close to 1 the extrapolation
+        factor 1 / (1 - s) changes severalfold between neighbours, so a history fitted at
+        one point overshoots at the next.
+        """
+        seeded = copy.deepcopy(self)
+        seeded.x_prev = seeded.g_prev = None
+        seeded.residual_prev = float('inf')
+        seeded.reset()
+        return seeded
+
+    def _project(self, x: np.ndarray) -> np.ndarray:
+        """Keep the estimate non-negative, and normalised when it is a composition."""
+        x = np.clip(x, 0.0, None)
+        total = x.sum()
+        return x / total if self.normalize and total > 0 else x
+
+
+class DampedSubstitution(RecycleAccelerator):
+    """Successive substitution with a fixed relaxation factor."""
+
+    name = 'damped'
+
+    def _accelerate(self, x: np.ndarray, g: np.ndarray) -> np.ndarray:
+        return self.damping * g + (1 - self.damping) * x
+
+
+class Wegstein(RecycleAccelerator):
+    """Component-wise Wegstein secant acceleration with a bounded acceleration factor.
+
+    A component whose image moves with slope s gets q = s / (s - 1). Recycle loops that
+    convert little per pass have slopes close to 1, so the bound lets q follow slopes up
+    to about 0.999.
+    """
+
+    name = 'wegstein'
+    q_min = -1000.0
+    q_max = 0.0
+
+    def __init__(self, damping: float = 0.7, normalize: bool = True):
+        super().__init__(damping, normalize)
+        self.q: Optional[np.ndarray] = None
+
+    def warm_start(self) -> 'Wegstein':
+        # The bounded per-component factors of the neighbour take the place of the first substitution step
+        q = self.q
+        seeded = super().warm_start()
+        seeded.q = q
+        return seeded
+
+    def _first_step(self, x: np.ndarray, g: np.ndarray) -> np.ndarray:
+        if self.q is None or len(self.q) != len(x):
+            return g.copy()
+        return self.q * x + (1 - self.q) * g
+
+    def _accelerate(self, x: np.ndarray, g: np.ndarray) -> np.ndarray:
+        dx = x - self.x_prev
+        dg = g - self.g_prev
+        q = np.zeros_like(x)
+        # Components that did not move keep plain substitution (q = 0)
+        moved = np.abs(dx) > np.finfo(float).eps
+        slope = dg[moved] / dx[moved]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            q[moved] = np.where(slope != 1.0, slope / (slope - 1.0), 0.0)
+        self.q = np.clip(q, self.q_min, self.q_max)
+        return self.q * x + (1 - self.q) * g
+
+    def reset(self) -> None:
+        self.q = None
+
+
+class Anderson(RecycleAccelerator):
+    """Anderson mixing over the last `memory` residuals, relaxed by the damping factor."""
+
+    name = 'anderson'
+
+    def __init__(self, damping: float = 0.7, memory: int = 5, normalize: bool = True):
+        super().__init__(damping, normalize)
+        self.memory = memory
+        self.dF: List[np.ndarray] = []
+        self.dG: List[np.ndarray] = []
+
+    def _accelerate(self, x: np.ndarray, g: np.ndarray) -> np.ndarray:
+        f = g - x
+        f_prev = self.g_prev - self.x_prev
+        self.dF.append(f - f_prev)
+        self.dG.append(g - self.g_prev)
+        if len(self.dF) > self.memory:
+            self.dF.pop(0)
+            self.dG.pop(0)
+
+        dF = np.column_stack(self.dF)
+        dG = np.column_stack(self.dG)
+        gamma, *_ = np.linalg.lstsq(dF, f, rcond=None)
+        x_mixed = x - (dG - dF) @ gamma
+        g_mixed = g - dG @ gamma
+        return x_mixed + self.damping * (g_mixed - x_mixed)
+
+    def reset(self) -> None:
+        self.dF.clear()
+        self.dG.clear()
+
+
+class Broyden(RecycleAccelerator):
+    """Broyden's ("good") quasi-Newton method on the residual F(x) = g(x) - x.
+
+    The inverse Jacobian starts at -damping * I (damped substitution) and is
+    refined by a rank-one secant update every iteration.
+    """
+
+    name = 'broyden'
+
+    def __init__(self, damping: float = 0.7, normalize: bool = True):
+        super().__init__(damping, normalize)
+        self.H: Optional[np.ndarray] = None
+
+    def _accelerate(self, x: np.ndarray, g: np.ndarray) -> np.ndarray:
+        f = g - x
+        if self.H is None:
+            self.H = -self.damping * np.eye(len(x))
+        dx = x - self.x_prev
+        df = f - (self.g_prev - self.x_prev)
+        H_df = self.H @ df
+        denominator = dx @ H_df
+        if abs(denominator) > np.finfo(float).eps:
+            self.H += np.outer(dx - H_df, dx @ self.H) / denominator
+        return x - self.H @ f
+
+    def reset(self) -> None:
+        self.H = None
+
+
+def create_accelerator(method: str, damping: float = 0.7, memory: int = 5,
+                       normalize: bool = True) -> RecycleAccelerator:
+    """Create the tear-stream accelerator for a recycle method name.
+
+    Compositions are normalised after every update; pass normalize=False for tear
+    variables such as flow rates.
+    """
+    if method == 'damped':
+        return DampedSubstitution(damping, normalize)
+    if method == 'wegstein':
+        return Wegstein(damping, normalize)
+    if method == 'anderson':
+        return Anderson(damping, memory, normalize)
+    if method == 'broyden':
+        return Broyden(damping, normalize)
+    raise ValueError(f"Unknown recycle method '{method}', expected one of {RECYCLE_METHODS}")
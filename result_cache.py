@@ -0,0 +1,194 @@
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import numpy as np
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+from models import ReactorConfig
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedState:
+    time: float
+    temperature: float
+    pressure: float
+    Y: np.ndarray
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+
+
+class SimulationCache:
+    """Memoizes final reactor states behind an in-memory LRU tier and an optional on-disk tier."""
+
+    def __init__(self, max_entries: int = 256, cache_dir: Optional[str] = None,
+                 max_disk_bytes: int = 512 * 1024 ** 2, composition_tol: float = 1e-9):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.composition_tol = composition_tol
+        self.stats = CacheStats()
+        self._memory: 'OrderedDict[str, CachedState]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional['SimulationCache']:
+        """Build the cache from the result_cache section of config.yaml, or None if disabled."""
+        settings = config.get('result_cache') or {}
+        if not settings.get('enabled', False):
+            return None
+        return cls(
+            max_entries=settings.get('max_entries', 256),
+            cache_dir=settings.get('directory'),
+            max_disk_bytes=int(settings.get('max_disk_mb', 512) * 1024 ** 2),
+            composition_tol=settings.get('composition_tol', 1e-9)
+        )
+
+    def key(self, mechanism_hash: str, config: ReactorConfig) -> str:
+        """Hash the inputs that determine the final state, quantizing the inlet composition."""
+        composition = sorted(config.initial_composition.items())
+        total = sum(fraction for _, fraction in composition)
+        quantized = tuple(
+            (species, int(round(fraction / total / self.composition_tol)))
+            for species, fraction in composition if fraction > 0
+        )
+        # A fixed output grid sets where the integration stops and where the steady-state test runs
+        output_times = None
+        if config.output_times is not None:
+            output_times = tuple(f"{t:.12g}" for t in config.output_times)
+        inputs = (
+            mechanism_hash,
+            f"{config.temperature:.12g}",
+            f"{config.pressure:.12g}",
+            f"{config.residence_time:.12g}",
+            self.composition_tol,
+            quantized,
+            config.integration_mode,
+            output_times,
+            config.steady_state_tol,
+            config.solver.rtol,
+            config.solver.atol,
+            config.solver.max_steps,
+            config.solver.max_time_step,
+            config.solver.preconditioner,
+        )
+        return hashlib.sha256(repr(inputs).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedState]:
+        """Return the cached state for a key, promoting disk hits into memory."""
+        with self._lock:
+            state = self._memory.get(key)
+            if state is not None:
+                self._memory.move_to_end(key)
+                self.stats.memory_hits += 1
+                return state
+
+        state = self._read_disk(key)
+        with self._lock:
+            if state is None:
+                self.stats.misses += 1
+                return None
+            self.stats.disk_hits += 1
+            self._store_memory(key, state)
+        return state
+
+    def put(self, key: str, state: CachedState) -> None:
+        with self._lock:
+            self._store_memory(key, state)
+        self._write_disk(key, state)
+
+    def clear(self) -> None:
+        """Drop the in-memory tier; the disk tier is left in place."""
+        with self._lock:
+            self._memory.clear()
+
+    def _store_memory(self, key: str, state: CachedState) -> None:
+        self._memory[key] = state
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _read_disk(self, key: str) -> Optional[CachedState]:
+        if not self.cache_dir:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as file:
+                state = pickle.load(file)
+            # Refresh the access time used for least-recently-used eviction
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable result cache entry {path}: {e}")
+            return None
+        return state
+
+    def _write_disk(self, key: str, state: CachedState) -> None:
+        if not self.cache_dir:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as file:
+                pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write result cache entry {path}: {e}")
+            return
+        with self._lock:
+            self._disk_bytes += os.path.getsize(path)
+            over_budget = self._disk_bytes > self.max_disk_bytes
+        if over_budget:
+            self._evict_disk()
+
+    def _disk_entries(self) -> list:
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.pkl'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _evict_disk(self) -> None:
+        """Remove the least recently used files until the disk tier fits its size budget."""
+        # Rescan, since other processes may share the directory
+        entries = self._disk_entries()
+        total = sum(size for _, size, _ in entries)
+        # Evict down to 90% of the budget so the scan is not repeated on every write
+        target = 0.9 * self.max_disk_bytes
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            with self._lock:
+                self.stats.evictions += 1
+        with self._lock:
+            self._disk_bytes = total
@@ -0,0 +1,276 @@
+import json
+import logging
+import os
+import numpy as np
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from models import SweepResult
+from streams import SpeciesVectors
+
+logger = logging.getLogger(__name__)
+
+STORE_VERSION = 2  # 2: species-aligned columns are stored one file per species
+MANIFEST = 'manifest.json'
+
+
+def _column_file(path: str, name: str) -> str:
+    return os.path.join(path, name.replace('/', '.') + '.bin')
+
+
+def _species_file(path: str, name: str, index: int) -> str:
+    return _column_file(path, f"{name}/{index}")
+
+
+class ResultWriter:
+    """Streams one row per run into a directory of per-column raw binary files.
+
+    Columns holding one value per species (shape (n_species,)) are split into one file
+    per species, so a single species across every run is a contiguous read. Rows are
+    buffered in memory up to `chunk_size` and then appended to the column files, so
+    memory use does not grow with the number of runs. The manifest is rewritten
+    atomically after the data, so readers always see a consistent prefix.
+    """
+
+    def __init__(self, path: str, species_names: Sequence[str], chunk_size: int = 256):
+        self.path = path
+        self.species_names = list(species_names)
+        self.chunk_size = chunk_size
+        os.makedirs(path, exist_ok=True)
+        self.manifest = self._load_manifest()
+        # Ragged groups hold a variable number of entries per run, addressed through an offsets column
+        self._published_groups = set(self.manifest['ragged'])
+        self._rows: List[Dict[str, np.ndarray]] = []
+        self._ragged: List[Dict[str, Dict[str, np.ndarray]]] = []
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], species_names: Sequence[str]) -> Optional['ResultWriter']:
+        """Build the writer from the results_store section of config.yaml, or None if disabled."""
+        settings = config.get('results_store') or {}
+        if not settings.get('enabled', False):
+            return None
+        return cls(settings['path'], species_names, chunk_size=settings.get('chunk_size', 256))
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        manifest_path = os.path.join(self.path, MANIFEST)
+        if not os.path.exists(manifest_path):
+            return {'version': STORE_VERSION, 'species_names': self.species_names,
+                    'n_rows': 0, 'columns': {}, 'ragged': {}}
+        with open(manifest_path) as file:
+            manifest = json.load(file)
+        if manifest.get('version') != STORE_VERSION:
+            raise ValueError(f"Result store {self.path} has layout version {manifest.get('version')}, "
+                             f"expected {STORE_VERSION}")
+        if manifest['species_names'] != self.species_names:
+            raise ValueError(f"Result store {self.path} was written for a different species set")
+        self._truncate_to_manifest(manifest)
+        return manifest
+
+    def _truncate_to_manifest(self, manifest: Dict[str, Any]) -> None:
+        """Drop data appended after the last published manifest, e.g. by an interrupted flush."""
+        sizes = {}
+        for name, spec in manifest['columns'].items():
+            if spec.get('species'):
+                for i in range(len(manifest['species_names'])):
+                    sizes[f"{name}/{i}"] = manifest['n_rows'] * np.dtype(spec['dtype']).itemsize
+            else:
+                sizes[name] = manifest['n_rows'] * np.dtype(spec['dtype']).itemsize * int(np.prod(spec['shape']))
+        for group, spec in manifest['ragged'].items():
+            sizes[f"{group}/offsets"] = (manifest['n_rows'] + 1) * 8
+            for name, column in spec['columns'].items():
+                sizes[f"{group}/{name}"] = (spec['n_values'] * np.dtype(column['dtype']).itemsize
+                                            * int(np.prod(column['shape'])))
+        for name, size in sizes.items():
+            path = _column_file(self.path, name)
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                logger.warning(f"Truncating unpublished data in {path}")
+                os.truncate(path, size)
+
+    def append(self, row: Dict[str, Any], ragged: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        """Add one run: fixed-shape values per column, plus optional variable-length groups."""
+        row = {name: np.asarray(value) for name, value in row.items()}
+        ragged = {
+            group: {name: np.asarray(values) for name, values in columns.items()}
+            for group, columns in (ragged or {}).items()
+        }
+        self._check_schema(row, ragged)
+        self._rows.append(row)
+        self._ragged.append(ragged)
+        if len(self._rows) >= self.chunk_size:
+            self.flush()
+
+    def write_sweep_result(self, result: SweepResult, vectors: SpeciesVectors) -> None:
+        """Append a sweep (or single-run) result with its economics and optional histories."""
+        economics = result.economic_results
+        row = {
+            'temperature_C': result.point.temperature_C,
+            'pressure_in': result.point.pressure,
+            'time_total': result.point.time_total,
+            'feed': vectors.vector(result.point.initial_composition),
+            'temperature': result.temperature,
+            'pressure': result.pressure,
+            'X': result.mole_fractions,
+            'concentrations': vectors.vector(result.concentrations),
+            'iterations': result.iterations,
+            'converged': result.converged,
+            'recycle_to_feed_ratio': result.recycle_to_feed_ratio,
+            'total_value': economics.total_value,
+            'net_value': economics.net_value,
+            'product_values': vectors.vector(economics.product_values),
+            'weighted_feed_values': vectors.vector(economics.weighted_feed_values),
+        }
+        ragged = {'mass_balance': {
+            'relative_error': [m['relative_error'] for m in result.mass_balance_history],
+            'reactor_error': [m['reactor_error'] for m in result.mass_balance_history],
+            'recycle_moles': [m['streams']['recycle']['moles'] for m in result.mass_balance_history],
+            'recycle_mass': [m['streams']['recycle']['mass'] for m in result.mass_balance_history],
+        }}
+        trajectory = result.trajectory
+        if trajectory is not None:
+            ragged['trajectory'] = {
+                'time': trajectory.time,
+                'temperature': trajectory.temperature,
+                'pressure': trajectory.pressure,
+                'Y': trajectory.Y,
+            }
+        self.append(row, ragged)
+
+    def _check_schema(self, row: Dict[str, np.ndarray], ragged: Dict[str, Dict[str, np.ndarray]]) -> None:
+        """Register new columns on first use and reject rows that do not match the stored schema."""
+        columns = self.manifest['columns']
+        if not columns:
+            for name, value in row.items():
+                columns[name] = {'dtype': value.dtype.str, 'shape': list(value.shape),
+                                 'species': value.shape == (len(self.species_names),)}
+        if set(row) != set(columns):
+            raise ValueError(f"Row columns {sorted(row)} do not match the store columns {sorted(columns)}")
+        for name, value in row.items():
+            if list(value.shape) != columns[name]['shape']:
+                raise ValueError(f"Column '{name}' expects shape {columns[name]['shape']}, got {list(value.shape)}")
+
+        for group, values in ragged.items():
+            spec = self.manifest['ragged'].setdefault(group, {'n_values': 0, 'columns': {}})
+            lengths = {len(value) for value in values.values()}
+            if len(lengths) > 1:
+                raise ValueError(f"Columns of ragged group '{group}' have different lengths")
+            if not spec['columns']:
+                for name, value in values.items():
+                    spec['columns'][name] = {'dtype': value.dtype.str, 'shape': list(value.shape[1:])}
+            if set(values) != set(spec['columns']):
+                raise ValueError(f"Ragged group '{group}' expects columns {sorted(spec['columns'])}")
+            for name, value in values.items():
+                entry = spec['columns'][name]
+                if list(value.shape[1:]) != entry['shape']:
+                    raise ValueError(f"Ragged column '{group}/{name}' expects entries of shape {entry['shape']}")
+
+    def flush(self) -> None:
+        """Append the buffered rows to the column files and publish them in the manifest."""
+        if not self._rows:
+            return
+        n_rows = self.manifest['n_rows']
+        # Files of columns not yet in the published manifest are rewritten, discarding stale data
+        mode = 'ab' if n_rows else 'wb'
+        for name, spec in self.manifest['columns'].items():
+            block = np.stack([row[name] for row in self._rows]).astype(spec['dtype'], copy=False)
+            if not spec['species']:
+                with open(_column_file(self.path, name), mode) as file:
+                    block.tofile(file)
+                continue
+            for i in range(block.shape[1]):
+                with open(_species_file(self.path, name, i), mode) as file:
+                    block[:, i].tofile(file)
+
+        for group, spec in self.manifest['ragged'].items():
+            entries = [entry.get(group) for entry in self._ragged]
+            lengths = [len(next(iter(values.values()))) if values else 0 for values in entries]
+            offsets = spec['n_values'] + np.cumsum(lengths, dtype='<i8')
+            mode = 'ab' if group in self._published_groups else 'wb'
+            if group not in self._published_groups:
+                # A group first seen now records empty entries for every earlier row
+                offsets = np.concatenate([np.zeros(n_rows + 1, dtype='<i8'), offsets])
+            for name, column in spec['columns'].items():
+                block = [values[name] for values in entries if values]
+                with open(_column_file(self.path, f"{group}/{name}"), mode) as file:
+                    if block:
+                        np.concatenate(block).astype(column['dtype'], copy=False).tofile(file)
+            with open(_column_file(self.path, f"{group}/offsets"), mode) as file:
+                offsets.tofile(file)
+            spec['n_values'] = int(offsets[-1])
+            self._published_groups.add(group)
+
+        self.manifest['n_rows'] = n_rows + len(self._rows)
+        self._rows.clear()
+        self._ragged.clear()
+        self._write_manifest()
+
+    def _write_manifest(self) -> None:
+        manifest_path = os.path.join(self.path, MANIFEST)
+        tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as file:
+            json.dump(self.manifest, file, indent=1)
+        os.replace(tmp_path, manifest_path)
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> 'ResultWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class ResultStore:
+    """Read-only access to a result store; every column is memory-mapped on demand."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, MANIFEST)) as file:
+            self.manifest = json.load(file)
+        if self.manifest.get('version') != STORE_VERSION:
+            raise ValueError(f"Result store {path} has layout version {self.manifest.get('version')}, "
+                             f"expected {STORE_VERSION}")
+        self.species_names: List[str] = self.manifest['species_names']
+        self._species_index = {sp: i for i, sp in enumerate(self.species_names)}
+
+    def __len__(self) -> int:
+        return self.manifest['n_rows']
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.manifest['columns'])
+
+    @property
+    def ragged_groups(self) -> List[str]:
+        return list(self.manifest['ragged'])
+
+    def _map(self, name: str, dtype: str, shape: Tuple[int, ...]) -> np.ndarray:
+        if shape[0] == 0:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(_column_file(self.path, name), dtype=dtype, mode='r', shape=shape)
+
+    def column(self, name: str) -> np.ndarray:
+        """One column as an (n_rows, *shape) array.
+
+        Plain columns are memory-mapped; species-aligned columns are assembled from their
+        per-species files into memory, so prefer species_column for those.
+        """
+        spec = self.manifest['columns'][name]
+        if not spec['species']:
+            return self._map(name, spec['dtype'], (len(self), *spec['shape']))
+        if not len(self):
+            return np.empty((0, *spec['shape']), dtype=spec['dtype'])
+        return np.column_stack([self.species_column(name, species) for species in self.species_names])
+
+    def species_column(self, name: str, species: str) -> np.ndarray:
+        """Memory-map one species of a species-aligned column across all runs, e.g. ('X', 'C2H4')."""
+        spec = self.manifest['columns'][name]
+        if not spec['species']:
+            raise ValueError(f"Column '{name}' is not species-aligned")
+        return self._map(f"{name}/{self._species_index[species]}", spec['dtype'], (len(self),))
+
+    def ragged(self, group: str, name: str, row: int) -> np.ndarray:
+        """The entries of a variable-length column belonging to one run."""
+        spec = self.manifest['ragged'][group]
+        offsets = self._map(f"{group}/offsets", '<i8', (len(self) + 1,))
+        column = spec['columns'][name]
+        values = self._map(f"{group}/{name}", column['dtype'], (spec['n_values'], *column['shape']))
+        return values[offsets[row]:offsets[row + 1]]
@@ -0,0 +1,185 @@
+import argparse
+import json
+import logging
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from economic_analysis import EconomicAnalysis
+from models import ReactorConfig
+from reactor_model import ReactorModel, RecycleReactor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TARGETS = ('C2H4', 'C2H2', 'C6H6')
+ECONOMIC_STEP = 1e-4  # Relative mole fraction perturbation for the economic gradient
+
+# Per-process reactor model, created once by the pool initializer
+_worker_model: Optional[ReactorModel] = None
+
+
+@dataclass
+class SensitivityResults:
+    reactions: List[int]
+    equations: List[str]
+    targets: List[str]
+    X: np.ndarray  # Outlet mole fractions of the base case
+    species_sensitivity: np.ndarray  # (n_targets, n_reactions) d ln X / d ln k
+    net_value: float  # [USD/ton feed]
+    net_value_sensitivity: np.ndarray  # (n_reactions,) d net_value / d ln k [USD/ton feed]
+
+    def ranked(self, target: str = 'net_value', top: Optional[int] = 20) -> List[Tuple[int, str, float]]:
+        """(reaction index, equation, sensitivity) sorted by decreasing magnitude."""
+        if target == 'net_value':
+            values = self.net_value_sensitivity
+        else:
+            values = self.species_sensitivity[self.targets.index(target)]
+        order = np.argsort(-np.abs(values), kind='stable')[:top]
+        return [(self.reactions[i], self.equations[i], float(values[i])) for i in order]
+
+    def to_dict(self, top: Optional[int] = None) -> Dict[str, Any]:
+        return {
+            'net_value': self.net_value,
+            'n_reactions': len(self.reactions),
+            'ranked': {
+                target: [{'reaction': i, 'equation': eq, 'sensitivity': s}
+                         for i, eq, s in self.ranked(target, top)]
+                for target in ['net_value'] + self.targets
+            }
+        }
+
+
+def _init_worker(mechanism: str) -> None:
+    """Load the mechanism once per worker process."""
+    global _worker_model
+    _worker_model = ReactorModel(mechanism, verbose=False)
+
+
+def _sensitivity_chunk(config: ReactorConfig, reactions: List[int], rtol: Optional[float],
+                       atol: Optional[float]) -> Tuple[np.ndarray, np.ndarray]:
+    result, sensitivities = _worker_model.simulate_sensitivity(config, reactions, rtol, atol)
+    return result.state.X, sensitivities
+
+
+class SensitivityAnalysis:
+    """Forward sensitivities of target yields and net value to reaction rate constants.
+
+    The reactor is integrated once per chunk of reactions with Cantera's sensitivity
+    solver, and chunks are spread across worker processes. Net value sensitivities
+    chain the mole fraction sensitivities through the economic model:
+    d net / d ln k = sum_j (d net / d ln X_j) (d ln X_j / d ln k).
+    """
+
+    def __init__(self, mechanism: str, config: ReactorConfig, fresh_feed_composition: Dict[str, float],
+                 targets: Sequence[str] = DEFAULT_TARGETS, chunk_size: int = 100,
+                 workers: Optional[int] = None, rtol: Optional[float] = None, atol: Optional[float] = None):
+        self.mechanism = mechanism
+        self.config = config
+        self.fresh_feed_composition = fresh_feed_composition
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count() or 1
+        self.rtol = rtol
+        self.atol = atol
+        self.model = ReactorModel(mechanism, verbose=False)
+        self.targets = [sp for sp in targets if sp in self.model.gas.species_names]
+        self.econ = EconomicAnalysis(gas=self.model.gas)
+
+    def run(self, reactions: Optional[Sequence[int]] = None) -> SensitivityResults:
+        """Sensitivities to the given reaction indices (default: every reaction)."""
+        gas = self.model.gas
+        reactions = list(range(gas.n_reactions)) if reactions is None else list(reactions)
+        chunks = [reactions[i:i + self.chunk_size] for i in range(0, len(reactions), self.chunk_size)]
+        logger.info(f"Sensitivities to {len(reactions)} reactions in {len(chunks)} chunks")
+
+        workers = min(self.workers, len(chunks))
+        if workers <= 1:
+            global _worker_model
+            _worker_model = self.model
+            outputs = [_sensitivity_chunk(self.config, chunk, self.rtol, self.atol) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(self.mechanism,)) as executor:
+                outputs = list(executor.map(
+                    _sensitivity_chunk,
+                    [self.config] * len(chunks), chunks,
+                    [self.rtol] * len(chunks), [self.atol] * len(chunks)
+                ))
+
+        X = outputs[0][0]
+        sensitivities = np.hstack([chunk_sens for _, chunk_sens in outputs])
+        net_value, gradient = self.net_value_gradient(X)
+        target_index = [gas.species_index(sp) for sp in self.targets]
+        return SensitivityResults(
+            reactions=reactions,
+            equations=[gas.reaction(i).equation for i in reactions],
+            targets=self.targets,
+            X=X,
+            species_sensitivity=sensitivities[target_index],
+            net_value=net_value,
+            net_value_sensitivity=gradient @ sensitivities
+        )
+
+    def net_value_gradient(self, X: np.ndarray) -> Tuple[float, np.ndarray]:
+        """Net value of an outlet composition and its gradient d net / d ln X_j.
+
+        The economic model only depends on the outlet shares, so the gradient is taken by
+        central differences on the mole fractions in a single batched evaluation.
+        """
+        present = np.flatnonzero(X > 0)
+        rows = np.tile(X, (2 * len(present) + 1, 1))
+        rows[1 + np.arange(len(present)), present] *= 1 + ECONOMIC_STEP
+        rows[1 + len(present) + np.arange(len(present)), present] *= 1 - ECONOMIC_STEP
+        values = self.econ.batch_economic_value(
+            rows, self.fresh_feed_composition, self.config.recycle_ratios
+        ).net_value[:, 0]
+        gradient = np.zeros_like(X)
+        gradient[present] = (values[1:1 + len(present)] - values[1 + len(present):]) / (2 * ECONOMIC_STEP)
+        return float(values[0]), gradient
+
+
+def main() -> None:
+    from main import load_config
+    from output_formatter import OutputFormatter
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Rank reactions by their effect on product yields and net value.")
+    parser.add_argument('--config', default='config.yaml')
+    parser.add_argument('--reactions', type=int, nargs='+', help="Reaction indices (default: all)")
+    parser.add_argument('--targets', nargs='+', help="Target species (default: C2H4 C2H2 C6H6)")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: all cores)")
+    parser.add_argument('--top', type=int, default=20, help="Reactions listed per target")
+    parser.add_argument('--no-recycle', action='store_true',
+                        help="Use the fresh feed as the reactor inlet instead of the converged recycle feed")
+    parser.add_argument('--output', help="JSON file for the ranked sensitivities")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    settings = config.get('sensitivity') or {}
+    reactor_config = ReactorConfig.from_dict(config)
+    fresh_feed = dict(config['initial_composition'])
+    if not args.no_recycle:
+        # Sensitivities at the converged operating point, with the recycle held fixed
+        recycle_results = RecycleReactor(ReactorModel(config['mechanism'], verbose=False),
+                                         verbose=False).simulate_with_recycle(reactor_config)
+        reactor_config = replace(reactor_config, initial_composition=recycle_results.final_feed)
+
+    analysis = SensitivityAnalysis(
+        config['mechanism'],
+        reactor_config,
+        fresh_feed,
+        targets=args.targets or settings.get('targets', DEFAULT_TARGETS),
+        chunk_size=settings.get('chunk_size', 100),
+        workers=args.workers or settings.get('workers'),
+        rtol=settings.get('rtol'),
+        atol=settings.get('atol')
+    )
+    results = analysis.run(args.reactions or settings.get('reactions'))
+    OutputFormatter(sigma=config['sigma']).print_sensitivity_results(results, top=args.top)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results.to_dict(), file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,46 @@
-import cantera as ct
+import argparse
+import logging
+from main import load_config
+from mechanism_cache import load_mechanism
+from mechanism_reduction import DRGEPReducer, MechanismReduction, filter_species_by_elements
 
-# Load the original mechanism
-gas = ct.Solution('aramco.yaml')
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
-# Get all species containing only C, H, N
-filtered_species = [sp.name for sp in gas.species() 
-                   if all(elem in ['C', 'H', 'N'] for elem in sp.composition.keys())]
 
-# Create a new mechanism with filtered species
-filtered_mech = ct.Solution(thermo='IdealGas',
-                          kinetics='GasKinetics',
-                          species=[sp for sp in gas.species() if sp.name in filtered_species])
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build a skeletal mechanism for the configured operating envelope.")
+    parser.add_argument('--config', default='config.yaml', help="Configuration file defining the envelope")
+    parser.add_argument('--mechanism', help="Mechanism to reduce (default: the configured mechanism)")
+    parser.add_argument('--output', help="Reduced mechanism YAML file")
+    parser.add_argument('--report', help="JSON report of species count, error and speedup per threshold")
+    parser.add_argument('--max-error', type=float, help="Maximum relative error in target yields")
+    parser.add_argument('--elements', nargs='+',
+                        help="Only keep species made of these elements (e.g. C H N) instead of running DRGEP")
+    args = parser.parse_args()
 
-# Export the filtered mechanism
-filtered_mech.write_yaml('aramco_small.yaml')
\ No newline at end of file
+    config = load_config(args.config)
+    settings = config.get('reduction') or {}
+    mechanism = args.mechanism or settings.get('mechanism') or config['mechanism']
+    output = args.output or settings.get('output', 'skeletal.yaml')
+
+    if args.elements:
+        # Element filter: keep the species and every reaction among them
+        gas = load_mechanism(mechanism)
+        species = filter_species_by_elements(gas, args.elements)
+        filtered_mech = DRGEPReducer(gas, targets=[]).build(species)
+        filtered_mech.write_yaml(output)
+        logger.info(f"Wrote {output}: {filtered_mech.n_species} species, {filtered_mech.n_reactions} reactions")
+        return
+
+    reduction = MechanismReduction(
+        config,
+        mechanism=mechanism,
+        max_error=args.max_error or settings.get('max_error', 0.05),
+        samples_per_run=settings.get('samples_per_run', 40)
+    )
+    reduction.run(output, report=args.report or settings.get('report'))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import hashlib
+import numpy as np
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+GAS_CONSTANT = 8314.46261815324  # [J/kmol/K], as used by Cantera
+
+
+class SpeciesVectors:
+    """Per-mechanism lookup tables aligned with the mechanism's species order."""
+
+    def __init__(self, species_names: Iterable[str], molecular_weights: np.ndarray):
+        self.species_names: Tuple[str, ...] = tuple(species_names)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.species_names)}
+        self.molecular_weights = np.array(molecular_weights, dtype=float)
+        self.molecular_weights.flags.writeable = False
+        # Identifies the species order, so states can be checked against a mechanism cheaply
+        self.key = hashlib.sha1(
+            '\n'.join(self.species_names).encode() + self.molecular_weights.tobytes()
+        ).hexdigest()[:16]
+
+    def __reduce__(self):
+        # Unpickled copies are interned, so many results share one instance per process
+        return _intern_vectors, (self.species_names, self.molecular_weights)
+
+    @property
+    def n_species(self) -> int:
+        return len(self.species_names)
+
+    def indices(self, species: Iterable[str]) -> np.ndarray:
+        """Return the mechanism indices of the given species names."""
+        return np.fromiter((self.index[sp] for sp in species), dtype=np.intp)
+
+    def vector(self, values: Dict[str, float]) -> np.ndarray:
+        """Scatter a species dictionary into a dense species-aligned vector."""
+        vector = np.zeros(self.n_species)
+        for species, value in values.items():
+            vector[self.index[species]] = value
+        return vector
+
+    def to_dict(self, vector: np.ndarray, species: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """Gather a dense vector into a dictionary, for the given species or all non-zero entries."""
+        if species is None:
+            nonzero = np.flatnonzero(vector)
+            return {self.species_names[i]: float(vector[i]) for i in nonzero}
+        return {sp: float(vector[self.index[sp]]) for sp in species}
+
+
+_vectors_cache: Dict[Tuple[Tuple[str, ...], bytes], SpeciesVectors] = {}
+_vectors_lock = threading.Lock()
+
+
+def species_vectors(gas) -> SpeciesVectors:
+    """Return the shared SpeciesVectors for a Cantera phase, keyed by its species order."""
+    return _intern_vectors(tuple(gas.species_names), gas.molecular_weights)
+
+
+def _intern_vectors(species_names: Tuple[str, ...], molecular_weights: np.ndarray) -> SpeciesVectors:
+    key = (species_names, molecular_weights.tobytes())
+    with _vectors_lock:
+        vectors = _vectors_cache.get(key)
+        if vectors is None:
+            vectors = SpeciesVectors(species_names, molecular_weights)
+            _vectors_cache[key] = vectors
+    return vectors
+
+
+class Stream:
+    """A material stream stored as species-aligned molar amounts [kmol]."""
+
+    __slots__ = ('vectors', 'moles')
+
+    def __init__(self, vectors: SpeciesVectors, moles: Optional[np.ndarray] = None):
+        self.vectors = vectors
+        self.moles = np.zeros(vectors.n_species) if moles is None else moles
+
+    @classmethod
+    def from_composition(cls, vectors: SpeciesVectors, composition: Dict[str, float],
+                         total_moles: float = 1.0) -> 'Stream':
+        """Create a stream from mole fractions and a total molar amount."""
+        return cls(vectors, vectors.vector(composition) * total_moles)
+
+    @property
+    def total_moles(self) -> float:
+        return float(self.moles.sum())
+
+    @property
+    def mass(self) -> float:
+        return float(self.moles @ self.vectors.molecular_weights)
+
+    @property
+    def mole_fractions(self) -> np.ndarray:
+        total = self.moles.sum()
+        return self.moles / total if total > 0 else self.moles.copy()
+
+    def __add__(self, other: 'Stream') -> 'Stream':
+        return Stream(self.vectors, self.moles + other.moles)
+
+    def to_dict(self, species: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """Return the molar amounts as a species dictionary."""
+        return self.vectors.to_dict(self.moles, species)
+
+
+class StateSnapshot:
+    """An immutable ideal-gas state (T, P, Y) aligned with a mechanism's species order.
+
+    Unlike a Cantera phase it is cheap to hold and to pickle, and it cannot be changed
+    by later use of the mechanism; restore() loads it back into a phase on demand.
+    """
+
+    __slots__ = ('vectors', 'T', 'P', 'Y')
+
+    def __init__(self, vectors: SpeciesVectors, T: float, P: float, Y: np.ndarray):
+        self.vectors = vectors
+        self.T = float(T)
+        self.P = float(P)
+        self.Y = np.array(Y, dtype=float)
+        self.Y.flags.writeable = False
+
+    @classmethod
+    def from_phase(cls, phase) -> 'StateSnapshot':
+        return cls(species_vectors(phase), phase.T, phase.P, phase.Y)
+
+    def __getstate__(self):
+        return self.vectors, self.T, self.P, self.Y
+
+    def __setstate__(self, state):
+        self.vectors, self.T, self.P, Y = state
+        self.Y = Y
+        self.Y.flags.writeable = False
+
+    @property
+    def species_names(self) -> Tuple[str, ...]:
+        return self.vectors.species_names
+
+    @property
+    def mean_molecular_weight(self) -> float:
+        return float(1.0 / np.sum(self.Y / self.vectors.molecular_weights))
+
+    @property
+    def X(self) -> np.ndarray:
+        return self.Y / self.vectors.molecular_weights * self.mean_molecular_weight
+
+    @property
+    def density(self) -> float:
+        return self.P * self.mean_molecular_weight / (GAS_CONSTANT * self.T)
+
+    @property
+    def concentrations(self) -> np.ndarray:
+        """Molar concentrations [kmol/m³]."""
+        return self.X * self.P / (GAS_CONSTANT * self.T)
+
+    def restore(self, phase):
+        """Set a phase with the same species order to this state and return it."""
+        if species_vectors(phase).key != self.vectors.key:
+            raise ValueError("State snapshot was taken on a mechanism with a different species order")
+        phase.TPY = self.T, self.P, self.Y
+        return phase
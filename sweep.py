@@ -0,0 +1,276 @@
+import itertools
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from economic_analysis import EconomicAnalysis
+from reactor_model import ReactorModel, RecycleReactor
+from result_cache import SimulationCache
+from tabulation import ReactionTable
+from recycle_acceleration import RecycleAccelerator
+from prescreen import Prescreen, ScreenResult, log_screen
+from streams import Stream, species_vectors
+from models import EconomicResults, ReactorConfig, RecycleResults, SweepPoint, SweepResult
+
+SWEEP_AXES = ('temperature_C', 'pressure', 'time_total', 'initial_composition')
+CONTINUATION_AXES = ('temperature_C', 'pressure', 'time_total')
+
+# Per-process reactor model, created once by the pool initializer
+_worker_model: Optional[ReactorModel] = None
+
+
+def expand_axis(spec: Any) -> list:
+    """Expand a sweep axis given as a scalar, a list or a {start, stop, num} grid."""
+    if isinstance(spec, dict) and 'num' in spec:
+        return list(np.linspace(spec['start'], spec['stop'], int(spec['num'])))
+    if isinstance(spec, (list, tuple)):
+        return list(spec)
+    return [spec]
+
+
+def build_sweep_points(config: Dict[str, Any]) -> List[SweepPoint]:
+    """Build the Cartesian product of the sweep axes, defaulting to the base config values."""
+    sweep = config.get('sweep', {})
+    axes = []
+    for axis in SWEEP_AXES:
+        if axis == 'initial_composition':
+            # A single composition is a dict, so it must not be expanded as a grid spec
+            spec = sweep.get(axis, [config[axis]])
+            axes.append(spec if isinstance(spec, list) else [spec])
+        else:
+            axes.append(expand_axis(sweep.get(axis, config[axis])))
+    return [
+        SweepPoint(
+            temperature_C=float(temperature_C),
+            pressure=float(pressure),
+            time_total=float(time_total),
+            initial_composition=dict(composition)
+        )
+        for temperature_C, pressure, time_total, composition in itertools.product(*axes)
+    ]
+
+
+def _init_worker(config: Dict[str, Any]) -> None:
+    """Load the mechanism once per worker process."""
+    global _worker_model
+    _worker_model = ReactorModel(
+        mechanism=config['mechanism'],
+        verbose=False,
+        cache=SimulationCache.from_config(config),
+        table=ReactionTable.from_config(config)
+    )
+
+
+def continuation_settings(config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Continuation settings from the sweep section (`true` or a mapping), or None if disabled."""
+    spec = (config.get('sweep') or {}).get('continuation')
+    if not spec:
+        return None
+    settings = {'axis': None, 'extrapolate': True}
+    if isinstance(spec, dict):
+        if not spec.get('enabled', True):
+            return None
+        settings.update({key: value for key, value in spec.items() if key != 'enabled'})
+    return settings
+
+
+def continuation_chains(points: List[SweepPoint], axis: Optional[str] = None,
+                        min_chains: int = 1) -> Tuple[str, List[List[int]]]:
+    """Group point indices into chains ordered along one axis, with every other coordinate fixed.
+
+    The axis defaults to the numeric axis with the most distinct values. Chains are split
+    into contiguous segments until there are at least `min_chains`, so a one-dimensional
+    sweep still keeps every worker busy; each segment starts from the fresh feed.
+    """
+    if axis is None:
+        axis = max(CONTINUATION_AXES, key=lambda name: len({getattr(p, name) for p in points}))
+    if axis not in CONTINUATION_AXES:
+        raise ValueError(f"Unknown continuation axis '{axis}', expected one of {CONTINUATION_AXES}")
+    groups: Dict[tuple, List[int]] = {}
+    for i, point in enumerate(points):
+        key = tuple(getattr(point, name) for name in CONTINUATION_AXES if name != axis)
+        key += (tuple(sorted(point.initial_composition.items())),)
+        groups.setdefault(key, []).append(i)
+    chains = [sorted(chain, key=lambda i: getattr(points[i], axis)) for chain in groups.values()]
+    segments = -(-min_chains // len(chains))
+    if segments > 1:
+        chains = [[int(i) for i in part] for chain in chains
+                  for part in np.array_split(chain, min(segments, len(chain)))]
+    return axis, chains
+
+
+def continuation_seed(history: List[Tuple[float, np.ndarray]], value: float,
+                      extrapolate: bool = True) -> np.ndarray:
+    """Tear-stream guess (recycle moles) at `value` from converged neighbours.
+
+    With two neighbours and `extrapolate`, the guess is extended geometrically along the
+    sweep path: the recycle scales with the inverse of the per-pass conversion, which
+    changes by a similar factor at each step of an evenly spaced axis. Otherwise the
+    nearest neighbour's solution is reused as is.
+    """
+    value_1, recycle_1 = history[-1]
+    if not extrapolate or len(history) < 2 or history[-2][0] == value_1:
+        return recycle_1
+    value_0, recycle_0 = history[-2]
+    t = (value - value_1) / (value_1 - value_0)
+    growth = np.divide(recycle_1, recycle_0, out=np.ones_like(recycle_1), where=recycle_0 > 0)
+    return recycle_1 * growth ** t
+
+
+def _run_chain(base_config: Dict[str, Any], points: List[SweepPoint], axis: str,
+               extrapolate: bool) -> List[SweepResult]:
+    """Run one continuation chain in order, seeding each point from its converged predecessors."""
+    vectors = species_vectors(_worker_model.gas)
+    history: List[Tuple[float, np.ndarray]] = []
+    accelerator = None
+    results = []
+    for point in points:
+        value = getattr(point, axis)
+        initial_recycle = None
+        if history:
+            initial_recycle = Stream(vectors, continuation_seed(history, value, extrapolate))
+        result, recycle_results = _simulate_point(base_config, point, initial_recycle, accelerator)
+        if recycle_results.converged:
+            history = history[-1:] + [(value, recycle_results.recycle_streams[-1].moles)]
+            # The last converged point's accelerator warm-starts the next one's
+            accelerator = recycle_results.accelerator
+        results.append(result)
+    return results
+
+
+def _run_point(base_config: Dict[str, Any], point: SweepPoint) -> SweepResult:
+    """Run the recycle and economics pipeline for one operating point."""
+    return _simulate_point(base_config, point)[0]
+
+
+def point_config(base_config: Dict[str, Any], point: SweepPoint) -> Dict[str, Any]:
+    """The config.yaml style mapping of one operating point."""
+    config = dict(base_config)
+    config.update(
+        temperature_C=point.temperature_C,
+        pressure=point.pressure,
+        time_total=point.time_total,
+        initial_composition=point.initial_composition
+    )
+    return config
+
+
+def _screen_points(base_config: Dict[str, Any], configs: List[Dict[str, Any]]) -> List[ScreenResult]:
+    return Prescreen.from_config(base_config, _worker_model).screen(configs)
+
+
+def _simulate_point(base_config: Dict[str, Any], point: SweepPoint, initial_recycle: Optional[Stream] = None,
+                    initial_accelerator: Optional[RecycleAccelerator] = None) -> Tuple[SweepResult, RecycleResults]:
+    """Run one operating point, optionally warm-started, returning the summary and the recycle results."""
+    reactor_config = ReactorConfig.from_dict(point_config(base_config, point))
+
+    model = RecycleReactor(_worker_model, verbose=False)
+    recycle_results = model.simulate_with_recycle(reactor_config, initial_recycle,
+                                                  initial_accelerator=initial_accelerator)
+
+    econ = EconomicAnalysis(gas=_worker_model.gas)
+    economic_results = econ.calculate_economic_value(
+        reactor_results=recycle_results.reactor_results,
+        fresh_feed_composition=point.initial_composition,
+        recycle_ratios=reactor_config.recycle_ratios
+    )
+
+    return sweep_result(point, recycle_results, economic_results), recycle_results
+
+
+def sweep_result(point: SweepPoint, recycle_results: RecycleResults,
+                 economic_results: EconomicResults) -> SweepResult:
+    """Summarise one operating point's recycle and economic results."""
+    reactor_results = recycle_results.reactor_results
+    state = reactor_results.state
+    return SweepResult(
+        point=point,
+        temperature=state.T,
+        pressure=state.P,
+        concentrations=reactor_results.concentrations,
+        iterations=recycle_results.iterations,
+        converged=recycle_results.converged,
+        recycle_to_feed_ratio=recycle_results.recycle_to_feed_ratio,
+        economic_results=economic_results,
+        mole_fractions=state.X,
+        mass_balance_history=recycle_results.mass_balance_history,
+        trajectory=reactor_results.trajectory
+    )
+
+
+def run_sweep(config: Dict[str, Any], points: Optional[List[SweepPoint]] = None,
+              workers: Optional[int] = None) -> List[SweepResult]:
+    """Run a sweep of operating points across a process pool, returning results in point order."""
+    return list(iter_sweep(config, points, workers))
+
+
+def iter_sweep(config: Dict[str, Any], points: Optional[List[SweepPoint]] = None,
+               workers: Optional[int] = None) -> Iterator[SweepResult]:
+    """Run a sweep across a process pool, yielding each result in point order as it completes.
+
+    With continuation enabled, points are solved in chains along one axis so each recycle
+    loop is warm-started from its converged neighbours. With the pre-screen enabled, points
+    it rules out are dropped before their recycle solve and yield no result.
+    """
+    if points is None:
+        points = build_sweep_points(config)
+    if not points:
+        return
+    sweep = config.get('sweep', {})
+    workers = workers or sweep.get('workers') or os.cpu_count() or 1
+    workers = min(workers, len(points))
+    base_config = {key: value for key, value in config.items() if key != 'sweep'}
+    continuation = continuation_settings(config)
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(base_config,)
+    ) as executor:
+        if (config.get('prescreen') or {}).get('enabled', False):
+            points = _prescreen(executor, base_config, points, workers)
+            if not points:
+                return
+        if continuation is not None:
+            yield from _iter_chains(executor, base_config, points, continuation, workers)
+            return
+        # Hand each worker a few points at a time to amortise the IPC round trips
+        chunksize = max(1, len(points) // (4 * workers))
+        yield from executor.map(
+            _run_point,
+            itertools.repeat(base_config),
+            points,
+            chunksize=chunksize
+        )
+
+
+def _prescreen(executor: ProcessPoolExecutor, base_config: Dict[str, Any], points: List[SweepPoint],
+               workers: int) -> List[SweepPoint]:
+    """Screen the points in one chunk per worker, keeping those that pass."""
+    configs = [point_config(base_config, point) for point in points]
+    chunks = [chunk for chunk in np.array_split(np.arange(len(points)), workers) if len(chunk)]
+    results = [result for chunk_results in executor.map(
+        _screen_points, itertools.repeat(base_config), [[configs[i] for i in chunk] for chunk in chunks]
+    ) for result in chunk_results]
+    log_screen(configs, results)
+    return [point for point, result in zip(points, results) if result.passed]
+
+
+def _iter_chains(executor: ProcessPoolExecutor, base_config: Dict[str, Any], points: List[SweepPoint],
+                 continuation: Dict[str, Any], workers: int) -> Iterator[SweepResult]:
+    """Run continuation chains across the pool and yield their results back in point order."""
+    axis, chains = continuation_chains(points, continuation['axis'], min_chains=workers)
+    ready: Dict[int, SweepResult] = {}
+    next_index = 0
+    chain_results = executor.map(
+        _run_chain,
+        itertools.repeat(base_config),
+        [[points[i] for i in chain] for chain in chains],
+        itertools.repeat(axis),
+        itertools.repeat(continuation['extrapolate'])
+    )
+    for chain, results in zip(chains, chain_results):
+        ready.update(zip(chain, results))
+        while next_index in ready:
+            yield ready.pop(next_index)
+            next_index += 1
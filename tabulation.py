@@ -0,0 +1,237 @@
+import hashlib
+import logging
+import threading
+import numpy as np
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Any, Optional, Tuple
+from models import ReactorConfig
+
+logger = logging.getLogger(__name__)
+
+# Scaled inputs: temperature / temperature_scale, ln pressure, ln residence time, then the inlet
+# mole fractions of the query's active species
+N_STATE_INPUTS = 3
+
+
+@dataclass
+class TableStats:
+    retrieves: int = 0
+    grows: int = 0
+    adds: int = 0
+    evictions: int = 0
+
+    @property
+    def direct(self) -> int:
+        """Queries answered by integration."""
+        return self.grows + self.adds
+
+    @property
+    def hit_rate(self) -> float:
+        queries = self.retrieves + self.direct
+        return self.retrieves / queries if queries else 0.0
+
+
+@dataclass
+class TableQuery:
+    key: str  # Mechanism, active species and solver settings; records are only shared within a key
+    species: Tuple[str, ...]  # Inlet species whose mole fractions are inputs
+    phi: np.ndarray  # Scaled inputs
+
+
+class _Records:
+    """Records of one key as stacked arrays, so a query tests every ellipsoid at once."""
+
+    def __init__(self, n_inputs: int, n_outputs: int):
+        self.phi = np.empty((0, n_inputs))
+        self.outputs = np.empty((0, n_outputs))
+        self.jacobian = np.empty((0, n_outputs, n_inputs))
+        self.eoa = np.empty((0, n_inputs, n_inputs))  # Ellipsoid of accuracy: d^T M d <= 1
+        self.time = np.empty(0)  # Reactor end time, shorter than the residence time after an early exit
+        self.last_used = np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def append(self, phi: np.ndarray, outputs: np.ndarray, jacobian: np.ndarray, eoa: np.ndarray,
+               time: float, tick: int) -> None:
+        self.phi = np.vstack([self.phi, phi])
+        self.outputs = np.vstack([self.outputs, outputs])
+        self.jacobian = np.concatenate([self.jacobian, jacobian[None]])
+        self.eoa = np.concatenate([self.eoa, eoa[None]])
+        self.time = np.append(self.time, time)
+        self.last_used = np.append(self.last_used, tick)
+
+    def remove(self, i: int) -> None:
+        for name in ('phi', 'outputs', 'jacobian', 'eoa', 'time', 'last_used'):
+            setattr(self, name, np.delete(getattr(self, name), i, axis=0))
+
+
+class ReactionTable:
+    """In-situ adaptive tabulation (ISAT) of the reactor map.
+
+    The map takes the inlet temperature, pressure, composition and residence time to the
+    outlet temperature and mole fractions. Each record stores one integrated point, the
+    finite-difference Jacobian of the map there, and an ellipsoid of accuracy (EOA) in which
+    the linear approximation is trusted. A query inside an EOA is answered by the linear
+    approximation. Anything else is integrated directly. If some record's approximation of
+    that result is within `tolerance`, its EOA is grown to cover the query; otherwise a new
+    record is added, at the cost of one extra integration per input. The least recently
+    used record is evicted beyond `max_records`.
+
+    Errors are measured in the 2-norm of the outlet mole fractions together with the
+    outlet temperature divided by `temperature_scale`. The table can be shared between
+    threads; the integrations for a new record run outside its lock.
+    """
+
+    def __init__(self, tolerance: float = 1e-6, max_records: int = 500, temperature_scale: float = 1000.0,
+                 max_radius: float = 0.01, step: float = 1e-5):
+        self.tolerance = tolerance
+        self.max_records = max_records
+        self.temperature_scale = temperature_scale
+        self.max_radius = max_radius
+        self.step = step
+        self.stats = TableStats()
+        self._records: Dict[str, _Records] = {}
+        self._tick = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional['ReactionTable']:
+        """Build the table from the tabulation section of config.yaml, or None if disabled."""
+        settings = config.get('tabulation') or {}
+        if not settings.get('enabled', False):
+            return None
+        return cls(
+            tolerance=settings.get('tolerance', 1e-6),
+            max_records=settings.get('max_records', 500),
+            temperature_scale=settings.get('temperature_scale', 1000.0),
+            max_radius=settings.get('max_radius', 0.01),
+            step=settings.get('step', 1e-5)
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._size()
+
+    def _size(self) -> int:
+        return sum(len(records) for records in self._records.values())
+
+    def query(self, mechanism_hash: str, config: ReactorConfig) -> TableQuery:
+        composition = {species: fraction for species, fraction in config.initial_composition.items() if fraction > 0}
+        species = tuple(sorted(composition))
+        total = sum(composition.values())
+        inputs = (
+            mechanism_hash,
+            species,
+            config.integration_mode,
+            config.steady_state_tol,
+            config.solver.rtol,
+            config.solver.atol,
+            config.solver.max_steps,
+            config.solver.max_time_step,
+            config.solver.preconditioner,
+        )
+        phi = np.concatenate([
+            [config.temperature / self.temperature_scale, np.log(config.pressure), np.log(config.residence_time)],
+            [composition[sp] / total for sp in species]
+        ])
+        return TableQuery(hashlib.sha256(repr(inputs).encode()).hexdigest(), species, phi)
+
+    def config_at(self, config: ReactorConfig, query: TableQuery, phi: np.ndarray) -> ReactorConfig:
+        """The reactor configuration whose scaled inputs are phi."""
+        return replace(
+            config,
+            temperature=phi[0] * self.temperature_scale,
+            pressure=float(np.exp(phi[1])),
+            residence_time=float(np.exp(phi[2])),
+            initial_composition=dict(zip(query.species, phi[N_STATE_INPUTS:].tolist()))
+        )
+
+    def outputs(self, temperature: float, X: np.ndarray) -> np.ndarray:
+        return np.concatenate([[temperature / self.temperature_scale], X])
+
+    def retrieve(self, query: TableQuery) -> Optional[Tuple[float, np.ndarray, float]]:
+        """Outlet temperature, mole fractions and end time if the query lies in a stored EOA."""
+        with self._lock:
+            records = self._records.get(query.key)
+            if not records:
+                return None
+            delta = query.phi - records.phi
+            distance = np.einsum('ri,rij,rj->r', delta, records.eoa, delta)
+            i = int(np.argmin(distance))
+            if distance[i] > 1.0:
+                return None
+            self._tick += 1
+            records.last_used[i] = self._tick
+            self.stats.retrieves += 1
+            outputs = records.outputs[i] + records.jacobian[i] @ delta[i]
+            record_time = records.time[i]
+            record_tau = np.exp(records.phi[i, 2])
+        X = np.maximum(outputs[1:], 0.0)
+        # A record that stopped early at steady state answers with its own end time
+        time = float(np.exp(query.phi[2])) if record_time >= record_tau * (1 - 1e-12) else record_time
+        return outputs[0] * self.temperature_scale, X / X.sum(), time
+
+    def update(self, query: TableQuery, config: ReactorConfig, outputs: np.ndarray, time: float,
+               evaluate: Callable[[ReactorConfig], np.ndarray]) -> None:
+        """Learn from a directly integrated query, growing EOAs or adding a record.
+
+        `evaluate` integrates a configuration and returns its outputs; it is called once per
+        input when a record is added.
+        """
+        with self._lock:
+            self._tick += 1
+            records = self._records.get(query.key)
+            if records:
+                delta = query.phi - records.phi
+                predicted = records.outputs + np.einsum('rij,rj->ri', records.jacobian, delta)
+                accurate = np.flatnonzero(np.linalg.norm(predicted - outputs, axis=1) <= self.tolerance)
+                for i in accurate:
+                    records.eoa[i] = self._grow(records.eoa[i], delta[i])
+                    records.last_used[i] = self._tick
+                if len(accurate):
+                    self.stats.grows += 1
+                    return
+
+        jacobian = np.empty((len(outputs), len(query.phi)))
+        for j in range(len(query.phi)):
+            phi = query.phi.copy()
+            phi[j] += self.step
+            jacobian[:, j] = (evaluate(self.config_at(config, query, phi)) - outputs) / self.step
+        eoa = self._initial_eoa(jacobian)
+        with self._lock:
+            self._tick += 1
+            records = self._records.get(query.key)
+            if records is None:
+                records = self._records[query.key] = _Records(len(query.phi), len(outputs))
+            records.append(query.phi, outputs, jacobian, eoa, time, self._tick)
+            self.stats.adds += 1
+            if self._size() > self.max_records:
+                self._evict()
+
+    def _initial_eoa(self, jacobian: np.ndarray) -> np.ndarray:
+        """The region where the linear change in the outputs stays within the tolerance.
+
+        Semi-axes along directions the outputs barely depend on are capped at max_radius.
+        """
+        _, singular_values, vt = np.linalg.svd(jacobian, full_matrices=False)
+        inverse_axes = np.maximum(singular_values / self.tolerance, 1.0 / self.max_radius)
+        return (vt.T * inverse_axes ** 2) @ vt
+
+    @staticmethod
+    def _grow(eoa: np.ndarray, delta: np.ndarray) -> np.ndarray:
+        """Smallest ellipsoid with the same center containing the old one and the point delta."""
+        r2 = delta @ eoa @ delta
+        if r2 <= 1.0:
+            return eoa
+        direction = eoa @ delta
+        return eoa - (1.0 - 1.0 / r2) / r2 * np.outer(direction, direction)
+
+    def _evict(self) -> None:
+        """Drop the least recently used record across all keys; called with the lock held."""
+        key, records = min(self._records.items(), key=lambda item: item[1].last_used.min())
+        records.remove(int(np.argmin(records.last_used)))
+        if not len(records):
+            del self._records[key]
+        self.stats.evictions += 1
+        logger.debug(f"Evicted a tabulation record, {self._size()} left")
@@ -0,0 +1,283 @@
+import argparse
+import json
+import logging
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from economic_analysis import EconomicAnalysis
+from models import ReactorConfig
+from reactor_model import ReactorModel, RecycleReactor
+from results_store import ResultWriter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TARGETS = ('C2H4', 'C2H2', 'C6H6')
+DISTRIBUTIONS = ('lognormal', 'loguniform')
+QUANTILES = (0.05, 0.5, 0.95)
+
+# Per-process reactor model, created once by the pool initializer. It never uses the result
+# cache, whose keys do not include rate multipliers.
+_worker_model: Optional[ReactorModel] = None
+
+
+class StreamingStats:
+    """Running mean, variance and extrema of several outputs, with a bounded reservoir for quantiles.
+
+    Moments use Welford's update, so they are exact for any number of samples; quantiles
+    are exact until `reservoir_size` samples and a uniform random subsample after that.
+    """
+
+    def __init__(self, names: Sequence[str], reservoir_size: int = 10000, seed: int = 0):
+        n = len(names)
+        self.names = list(names)
+        self.count = 0
+        self.mean = np.zeros(n)
+        self.m2 = np.zeros(n)
+        self.min = np.full(n, np.inf)
+        self.max = np.full(n, -np.inf)
+        self.reservoir = np.empty((reservoir_size, n))
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray) -> None:
+        self.count += 1
+        delta = values - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (values - self.mean)
+        np.minimum(self.min, values, out=self.min)
+        np.maximum(self.max, values, out=self.max)
+        size = len(self.reservoir)
+        if self.count <= size:
+            self.reservoir[self.count - 1] = values
+        else:
+            slot = self._rng.integers(self.count)
+            if slot < size:
+                self.reservoir[slot] = values
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        kept = self.reservoir[:min(self.count, len(self.reservoir))]
+        std = np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.zeros_like(self.mean)
+        quantiles = np.quantile(kept, QUANTILES, axis=0) if len(kept) else np.full((len(QUANTILES), len(self.names)), np.nan)
+        return {
+            name: {
+                'mean': float(self.mean[i]),
+                'std': float(std[i]),
+                'min': float(self.min[i]),
+                'max': float(self.max[i]),
+                **{f"p{round(q * 100):02d}": float(quantiles[j, i]) for j, q in enumerate(QUANTILES)}
+            }
+            for i, name in enumerate(self.names)
+        }
+
+
+@dataclass
+class UncertaintyResults:
+    n_samples: int
+    n_failed: int
+    converged_fraction: float  # Share of successful samples whose recycle loop converged
+    nominal: Dict[str, float]  # Outputs with unperturbed rate constants
+    statistics: Dict[str, Dict[str, float]]  # Output -> mean, std, min, max and quantiles
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'n_samples': self.n_samples,
+            'n_failed': self.n_failed,
+            'converged_fraction': self.converged_fraction,
+            'nominal': self.nominal,
+            'statistics': self.statistics,
+        }
+
+
+def sample_multipliers(seed: int, index: int, factors: np.ndarray, distribution: str = 'lognormal') -> np.ndarray:
+    """Rate multipliers of one sample, reproducible from (seed, index) alone.
+
+    A factor f means k lies in [k/f, k*f]: with 95% probability (two standard deviations
+    of ln k) for 'lognormal', and uniformly in ln k for 'loguniform'.
+    """
+    rng = np.random.default_rng([seed, index])
+    if distribution == 'lognormal':
+        return np.exp(0.5 * np.log(factors) * rng.standard_normal(len(factors)))
+    if distribution == 'loguniform':
+        return np.exp(np.log(factors) * rng.uniform(-1.0, 1.0, len(factors)))
+    raise ValueError(f"Unknown distribution '{distribution}', expected one of {DISTRIBUTIONS}")
+
+
+def _init_worker(mechanism: str) -> None:
+    """Load the mechanism once per worker process."""
+    global _worker_model
+    _worker_model = ReactorModel(mechanism, verbose=False)
+
+
+def _evaluate(model: ReactorModel, config: ReactorConfig, fresh_feed_composition: Dict[str, float],
+              recycle: bool, target_index: np.ndarray) -> Tuple[np.ndarray, bool]:
+    """Outputs (net value, total value, R/F, target mole fractions) of one pipeline run."""
+    if recycle:
+        recycle_results = RecycleReactor(model, verbose=False).simulate_with_recycle(config)
+        reactor_results = recycle_results.reactor_results
+        converged, ratio = recycle_results.converged, recycle_results.recycle_to_feed_ratio
+    else:
+        reactor_results = model.simulate(config)
+        converged, ratio = True, float('nan')
+    economic_results = EconomicAnalysis(gas=model.gas).calculate_economic_value(
+        reactor_results=reactor_results,
+        fresh_feed_composition=fresh_feed_composition,
+        recycle_ratios=config.recycle_ratios
+    )
+    outputs = np.concatenate([
+        [economic_results.net_value, economic_results.total_value, ratio],
+        reactor_results.state.X[target_index]
+    ])
+    return outputs, converged
+
+
+def _run_chunk(config: ReactorConfig, fresh_feed_composition: Dict[str, float], recycle: bool,
+               target_index: np.ndarray, reactions: np.ndarray, factors: np.ndarray, distribution: str,
+               seed: int, indices: range) -> List[Tuple[int, Optional[np.ndarray], bool]]:
+    """Run a block of samples; each is (index, outputs or None if it failed, converged)."""
+    gas = _worker_model.gas
+    rows = []
+    for index in indices:
+        for reaction, multiplier in zip(reactions, sample_multipliers(seed, index, factors, distribution)):
+            gas.set_multiplier(multiplier, reaction)
+        try:
+            outputs, converged = _evaluate(_worker_model, config, fresh_feed_composition, recycle, target_index)
+        except Exception as e:
+            logger.warning(f"Sample {index} failed: {e}")
+            outputs, converged = None, False
+        finally:
+            gas.set_multiplier(1.0)
+        rows.append((index, outputs, converged))
+    return rows
+
+
+class UncertaintyAnalysis:
+    """Monte-Carlo propagation of rate-constant uncertainty to yields and net value.
+
+    Each sample scales the pre-exponential factors of the chosen reactions by random
+    multipliers (through set_multiplier on a worker's own Solution) and runs the full
+    recycle and economics pipeline. Samples run in chunks across worker processes and
+    are folded into streaming statistics as chunks finish, so memory use does not grow
+    with the number of samples.
+    """
+
+    def __init__(self, mechanism: str, config: ReactorConfig, fresh_feed_composition: Dict[str, float],
+                 reactions: Optional[Sequence[int]] = None, uncertainty_factor: float = 2.0,
+                 factors: Optional[Dict[int, float]] = None, distribution: str = 'lognormal',
+                 targets: Sequence[str] = DEFAULT_TARGETS, recycle: bool = True, seed: int = 0,
+                 chunk_size: int = 20, workers: Optional[int] = None, reservoir_size: int = 10000):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown distribution '{distribution}', expected one of {DISTRIBUTIONS}")
+        self.mechanism = mechanism
+        self.config = config
+        self.fresh_feed_composition = fresh_feed_composition
+        self.model = ReactorModel(mechanism, verbose=False)
+        gas = self.model.gas
+        self.reactions = np.arange(gas.n_reactions) if reactions is None else np.asarray(reactions, dtype=int)
+        self.factors = np.full(len(self.reactions), float(uncertainty_factor))
+        position = {int(reaction): i for i, reaction in enumerate(self.reactions)}
+        for reaction, factor in (factors or {}).items():
+            if int(reaction) in position:
+                self.factors[position[int(reaction)]] = float(factor)
+        self.distribution = distribution
+        self.targets = [sp for sp in targets if sp in gas.species_names]
+        self.target_index = np.array([gas.species_index(sp) for sp in self.targets], dtype=int)
+        self.recycle = recycle
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count() or 1
+        self.reservoir_size = reservoir_size
+        self.output_names = ['net_value', 'total_value', 'recycle_to_feed_ratio'] + [f"X_{sp}" for sp in self.targets]
+
+    def run(self, n_samples: int, store: Optional[ResultWriter] = None) -> UncertaintyResults:
+        """Run the ensemble, optionally streaming every sample's outputs into a result store."""
+        nominal, _ = _evaluate(self.model, self.config, self.fresh_feed_composition, self.recycle, self.target_index)
+        stats = StreamingStats(self.output_names, self.reservoir_size, seed=self.seed)
+        chunks = [range(start, min(start + self.chunk_size, n_samples))
+                  for start in range(0, n_samples, self.chunk_size)]
+        args = (self.config, self.fresh_feed_composition, self.recycle, self.target_index,
+                self.reactions, self.factors, self.distribution, self.seed)
+        logger.info(f"{n_samples} samples over {len(self.reactions)} reactions in {len(chunks)} chunks")
+
+        n_failed = n_converged = 0
+        workers = min(self.workers, len(chunks))
+        executor = None
+        if workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                           initargs=(self.mechanism,))
+            chunk_rows = executor.map(_run_chunk, *zip(*[args + (chunk,) for chunk in chunks]))
+        else:
+            global _worker_model
+            _worker_model = self.model
+            chunk_rows = (_run_chunk(*args, chunk) for chunk in chunks)
+        try:
+            for done, rows in enumerate(chunk_rows, start=1):
+                for index, outputs, converged in rows:
+                    if outputs is None:
+                        n_failed += 1
+                        continue
+                    stats.update(outputs)
+                    n_converged += converged
+                    if store is not None:
+                        store.append({'sample': index, 'outputs': outputs, 'converged': converged})
+                logger.info(f"Chunk {done}/{len(chunks)} done")
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        return UncertaintyResults(
+            n_samples=stats.count,
+            n_failed=n_failed,
+            converged_fraction=n_converged / stats.count if stats.count else 0.0,
+            nominal=dict(zip(self.output_names, map(float, nominal))),
+            statistics=stats.summary()
+        )
+
+
+def main() -> None:
+    from main import load_config
+    from output_formatter import OutputFormatter
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Propagate rate-constant uncertainty to yields and net value.")
+    parser.add_argument('--config', default='config.yaml')
+    parser.add_argument('--samples', type=int, help="Ensemble size")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: all cores)")
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--output', help="JSON file for the statistics")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    settings = config.get('uncertainty') or {}
+    analysis = UncertaintyAnalysis(
+        config['mechanism'],
+        ReactorConfig.from_dict(config),
+        dict(config['initial_composition']),
+        reactions=settings.get('reactions'),
+        uncertainty_factor=settings.get('uncertainty_factor', 2.0),
+        factors=settings.get('factors'),
+        distribution=settings.get('distribution', 'lognormal'),
+        targets=settings.get('targets', DEFAULT_TARGETS),
+        recycle=settings.get('recycle', True),
+        seed=args.seed if args.seed is not None else settings.get('seed', 0),
+        chunk_size=settings.get('chunk_size', 20),
+        workers=args.workers or settings.get('workers'),
+        reservoir_size=settings.get('reservoir_size', 10000)
+    )
+    store = None
+    if settings.get('store'):
+        # One row per sample; 'outputs' columns follow analysis.output_names
+        store = ResultWriter(settings['store'], analysis.model.gas.species_names)
+    try:
+        results = analysis.run(args.samples or settings.get('samples', 1000), store)
+    finally:
+        if store is not None:
+            store.close()
+    OutputFormatter(sigma=config['sigma']).print_uncertainty_results(results)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results.to_dict(), file, indent=2)
+
+
+if __name__ == "__main__":
+    main()